@@ -7,4 +7,4 @@ class BytePatrolConfig(AppConfig):
 
     def ready(self):
         # Import signal handlers
-        pass
+        from . import signals  # noqa: F401
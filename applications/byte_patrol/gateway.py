@@ -0,0 +1,107 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.wsgi import get_path_info, get_script_name
+from django.http import HttpResponseForbidden
+from loguru import logger
+
+from .middleware import GATEWAY_CHECKED_KEY, IPRestrictionMiddleware, get_client_ip
+
+
+class EarlyReject:
+    """Decides access to protected paths before Django builds a request.
+
+    Scanning and abuse traffic is rejected by the WSGI or ASGI application wrapping Django, so denied requests skip
+    every middleware. The decision uses the same per-worker policy snapshot and verdict cache as
+    `IPRestrictionMiddleware`, which stays in `MIDDLEWARE` for requests that do not come through a wrapper. Requests
+    the wrapper allows are marked with `GATEWAY_CHECKED_KEY` so the middleware does not decide them again. If the
+    policy cannot be loaded, requests are passed on unmarked for the middleware to decide.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.patrol = IPRestrictionMiddleware(lambda request: None)
+
+    def get_forbidden_response(self):
+        """Get the status line, headers and body of the configured forbidden response."""
+        response = getattr(
+            settings,
+            "BYTE_PATROL_FORBIDDEN_RESPONSE",
+            HttpResponseForbidden("Access Denied: Your IP address is not allowed."),
+        )
+        headers = [*response.items(), ("Content-Length", str(len(response.content)))]
+        return response.status_code, response.reason_phrase, headers, response.content
+
+    def is_denied(self, policy, client_ip, path) -> bool:
+        """Whether the request is denied, logging the denial."""
+        if not policy.is_denied(client_ip, path):
+            return False
+        logger.warning(f"Access denied for IP {client_ip} to {path}")
+        return True
+
+
+class EarlyRejectWSGIApp(EarlyReject):
+    """WSGI application rejecting requests denied by BytePatrol before passing the rest to Django."""
+
+    def __call__(self, environ, start_response):
+        # The WSGI environ holds the same keys as request.META
+        client_ip = get_client_ip(environ)
+        path = f"{get_script_name(environ).rstrip('/')}{get_path_info(environ)}"
+        try:
+            denied = self.is_denied(self.patrol._get_policy(), client_ip, path)
+        except Exception as e:
+            logger.warning(
+                f"BytePatrol: Deferring to middleware, policy unavailable - {e}"
+            )
+            return self.app(environ, start_response)
+        if not denied:
+            environ[GATEWAY_CHECKED_KEY] = True
+            return self.app(environ, start_response)
+        status, reason, headers, body = self.get_forbidden_response()
+        start_response(f"{status} {reason}", headers)
+        return [body]
+
+
+class EarlyRejectASGIApp(EarlyReject):
+    """ASGI application rejecting HTTP requests denied by BytePatrol before passing the rest to Django.
+
+    The policy snapshot is read without I/O while it is current; only a version check or rebuild runs in a thread.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        client_ip = self.get_client_ip(scope)
+        try:
+            policy = self.patrol._get_current_policy()
+            if policy is None:
+                policy = await sync_to_async(self.patrol._get_policy)()
+            denied = self.is_denied(policy, client_ip, scope["path"])
+        except Exception as e:
+            logger.warning(
+                f"BytePatrol: Deferring to middleware, policy unavailable - {e}"
+            )
+            return await self.app(scope, receive, send)
+        if not denied:
+            # Scopes are copied rather than modified when passed on
+            return await self.app({**scope, GATEWAY_CHECKED_KEY: True}, receive, send)
+        status, _, headers, body = self.get_forbidden_response()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def get_client_ip(scope):
+        """Get the client's IP address from the X-Forwarded-For header or the connection, as the middleware does."""
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else None
@@ -30,4 +30,4 @@ class Command(BaseCommand):
             )
 
         # Invalidate cache
-        IPRestrictionMiddleware().invalidate_cache()
+        IPRestrictionMiddleware.invalidate_cache()
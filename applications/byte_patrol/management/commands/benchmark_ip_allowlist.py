@@ -0,0 +1,115 @@
+import ipaddress
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from applications.byte_patrol.middleware import IPNetworkIndex
+
+
+def build_allow_list(size: int, rng: random.Random) -> list:
+    """Builds `size` random allow list entries, an even mix of IPv4 and IPv6 addresses and networks."""
+    entries = []
+    for index in range(size):
+        if index % 2:
+            prefix = rng.choice([16, 20, 24, 28, 32])
+            address = ipaddress.IPv4Address(rng.getrandbits(32))
+        else:
+            prefix = rng.choice([32, 48, 56, 64, 128])
+            address = ipaddress.IPv6Address(rng.getrandbits(128))
+        entries.append(str(ipaddress.ip_network(f"{address}/{prefix}", strict=False)))
+    return entries
+
+
+def build_client_ips(entries: list, count: int, rng: random.Random) -> list:
+    """Builds `count` client addresses, half inside an allowed network and half random."""
+    ips = []
+    for index in range(count):
+        if index % 2:
+            network = ipaddress.ip_network(rng.choice(entries))
+            offset = rng.randrange(network.num_addresses)
+            ips.append(str(network.network_address + offset))
+        elif rng.random() < 0.5:
+            ips.append(str(ipaddress.IPv4Address(rng.getrandbits(32))))
+        else:
+            ips.append(str(ipaddress.IPv6Address(rng.getrandbits(128))))
+    return ips
+
+
+def is_allowed_linear(ip: str, entries: list) -> bool:
+    """The per-request linear scan `IPRestrictionMiddleware` made before the index, as the baseline."""
+    if ip in entries:
+        return True
+    client_ip = ipaddress.ip_address(ip)
+    for entry in entries:
+        if "/" in entry and client_ip in ipaddress.ip_network(entry, strict=False):
+            return True
+    return False
+
+
+def time_lookups(func, ips: list) -> float:
+    """Returns the median wall-clock latency of a lookup in microseconds."""
+    timings = []
+    for ip in ips:
+        started = time.perf_counter()
+        func(ip)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = "Benchmarks allow list lookups through the CIDR index against a linear scan"
+
+    def add_arguments(self, parser):
+        """Adds command line arguments for the benchmark."""
+        parser.add_argument(
+            "--entries",
+            type=int,
+            default=10_000,
+            help="Number of mixed IPv4/IPv6 networks in the allow list",
+        )
+        parser.add_argument(
+            "--lookups",
+            type=int,
+            default=1000,
+            help="Number of client addresses looked up through the index",
+        )
+        parser.add_argument(
+            "--linear-lookups",
+            type=int,
+            default=20,
+            help="Number of client addresses looked up with the linear scan",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        entries = build_allow_list(options["entries"], rng)
+        ips = build_client_ips(entries, options["lookups"], rng)
+
+        started = time.perf_counter()
+        index = IPNetworkIndex(entries)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        mismatches = sum(
+            (ip in index) != is_allowed_linear(ip, entries)
+            for ip in ips[: options["linear_lookups"]]
+        )
+        index_us = time_lookups(index.__contains__, ips)
+        linear_us = time_lookups(
+            lambda ip: is_allowed_linear(ip, entries), ips[: options["linear_lookups"]]
+        )
+
+        self.stdout.write(
+            f"{'entries':>8} {'build ms':>10} {'index us':>10} {'linear us':>12}"
+        )
+        self.stdout.write(
+            f"{len(entries):>8} {build_ms:>10.1f} {index_us:>10.2f} {linear_us:>12.1f}"
+        )
+        if mismatches:
+            self.stdout.write(
+                self.style.ERROR(f"{mismatches} lookups disagreed with the linear scan")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Benchmark complete"))
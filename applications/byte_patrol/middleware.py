@@ -1,24 +1,230 @@
 import ipaddress
 import re
+import time
+from bisect import bisect_right
 
 from django.conf import settings
-from django.core.cache import cache
 from django.http import HttpResponseForbidden
 from django.utils.deprecation import MiddlewareMixin
 from loguru import logger
 
+from utils.cache import metrics
+from utils.local_cache import LocalCache
+from utils.request_cache import CacheUnavailable, request_cache
+
+# Characters that make a protected path pattern a regex rather than a literal path prefix
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Numbered or named group references and group conditionals, which point at the wrong group once patterns are combined
+GROUP_REFERENCE = re.compile(r"\\\d|\(\?P=|\(\?\(")
+# Bumped whenever the allow list or protected paths change; workers compare it with their snapshot's at most every
+# BYTE_PATROL_POLICY_CHECK_INTERVAL_MS milliseconds
+POLICY_VERSION_KEY = "ip_restriction_policy_version"
+# Set in the WSGI environ or ASGI scope once the gateway has decided a request, so the middleware does not decide it
+# again. Clients cannot set it: headers only reach the environ as HTTP_* keys, and never reach the scope's top level
+GATEWAY_CHECKED_KEY = "byte_patrol.checked"
+
+
+def get_client_ip(meta):
+    """Get the client's IP address from request.META or a WSGI environ, preferring the first X-Forwarded-For hop."""
+    x_forwarded_for = meta.get("HTTP_X_FORWARDED_FOR")
+    return (
+        x_forwarded_for.split(",")[0].strip()
+        if x_forwarded_for
+        else meta.get("REMOTE_ADDR")
+    )
+
+
+class PathMatcher:
+    """Matches request paths against every protected path pattern at once.
+
+    Patterns are matched from the start of the path, as `re.match` does, against the path with and without its
+    leading slash. Literal patterns, optionally anchored with `^`, are checked as plain prefixes with a single
+    `str.startswith`; the remaining patterns are compiled into one alternation, so a check costs the same two calls
+    however many patterns there are. Patterns referring back to their own groups are compiled on their own, as
+    combining them would renumber the groups they refer to. Patterns that are not valid regexes are matched literally.
+
+    Attributes:
+        patterns (frozenset): The patterns the matcher was compiled from.
+    """
+
+    def __init__(self, patterns) -> None:
+        self.patterns = frozenset(patterns)
+        prefixes = []
+        expressions = []
+        for pattern in sorted(self.patterns):
+            literal = pattern[1:] if pattern.startswith("^") else pattern
+            if not REGEX_METACHARACTERS.intersection(literal):
+                prefixes.append(literal)
+                continue
+            try:
+                re.compile(pattern)
+            except re.error:
+                logger.warning(
+                    f"BytePatrol: Matching invalid pattern literally: {pattern}"
+                )
+                prefixes.append(pattern)
+                continue
+            expressions.append(pattern)
+        self.prefixes = tuple(prefixes)
+        self.expression = self._compile(expressions)
+
+    @staticmethod
+    def _compile(expressions):
+        """Compile the regex patterns into one alternation, or into one regex each where they cannot be combined."""
+        if not expressions:
+            return None
+        combinable = []
+        separate = []
+        for expression in expressions:
+            if re.compile(expression).groups and GROUP_REFERENCE.search(expression):
+                separate.append(re.compile(expression))
+            else:
+                combinable.append(expression)
+        if combinable:
+            try:
+                separate.insert(
+                    0,
+                    re.compile(
+                        "|".join(f"(?:{expression})" for expression in combinable)
+                    ),
+                )
+            except re.error:
+                # Global inline flags only work in a pattern of their own
+                separate.extend(re.compile(expression) for expression in combinable)
+        return separate[0] if len(separate) == 1 else _AnyPattern(separate)
+
+    def matches(self, path: str) -> bool:
+        """Whether any pattern matches `path`, with or without its leading slash."""
+        if path.startswith("/"):
+            variants = (path, path[1:])
+        else:
+            variants = (f"/{path}", path)
+        for variant in variants:
+            if variant.startswith(self.prefixes):
+                return True
+            if self.expression is not None and self.expression.match(variant):
+                return True
+        return False
+
+
+class _AnyPattern:
+    """Stands in for a combined regex by trying each compiled pattern in turn."""
+
+    def __init__(self, compiled) -> None:
+        self.compiled = compiled
+
+    def match(self, path: str) -> bool:
+        return any(pattern.match(path) for pattern in self.compiled)
+
+
+class IPNetworkIndex:
+    """Answers whether an address falls in any allowed address or network.
+
+    Entries are parsed once into integer ranges per address family, merged where they overlap or touch, and looked up
+    with a binary search, so a check costs O(log n) integer comparisons instead of parsing and testing every entry.
+    Entries that are neither addresses nor networks only match the identical string, and are logged once when the
+    index is built.
+
+    Attributes:
+        entries (frozenset): The allow list entries the index was built from.
+    """
+
+    def __init__(self, entries) -> None:
+        self.entries = frozenset(entries)
+        ranges = {4: [], 6: []}
+        for entry in self.entries:
+            try:
+                network = ipaddress.ip_network(entry, strict=False)
+            except ValueError:
+                logger.warning(f"Invalid network format: {entry}")
+                continue
+            first = int(network.network_address)
+            ranges[network.version].append((first, first + network.num_addresses - 1))
+        self.starts = {}
+        self.ends = {}
+        for version, version_ranges in ranges.items():
+            merged = []
+            for first, last in sorted(version_ranges):
+                if merged and first <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], last)
+                else:
+                    merged.append([first, last])
+            self.starts[version] = [first for first, _ in merged]
+            self.ends[version] = [last for _, last in merged]
+
+    def __contains__(self, ip: str) -> bool:
+        if ip in self.entries:
+            return True
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            logger.warning(f"Invalid IP format: {ip}")
+            return False
+        value = int(address)
+        position = bisect_right(self.starts[address.version], value) - 1
+        return position >= 0 and value <= self.ends[address.version][position]
+
+
+class PolicySnapshot:
+    """The access policy of a worker: its compiled protected paths and allow list, and the version they were read at.
+
+    Verdicts on protected paths reached under the snapshot are remembered per client IP and path, so clients polling
+    the same paths skip the decision. Unprotected paths are allowed without touching the cache, so arbitrary URLs
+    cannot evict useful verdicts. Verdicts are discarded with the snapshot when the policy changes.
+
+    Attributes:
+        version (int or None): The policy version the snapshot was built at, or None if Redis could not be read.
+        path_matcher (PathMatcher): Matches the protected paths.
+        ip_index (IPNetworkIndex): Answers whether an address is allowed.
+        verdicts (LocalCache): Whether each recent (client IP, protected path) pair was denied.
+        built_at (float): Monotonic time the snapshot was built.
+        checked_at (float): Monotonic time the version was last compared with the policy version in Redis.
+    """
+
+    def __init__(self, version, protected_paths, allowed_ips) -> None:
+        self.version = version
+        self.path_matcher = PathMatcher(protected_paths)
+        self.ip_index = IPNetworkIndex(allowed_ips)
+        self.verdicts = LocalCache(
+            max_entries=getattr(settings, "BYTE_PATROL_VERDICT_CACHE_SIZE", 4096),
+            default_timeout=getattr(settings, "BYTE_PATROL_VERDICT_CACHE_TTL", 5),
+        )
+        self.built_at = self.checked_at = time.monotonic()
+
+    def is_denied(self, ip, path) -> bool:
+        """Whether the client at `ip` is denied access to `path`, from the verdict cache when it holds one."""
+        if not self.path_matcher.matches(path):
+            return False
+        key = f"{ip}|{path}"
+        denied = self.verdicts.get(key)
+        if denied is not None:
+            metrics.increment_verdict_cache("hit")
+            return denied
+        metrics.increment_verdict_cache("miss")
+        denied = ip not in self.ip_index
+        self.verdicts.set(key, denied)
+        return denied
+
 
 class IPRestrictionMiddleware(MiddlewareMixin):
     """Middleware that restricts access to protected paths based on client IP address.
 
     This middleware checks incoming requests against an allow list of IP addresses and protected URL patterns, denying access if the client's IP is not permitted.
+
+    The policy is read from settings and the database into a per-worker snapshot. Each worker compares the snapshot's
+    version with the policy version in Redis at most every `BYTE_PATROL_POLICY_CHECK_INTERVAL_MS` milliseconds and
+    rebuilds it when they differ, or once it is `BYTE_PATROL_CACHE_TIMEOUT` seconds old, so requests in between make
+    no Redis calls for access control.
     """
 
-    CACHE_KEY_ALLOWED_IPS = "ip_restriction_allowed_ips"
-    CACHE_KEY_PROTECTED_PATHS = "ip_restriction_protected_paths"
     CACHE_TIMEOUT = getattr(
         settings, "BYTE_PATROL_CACHE_TIMEOUT", 300
     )  # 5 minutes default
+    POLICY_CHECK_INTERVAL = (
+        getattr(settings, "BYTE_PATROL_POLICY_CHECK_INTERVAL_MS", 1000) / 1000
+    )
+    # Shared by every instance in the process
+    _policy = None
 
     def __init__(self, get_response=None):
         self.get_response = get_response
@@ -46,176 +252,130 @@ class IPRestrictionMiddleware(MiddlewareMixin):
         Get the client's IP address from request headers or REMOTE_ADDR.
         Handles cases where the request might be behind a proxy.
         """
-        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-        return (
-            x_forwarded_for.split(",")[0].strip()
-            if x_forwarded_for
-            else request.META.get("REMOTE_ADDR")
-        )
+        return get_client_ip(request.META)
 
     def _is_path_restricted(self, path):
         """
         Check if the current path matches any protected path patterns.
         """
-        # Get protected paths from cache or DB
-        protected_paths = self._get_protected_paths()
-
-        logger.debug(f"BytePatrol: Checking path: '{path}'")
-        logger.debug(f"BytePatrol: Protected paths: {protected_paths}")
-
-        # Normalize path for consistent matching
-        # If path doesn't start with '/', add it for matching
-        normalized_path = path
-        if not normalized_path.startswith("/"):
-            normalized_path = f"/{normalized_path}"
-        logger.debug(f"BytePatrol: Normalized path: '{normalized_path}'")
-
-        # Also try without the leading slash
-        path_without_slash = path
-        if path_without_slash.startswith("/"):
-            path_without_slash = path_without_slash[1:]
-        logger.debug(f"BytePatrol: Path without slash: '{path_without_slash}'")
-
-        # Check each pattern against each path variant
-        for pattern in protected_paths:
-            match1 = bool(re.match(pattern, normalized_path))
-            match2 = bool(re.match(pattern, path_without_slash))
-            match3 = bool(re.match(pattern, path))
-
-            logger.debug(f"BytePatrol: Pattern '{pattern}' matches:")
-            logger.debug(f"  - normalized_path: {match1}")
-            logger.debug(f"  - path_without_slash: {match2}")
-            logger.debug(f"  - original_path: {match3}")
-
-            if match1 or match2 or match3:
-                logger.debug(f"BytePatrol: Path '{path}' is restricted")
-                return True
-
-        logger.debug(f"BytePatrol: Path '{path}' is not restricted")
-        return False
+        return self._get_policy().path_matcher.matches(path)
 
     def _is_ip_allowed(self, ip):
         """
         Check if the given IP is in the allowed list.
         """
-        # Get allowed IPs from cache or combined sources
-        allowed_ips = self._get_allowed_ips()
+        return ip in self._get_policy().ip_index
 
-        # Direct match check
-        if ip in allowed_ips:
-            return True
+    def _get_policy(self):
+        """
+        Get the worker's policy snapshot, rebuilding it when the policy version in Redis has changed.
+        """
+        if (policy := self._get_current_policy()) is not None:
+            return policy
+
+        policy = IPRestrictionMiddleware._policy
+        now = time.monotonic()
+        version = self._get_policy_version()
+        if (
+            policy is None
+            or (version is not None and version != policy.version)
+            or now - policy.built_at >= self.CACHE_TIMEOUT
+        ):
+            logger.debug(f"BytePatrol: Building policy snapshot at version {version}")
+            policy = IPRestrictionMiddleware._policy = PolicySnapshot(
+                version, self._get_protected_paths(), self._get_allowed_ips()
+            )
+        policy.checked_at = now
+        return policy
 
-        # CIDR network check
-        try:
-            client_ip = ipaddress.ip_address(ip)
-            for allowed_ip in allowed_ips:
-                if "/" in allowed_ip:  # This is a network range
-                    try:
-                        network = ipaddress.ip_network(allowed_ip, strict=False)
-                        if client_ip in network:
-                            return True
-                    except ValueError:
-                        logger.warning(f"Invalid network format: {allowed_ip}")
-        except ValueError:
-            logger.warning(f"Invalid IP format: {ip}")
+    def _get_current_policy(self):
+        """
+        Get the worker's policy snapshot without any I/O, or None if its version is due to be checked.
+        """
+        policy = IPRestrictionMiddleware._policy
+        if (
+            policy is not None
+            and time.monotonic() - policy.checked_at < self.POLICY_CHECK_INTERVAL
+        ):
+            return policy
+        return None
 
-        return False
+    @staticmethod
+    def _get_policy_version():
+        """
+        Get the policy version from Redis, starting one if Redis holds none, or None if Redis is unavailable.
+        """
+        version = request_cache.get(POLICY_VERSION_KEY)
+        if version is None:
+            try:
+                request_cache.add(POLICY_VERSION_KEY, time.time_ns(), timeout=None)
+            except CacheUnavailable:
+                return None
+            version = request_cache.get(POLICY_VERSION_KEY, fresh=True)
+        return version
 
     def _get_allowed_ips(self):
         """
-        Get allowed IPs from cache or build from settings and database.
+        Get allowed IPs from settings and database.
         """
-        allowed_ips = cache.get(self.CACHE_KEY_ALLOWED_IPS)
-
-        if allowed_ips is None:
-            # Get IPs from settings
-            settings_ips = getattr(settings, "BYTE_PATROL_ALLOWED_IPS", [])
+        # Get IPs from settings
+        settings_ips = getattr(settings, "BYTE_PATROL_ALLOWED_IPS", [])
 
-            # Get IPs from database
-            try:
-                from .models import IPAllowList
+        # Get IPs from database
+        try:
+            from .models import IPAllowList
 
-                db_ips = list(
-                    IPAllowList.objects.filter(is_active=True).values_list(
-                        "ip_address", flat=True
-                    )
+            db_ips = list(
+                IPAllowList.objects.filter(is_active=True).values_list(
+                    "ip_address", flat=True
                 )
-            except ImportError:
-                db_ips = []
-                logger.warning("Could not import IPAllowList model")
-
-            # Combine and deduplicate
-            allowed_ips = list(set(settings_ips + db_ips))
-
-            # Cache the result
-            cache.set(self.CACHE_KEY_ALLOWED_IPS, allowed_ips, self.CACHE_TIMEOUT)
+            )
+        except ImportError:
+            db_ips = []
+            logger.warning("Could not import IPAllowList model")
 
-        return allowed_ips
+        # Combine and deduplicate
+        return list(set(settings_ips + db_ips))
 
     def _get_protected_paths(self):
         """
-        Get protected path patterns from cache or build from settings and database.
+        Get protected path patterns from settings and database.
         """
-        protected_paths = cache.get(self.CACHE_KEY_PROTECTED_PATHS)
-
-        if protected_paths is None:
-            # Get paths from settings
-            settings_paths = getattr(settings, "BYTE_PATROL_PROTECTED_PATHS", [])
+        # Get paths from settings
+        settings_paths = getattr(settings, "BYTE_PATROL_PROTECTED_PATHS", [])
 
-            # Get paths from database
-            try:
-                from .models import ProtectedPath
+        # Get paths from database
+        try:
+            from .models import ProtectedPath
 
-                db_paths = list(
-                    ProtectedPath.objects.filter(is_active=True).values_list(
-                        "path_pattern", flat=True
-                    )
+            db_paths = list(
+                ProtectedPath.objects.filter(is_active=True).values_list(
+                    "path_pattern", flat=True
                 )
-            except ImportError:
-                db_paths = []
-                logger.warning("Could not import ProtectedPath model")
-
-            # Combine and deduplicate
-            protected_paths = list(set(settings_paths + db_paths))
-
-            # Cache the result
-            cache.set(
-                self.CACHE_KEY_PROTECTED_PATHS, protected_paths, self.CACHE_TIMEOUT
             )
+        except ImportError:
+            db_paths = []
+            logger.warning("Could not import ProtectedPath model")
 
-        return protected_paths
+        # Combine and deduplicate
+        return list(set(settings_paths + db_paths))
 
     def process_request(self, request):
         """
         Process each request to check if IP restriction should be applied.
-        """
-        # Add detailed request logging
-        logger.debug(f"BytePatrol: Processing request for path: '{request.path}'")
-        logger.debug(f"BytePatrol: Request method: {request.method}")
-        logger.debug(
-            f"BytePatrol: Request path info: {request.META.get('PATH_INFO', 'N/A')}"
-        )
-        logger.debug(
-            f"BytePatrol: Request HTTP_HOST: {request.META.get('HTTP_HOST', 'N/A')}"
-        )
-        logger.debug(
-            f"BytePatrol: Request REMOTE_ADDR: {request.META.get('REMOTE_ADDR', 'N/A')}"
-        )
 
-        # Skip IP check for paths that aren't restricted
-        is_restricted = self._is_path_restricted(request.path)
-        logger.debug(
-            f"BytePatrol: Path '{request.path}' is restricted: {is_restricted}"
-        )
-
-        if not is_restricted:
+        Requests already allowed by the `EarlyReject` gateway are passed on without a second check.
+        """
+        if request.META.get(GATEWAY_CHECKED_KEY) or getattr(request, "scope", {}).get(
+            GATEWAY_CHECKED_KEY
+        ):
             return None
 
         # Get client IP
         client_ip = self._get_client_ip(request)
 
-        # Check if IP is allowed
-        if not self._is_ip_allowed(client_ip):
+        # Check whether the path is restricted and the IP not allowed, or reuse the recent verdict for both
+        if self._get_policy().is_denied(client_ip, request.path):
             logger.warning(f"Access denied for IP {client_ip} to {request.path}")
 
             return getattr(
@@ -225,9 +385,13 @@ class IPRestrictionMiddleware(MiddlewareMixin):
             )
         return None
 
-    def invalidate_cache(self):
+    @classmethod
+    def invalidate_cache(cls):
         """
-        Invalidate the IP and path caches.
+        Bump the policy version so every worker rebuilds its snapshot, and drop this worker's snapshot right away.
         """
-        cache.delete(self.CACHE_KEY_ALLOWED_IPS)
-        cache.delete(self.CACHE_KEY_PROTECTED_PATHS)
+        cls._policy = None
+        if not request_cache.set(POLICY_VERSION_KEY, time.time_ns(), timeout=None):
+            logger.warning(
+                "BytePatrol: Could not bump the policy version, other workers keep their policy until it expires"
+            )
@@ -1,3 +1,5 @@
+from django.core.signals import setting_changed
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
@@ -10,5 +12,16 @@ from .models import IPAllowList, ProtectedPath
 def invalidate_ip_restriction_cache(sender, **kwargs):
     """
     Invalidate the cache when IP allow list or protected paths are modified.
+
+    The policy version is bumped once the write commits, so no worker rebuilds its policy from uncommitted rows.
+    """
+    transaction.on_commit(IPRestrictionMiddleware.invalidate_cache)
+
+
+@receiver(setting_changed)
+def reset_ip_restriction_policy(setting, **kwargs):
+    """
+    Drop this worker's policy snapshot when a BytePatrol setting is overridden, e.g. in tests.
     """
-    IPRestrictionMiddleware().invalidate_cache()
+    if setting.startswith("BYTE_PATROL_"):
+        IPRestrictionMiddleware._policy = None
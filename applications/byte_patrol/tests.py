@@ -3,14 +3,26 @@ import logging
 import os
 import sys
 
+from asgiref.sync import async_to_sync
 from django.conf import settings
-from django.test import Client, TestCase, override_settings
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.test.client import ClientHandler, RequestFactory
 from loguru import logger
+from prometheus_client import REGISTRY
 
 from applications.byte_patrol.test_urls import testing_protected, testing_unprotected
-
-from .middleware import IPRestrictionMiddleware
+from utils.request_cache import request_cache
+
+from .gateway import EarlyRejectASGIApp, EarlyRejectWSGIApp
+from .middleware import (
+    GATEWAY_CHECKED_KEY,
+    POLICY_VERSION_KEY,
+    IPNetworkIndex,
+    IPRestrictionMiddleware,
+    PathMatcher,
+)
+from .models import IPAllowList, ProtectedPath
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -374,3 +386,213 @@ class BytePatrolAccessTests(TestCase):
         self.assertNotEqual(
             response.status_code, 403, "Disallowed IP should access unprotected path"
         )
+
+
+class PathMatcherTests(SimpleTestCase):
+    def test_matches_like_re_match_with_and_without_leading_slash(self):
+        matcher = PathMatcher(
+            [r"^/byte_patrol/protected/.*$", "admin/", r"^/checkup/\d+$"]
+        )
+
+        self.assertTrue(matcher.matches("/byte_patrol/protected/x"))
+        self.assertTrue(matcher.matches("byte_patrol/protected/"))
+        self.assertTrue(matcher.matches("/admin/login/"))
+        self.assertTrue(matcher.matches("/checkup/42"))
+        self.assertFalse(matcher.matches("/checkup/"))
+        self.assertFalse(matcher.matches("/byte_patrol/public/"))
+
+    def test_patterns_that_cannot_be_combined_or_compiled_still_match(self):
+        matcher = PathMatcher([r"(?i)^/Reports/", r"^/(a)\1/", "/broken[/"])
+
+        self.assertTrue(matcher.matches("/reports/daily"))
+        self.assertTrue(matcher.matches("/aa/"))
+        self.assertTrue(matcher.matches("/broken[/"))
+        self.assertFalse(matcher.matches("/ab/"))
+
+    def test_backreferences_match_their_own_groups(self):
+        matcher = PathMatcher([r"^/(a)y", r"^/(b)\1/", r"^/(?P<c>c)(?P=c)/"])
+
+        self.assertTrue(matcher.matches("/bb/"))
+        self.assertTrue(matcher.matches("/cc/"))
+        self.assertTrue(matcher.matches("/ay"))
+        self.assertFalse(matcher.matches("/ba/"))
+
+
+class IPNetworkIndexTests(SimpleTestCase):
+    def test_membership_across_families_and_overlapping_networks(self):
+        index = IPNetworkIndex(
+            [
+                "192.168.1.1",
+                "10.0.0.0/8",
+                "10.1.0.0/16",
+                "172.16.0.0/31",
+                "172.16.0.2/31",
+                "2001:db8::/32",
+                "not-an-ip",
+            ]
+        )
+
+        for ip in ["192.168.1.1", "10.255.0.1", "172.16.0.3", "2001:db8::1"]:
+            self.assertIn(ip, index)
+        for ip in [
+            "192.168.1.2",
+            "11.0.0.0",
+            "172.16.0.4",
+            "2001:db9::",
+            "::ffff:a00:1",
+        ]:
+            self.assertNotIn(ip, index)
+        self.assertIn("not-an-ip", index)
+        self.assertNotIn("also-not-an-ip", index)
+
+
+class PolicySnapshotTests(TestCase):
+    def setUp(self):
+        self.middleware = IPRestrictionMiddleware(lambda request: None)
+        IPRestrictionMiddleware.invalidate_cache()
+
+    def test_steady_state_requests_make_no_redis_calls(self):
+        self.middleware._is_path_restricted("/private/")
+        with request_cache.batch() as batch:
+            for _ in range(3):
+                self.middleware._is_path_restricted("/private/")
+                self.middleware._is_ip_allowed("10.0.0.1")
+
+        self.assertEqual(batch.round_trips, 0)
+
+    @override_settings(BYTE_PATROL_PROTECTED_PATHS=[])
+    def test_policy_rebuilt_when_another_worker_bumps_the_version(self):
+        self.assertFalse(self.middleware._is_path_restricted("/private/"))
+        ProtectedPath.objects.create(path_pattern=r"^/private/")
+        # Another worker's write: this worker only learns of it through the version key
+        IPRestrictionMiddleware._policy.checked_at -= 1
+        self.assertFalse(self.middleware._is_path_restricted("/private/"))
+
+        cache.set(POLICY_VERSION_KEY, 1, timeout=None)
+        IPRestrictionMiddleware._policy.checked_at -= 1
+        self.assertTrue(self.middleware._is_path_restricted("/private/"))
+
+    @override_settings(BYTE_PATROL_PROTECTED_PATHS=[])
+    def test_policy_writes_bump_the_version_on_commit(self):
+        version = cache.get(POLICY_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            ProtectedPath.objects.create(path_pattern=r"^/private/")
+
+        self.assertNotEqual(cache.get(POLICY_VERSION_KEY), version)
+        self.assertTrue(self.middleware._is_path_restricted("/private/"))
+
+    @override_settings(
+        BYTE_PATROL_ALLOWED_IPS=["192.168.1.1"],
+        BYTE_PATROL_PROTECTED_PATHS=[r"^/checkup/"],
+    )
+    def test_verdicts_are_cached_per_ip_and_path_until_the_policy_changes(self):
+        def verdict_cache(result):
+            return (
+                REGISTRY.get_sample_value(
+                    "ip_restriction_verdict_cache_total", {"result": result}
+                )
+                or 0
+            )
+
+        hits, misses = verdict_cache("hit"), verdict_cache("miss")
+        policy = self.middleware._get_policy()
+        self.assertTrue(policy.is_denied("10.0.0.1", "/checkup/"))
+        self.assertTrue(policy.is_denied("10.0.0.1", "/checkup/"))
+        self.assertFalse(policy.is_denied("192.168.1.1", "/checkup/"))
+        # Unprotected paths are allowed without a verdict
+        self.assertFalse(policy.is_denied("10.0.0.1", "/menu/"))
+        self.assertEqual(len(policy.verdicts), 2)
+        self.assertEqual(verdict_cache("hit") - hits, 1)
+        self.assertEqual(verdict_cache("miss") - misses, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            IPAllowList.objects.create(ip_address="10.0.0.1")
+        self.assertFalse(
+            self.middleware._get_policy().is_denied("10.0.0.1", "/checkup/")
+        )
+
+
+@override_settings(
+    BYTE_PATROL_ALLOWED_IPS=["192.168.1.1"],
+    BYTE_PATROL_PROTECTED_PATHS=[r"^/byte_patrol/protected/"],
+)
+class EarlyRejectTests(TestCase):
+    def setUp(self):
+        self.forwarded = []
+        self.marked = []
+
+    def wsgi_app(self, environ, start_response):
+        self.forwarded.append(environ["PATH_INFO"])
+        self.marked.append(environ.get(GATEWAY_CHECKED_KEY))
+        start_response("200 OK", [])
+        return [b"ok"]
+
+    async def asgi_app(self, scope, receive, send):
+        self.forwarded.append(scope["path"])
+        self.marked.append(scope.get(GATEWAY_CHECKED_KEY))
+
+    def test_wsgi_wrapper_rejects_before_django(self):
+        application = EarlyRejectWSGIApp(self.wsgi_app)
+        statuses = []
+
+        def start_response(status, headers):
+            statuses.append(status)
+
+        for path, ip in [
+            ("/byte_patrol/protected/", "10.0.0.1"),
+            ("/byte_patrol/protected/", "192.168.1.1"),
+            ("/byte_patrol/public/", "10.0.0.1"),
+        ]:
+            environ = RequestFactory().get(path, REMOTE_ADDR=ip).environ
+            application(environ, start_response)
+
+        self.assertEqual(statuses, ["403 Forbidden", "200 OK", "200 OK"])
+        self.assertEqual(
+            self.forwarded, ["/byte_patrol/protected/", "/byte_patrol/public/"]
+        )
+        self.assertEqual(self.marked, [True, True])
+
+    def test_asgi_wrapper_rejects_before_django(self):
+        application = EarlyRejectASGIApp(self.asgi_app)
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        for path, headers in [
+            ("/byte_patrol/protected/", []),
+            ("/byte_patrol/protected/", [(b"x-forwarded-for", b"192.168.1.1")]),
+        ]:
+            scope = {
+                "type": "http",
+                "path": path,
+                "headers": headers,
+                "client": ("10.0.0.1", 5000),
+            }
+            async_to_sync(application)(scope, None, send)
+
+        self.assertEqual(messages[0]["status"], 403)
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(self.forwarded, ["/byte_patrol/protected/"])
+        self.assertEqual(self.marked, [True])
+
+    def test_middleware_skips_requests_the_gateway_allowed(self):
+        def verdict_lookups():
+            return sum(
+                REGISTRY.get_sample_value(
+                    "ip_restriction_verdict_cache_total", {"result": result}
+                )
+                or 0
+                for result in ("hit", "miss")
+            )
+
+        middleware = IPRestrictionMiddleware(lambda request: None)
+        lookups = verdict_lookups()
+        request = RequestFactory().get(
+            "/byte_patrol/protected/",
+            REMOTE_ADDR="10.0.0.1",
+            **{GATEWAY_CHECKED_KEY: True},
+        )
+
+        self.assertIsNone(middleware.process_request(request))
+        self.assertEqual(verdict_lookups(), lookups)
@@ -14,7 +14,7 @@ from applications.resturant.serializers.core import (
     BookingSerializer,
     MenuSerializer,
 )
-from utils.cache import CachedResponseMixin
+from utils.cache import CACHE_SCOPE_PUBLIC, CACHE_SCOPE_USER, CachedResponseMixin
 
 
 def handler_page_not_found_404(request, exception):
@@ -100,6 +100,12 @@ class BookingListView(CachedResponseMixin, generics.ListAPIView):
     filterset_class = BookingFilter
     ordering_fields = ["date", "no_of_guests"]
     permission_classes = [IsAuthenticated]
+    cache_rendered_response = True
+    conditional_get = True
+    predicate_invalidation = True
+    cache_id_lists = True
+    cache_fragments = True
+    cache_scope = CACHE_SCOPE_USER
 
 
 @extend_schema(
@@ -173,6 +179,10 @@ class BookingView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     primary_model = Booking
     filter_backends = [DjangoFilterBackend]
     permission_classes = [IsAuthenticated]
+    cache_rendered_response = True
+    conditional_get = True
+    cache_objects = True
+    cache_scope = CACHE_SCOPE_USER
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -427,6 +437,12 @@ class MenuListView(CachedResponseMixin, generics.ListAPIView):
     filterset_class = ProductFilter
     primary_model = Menu
     permission_classes = [IsAuthenticated]
+    cache_rendered_response = True
+    conditional_get = True
+    predicate_invalidation = True
+    cache_id_lists = True
+    cache_fragments = True
+    cache_scope = CACHE_SCOPE_PUBLIC
 
 
 @extend_schema(
@@ -489,6 +505,10 @@ class MenuView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     search_fields = ["title"]
     filterset_class = ProductFilter
     permission_classes = [IsAuthenticated]
+    cache_rendered_response = True
+    conditional_get = True
+    cache_objects = True
+    cache_scope = CACHE_SCOPE_PUBLIC
 
     @extend_schema(
         summary="Retrieve Specific Menu Item By ID",
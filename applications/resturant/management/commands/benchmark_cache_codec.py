@@ -0,0 +1,120 @@
+import datetime
+import pickle
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+from loguru import logger
+
+from applications.resturant.models import Booking
+from applications.resturant.serializers.core import BookingSerializer
+from utils.codecs import COMPRESSORS, SERIALIZERS, CacheCodec
+
+BENCHMARK_KEY = "benchmark:codec"
+
+
+class PickleCodec:
+    """The pickling django_redis applies to values by default, as the baseline."""
+
+    def encode(self, value) -> bytes:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes):
+        return pickle.loads(data)
+
+
+def build_entry(rows: int) -> dict:
+    """Builds a cached list entry holding `rows` serialized bookings, as `CachedResponseMixin` stores it."""
+    start = datetime.datetime(2030, 1, 1, 18, 0)
+    bookings = [
+        Booking(
+            booking_id=index,
+            name=f"Guest Number {index}",
+            no_of_guests=index % 25 + 1,
+            date=start + datetime.timedelta(minutes=15 * index),
+        )
+        for index in range(1, rows + 1)
+    ]
+    logger.disable("applications.resturant.serializers")
+    try:
+        results = BookingSerializer(bookings, many=True).data
+    finally:
+        logger.enable("applications.resturant.serializers")
+    data = {"count": rows, "next": None, "previous": None, "results": results}
+    return {"data": data, "delta": 0.01, "expires_at": time.time() + 300}
+
+
+def time_call(func, repeat: int) -> float:
+    """Returns the median wall-clock latency of `repeat` calls to `func` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def redis_memory(connection, encoded: bytes) -> int:
+    """Returns the bytes Redis uses to hold `encoded`, or its length if MEMORY USAGE is unavailable."""
+    key = cache.make_key(BENCHMARK_KEY)
+    connection.set(key, encoded, ex=60)
+    try:
+        return int(connection.memory_usage(key, samples=0))
+    except Exception:
+        return len(encoded)
+    finally:
+        connection.delete(key)
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the cache codecs against pickling for cached list payloads"
+
+    def add_arguments(self, parser):
+        """Adds command line arguments for the benchmark."""
+        parser.add_argument(
+            "--rows",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000],
+            help="Payload sizes, in serialized bookings, to benchmark",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Number of encodes and decodes timed for each codec",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=int,
+            default=1024,
+            help="Size in bytes from which the codecs compress",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_redis_connection("default")
+        codecs = {"pickle": PickleCodec()}
+        for serializer in SERIALIZERS:
+            for compressor in [None, *COMPRESSORS]:
+                codecs[f"{serializer}+{compressor or 'raw'}"] = CacheCodec(
+                    serializer=serializer,
+                    compressor=compressor,
+                    compress_threshold=options["threshold"],
+                )
+
+        self.stdout.write(
+            f"{'rows':>6} {'codec':<16} {'bytes':>9} {'redis bytes':>12} {'encode ms':>10} {'decode ms':>10}"
+        )
+        for rows in options["rows"]:
+            entry = build_entry(rows)
+            for name, codec in codecs.items():
+                encoded = codec.encode(entry)
+                encode_ms = time_call(lambda: codec.encode(entry), options["repeat"])
+                decode_ms = time_call(lambda: codec.decode(encoded), options["repeat"])
+                self.stdout.write(
+                    f"{rows:>6} {name:<16} {len(encoded):>9} {redis_memory(connection, encoded):>12} "
+                    f"{encode_ms:>10.3f} {decode_ms:>10.3f}"
+                )
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,118 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from utils.cache import get_generation_key, get_lists_version_name, invalidate_model
+
+BENCHMARK_KEY_PREFIX = "benchmark:invalidation:"
+
+
+class BenchmarkModel:
+    """Stand-in sender so the benchmark never invalidates a real model namespace."""
+
+
+def fill_keyspace(connection, start: int, stop: int, batch_size: int) -> None:
+    """Writes filler keys `start`..`stop` to Redis in pipelined batches."""
+    for batch_start in range(start, stop, batch_size):
+        pipeline = connection.pipeline(transaction=False)
+        for index in range(batch_start, min(batch_start + batch_size, stop)):
+            pipeline.set(f"{BENCHMARK_KEY_PREFIX}{index}", b"x", ex=3600)
+        pipeline.execute()
+
+
+def purge_keyspace(connection, batch_size: int) -> None:
+    """Removes every filler key with SCAN so cleanup never blocks Redis."""
+    batch = []
+    for key in connection.scan_iter(match=f"{BENCHMARK_KEY_PREFIX}*", count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            connection.delete(*batch)
+            batch = []
+    if batch:
+        connection.delete(*batch)
+
+
+def time_call(func, repeat: int) -> list:
+    """Returns the wall-clock latency of `repeat` calls to `func` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Benchmarks cache invalidation latency as the Redis keyspace grows"
+
+    def add_arguments(self, parser):
+        """Adds command line arguments for the benchmark."""
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000, 100_000, 1_000_000],
+            help="Keyspace sizes to benchmark at",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=100,
+            help="Number of invalidations timed at each keyspace size",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of filler keys written or deleted per pipeline",
+        )
+        parser.add_argument(
+            "--compare-keys",
+            action="store_true",
+            help="Also time the KEYS scan the previous invalidation relied on",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_redis_connection("default")
+        batch_size = options["batch_size"]
+        filled = 0
+
+        header = f"{'keys':>10} {'median ms':>10} {'p99 ms':>10}"
+        if options["compare_keys"]:
+            header += f" {'KEYS median ms':>15}"
+        self.stdout.write(header)
+
+        try:
+            for size in sorted(options["sizes"]):
+                if size > filled:
+                    fill_keyspace(connection, filled, size, batch_size)
+                    filled = size
+
+                timings = time_call(
+                    lambda: invalidate_model(BenchmarkModel),
+                    options["repeat"],
+                )
+                p99 = statistics.quantiles(timings, n=100)[98]
+                row = f"{size:>10} {statistics.median(timings):>10.3f} {p99:>10.3f}"
+
+                if options["compare_keys"]:
+                    keys_timings = time_call(
+                        lambda: cache.keys(f"{BenchmarkModel.__name__}:*"),
+                        max(1, options["repeat"] // 10),
+                    )
+                    row += f" {statistics.median(keys_timings):>15.3f}"
+                self.stdout.write(row)
+        finally:
+            purge_keyspace(connection, batch_size)
+            model_name = BenchmarkModel.__name__
+            cache.delete_many(
+                [
+                    get_generation_key(model_name),
+                    get_generation_key(get_lists_version_name(model_name)),
+                ]
+            )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,192 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+# Upper bounds, in seconds, of the TTL ranges keys are grouped into; keys without an expiry are reported separately
+TTL_BUCKETS = ((60, "<1m"), (300, "<5m"), (3600, "<1h"), (86400, "<1d"))
+# Response keys end with the cache identity followed by the md5 digest of the request
+REQUEST_DIGEST_PATTERN = "?" * 32
+
+
+def scan_keys(connection, pattern: str, batch_size: int):
+    """Yields the cache keys matching `pattern`, with SCAN so Redis is never blocked.
+
+    Args:
+        connection: The Redis connection backing the cache.
+        pattern (str): A glob over unprefixed cache keys.
+        batch_size (int): Number of keys Redis examines per SCAN call.
+
+    Yields:
+        bytes: The matching keys, as stored in Redis.
+    """
+    yield from connection.scan_iter(match=cache.make_key(pattern), count=batch_size)
+
+
+def measure_keys(connection, keys: list) -> list:
+    """Returns the size in bytes and the TTL in seconds of each key, in one pipelined round-trip.
+
+    Sizes are the bytes Redis uses to hold each key, or the length of its serialized DUMP on servers without MEMORY
+    USAGE. TTLs are None for keys that never expire.
+    """
+    pipeline = connection.pipeline(transaction=False)
+    for key in keys:
+        pipeline.pttl(key)
+        pipeline.memory_usage(key, samples=0)
+    try:
+        results = pipeline.execute()
+        ttls, sizes = results[::2], results[1::2]
+    except ResponseError:
+        pipeline = connection.pipeline(transaction=False)
+        for key in keys:
+            pipeline.pttl(key)
+            pipeline.dump(key)
+        results = pipeline.execute()
+        ttls, sizes = results[::2], [len(dump or b"") for dump in results[1::2]]
+    return [
+        (int(size or 0), ttl / 1000 if ttl >= 0 else None)
+        for ttl, size in zip(ttls, sizes)
+    ]
+
+
+def get_ttl_bucket(ttl) -> str:
+    """Returns the label of the TTL range a key falls into."""
+    if ttl is None:
+        return "none"
+    for bound, label in TTL_BUCKETS:
+        if ttl < bound:
+            return label
+    return ">=1d"
+
+
+class Command(BaseCommand):
+    help = "Reports what the Redis cache holds per model namespace, and purges entries by model, view or user"
+
+    def add_arguments(self, parser):
+        """Adds command line arguments for the cache inspector."""
+        parser.add_argument(
+            "--match",
+            type=str,
+            default="*",
+            help="Only inspect cache keys matching this glob, e.g. 'Menu:*'",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=5,
+            help="Number of the largest entries listed per namespace",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of keys scanned, measured or deleted per round-trip",
+        )
+        parser.add_argument(
+            "--purge-model",
+            type=str,
+            action="append",
+            default=[],
+            help="Delete every entry in a model namespace, e.g. Menu (repeatable)",
+        )
+        parser.add_argument(
+            "--purge-view",
+            type=str,
+            action="append",
+            default=[],
+            help="Delete every response cached by a view, e.g. MenuListView (repeatable)",
+        )
+        parser.add_argument(
+            "--purge-user",
+            type=str,
+            action="append",
+            default=[],
+            help="Delete every response cached for a user primary key or cache identity (repeatable)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the entries a purge would delete without deleting them",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_redis_connection("default")
+        patterns = [
+            *(f"{model}:*" for model in options["purge_model"]),
+            *(f"*:{view}_*" for view in options["purge_view"]),
+            *(
+                f"*_{user}_{REQUEST_DIGEST_PATTERN}_cache_key"
+                for user in options["purge_user"]
+            ),
+        ]
+        if patterns:
+            self.purge(connection, patterns, options["batch_size"], options["dry_run"])
+        else:
+            self.report(
+                connection, options["match"], options["top"], options["batch_size"]
+            )
+
+    def report(self, connection, pattern: str, top: int, batch_size: int) -> None:
+        """Writes key counts, bytes, TTL distribution and largest entries per namespace."""
+        prefix_length = len(cache.make_key(""))
+        counts = defaultdict(int)
+        sizes = defaultdict(int)
+        ttls = defaultdict(lambda: defaultdict(int))
+        largest = defaultdict(list)
+
+        def measure(keys):
+            for key, (size, ttl) in zip(keys, measure_keys(connection, keys)):
+                name = key.decode("utf-8", "replace")[prefix_length:]
+                namespace = name.partition(":")[0]
+                counts[namespace] += 1
+                sizes[namespace] += size
+                ttls[namespace][get_ttl_bucket(ttl)] += 1
+                largest[namespace] = sorted(
+                    [*largest[namespace], (size, name)], reverse=True
+                )[:top]
+
+        batch = []
+        for key in scan_keys(connection, pattern, batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                measure(batch)
+                batch = []
+        if batch:
+            measure(batch)
+
+        bucket_labels = ["none", *(label for _, label in TTL_BUCKETS), ">=1d"]
+        self.stdout.write(
+            f"{'namespace':<24} {'keys':>8} {'bytes':>12} "
+            + " ".join(f"{label:>6}" for label in bucket_labels)
+        )
+        for namespace in sorted(sizes, key=sizes.get, reverse=True):
+            self.stdout.write(
+                f"{namespace:<24} {counts[namespace]:>8} {sizes[namespace]:>12} "
+                + " ".join(f"{ttls[namespace][label]:>6}" for label in bucket_labels)
+            )
+        for namespace in sorted(largest):
+            self.stdout.write(f"\nLargest entries in {namespace}:")
+            for size, name in largest[namespace]:
+                self.stdout.write(f"  {size:>10}  {name}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inspected {sum(counts.values())} keys ({sum(sizes.values())} bytes)"
+            )
+        )
+
+    def purge(self, connection, patterns: list, batch_size: int, dry_run: bool) -> None:
+        """Deletes, or only counts, the keys matching any of `patterns`."""
+        purged = 0
+        for pattern in patterns:
+            batch = []
+            for key in scan_keys(connection, pattern, batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    purged += len(batch) if dry_run else connection.unlink(*batch)
+                    batch = []
+            if batch:
+                purged += len(batch) if dry_run else connection.unlink(*batch)
+        verb = "Would purge" if dry_run else "Purged"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {purged} keys"))
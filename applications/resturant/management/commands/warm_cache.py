@@ -0,0 +1,52 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from utils.warming import warm_popular_requests
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the cache entries of the most popular API requests"
+
+    def add_arguments(self, parser):
+        """Adds command line arguments for cache warming."""
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Number of the most popular requests to replay",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of requests replayed concurrently",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=10,
+            help="Maximum requests replayed per second (0 for no limit)",
+        )
+        parser.add_argument(
+            "--model",
+            type=str,
+            help="Only replay requests for this model, e.g. Menu",
+        )
+
+    def handle(self, *args, **options):
+        results = warm_popular_requests(
+            limit=options["limit"],
+            workers=options["workers"],
+            rate=options["rate"],
+            model=options["model"],
+        )
+        outcomes = Counter(
+            outcome if isinstance(outcome, int) else type(outcome).__name__
+            for _, outcome in results
+        )
+        for outcome, count in sorted(outcomes.items(), key=str):
+            self.stdout.write(f"{outcome}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Replayed {len(results)} popular requests")
+        )
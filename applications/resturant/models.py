@@ -1,7 +1,10 @@
 from django.db.models import Index, Model, fields
 
+from utils.managers import CachedManager
+from utils.predicates import LoadedValuesMixin
 
-class Booking(Model):
+
+class Booking(LoadedValuesMixin, Model):
     booking_id = fields.SmallAutoField(verbose_name="Booking ID", primary_key=True)
     name = fields.CharField(
         verbose_name="Guest Name", max_length=255, null=False, blank=False
@@ -11,6 +14,8 @@ class Booking(Model):
     )
     date = fields.DateTimeField(verbose_name="Date of Booking")
 
+    objects = CachedManager()
+
     def __str__(self):
         return f"Booking ID: {self.booking_id}, Name: {self.name}, Date: {self.date}"
 
@@ -27,7 +32,7 @@ class Booking(Model):
         ]
 
 
-class Menu(Model):
+class Menu(LoadedValuesMixin, Model):
     item_id = fields.SmallAutoField(verbose_name="Menu Item ID", primary_key=True)
     title = fields.CharField(
         verbose_name="Item Title", max_length=255, null=False, blank=False
@@ -39,6 +44,8 @@ class Menu(Model):
         verbose_name="Number in Stock", blank=False, null=True
     )
 
+    objects = CachedManager()
+
     def __str__(self):
         return f"Menu Item ID: {self.item_id}, Title: {self.title}, Price: {self.price}, Inventory: {self.inventory}"
 
@@ -242,6 +242,9 @@ class MenuSerializer(serializers.ModelSerializer):
     Serializes and deserializes menu item data.
     """
 
+    # Bump whenever the serialized shape changes so cached payloads are rebuilt
+    cache_version = 1
+
     item_id = serializers.IntegerField(
         read_only=True, help_text="Unique identifier for the menu item"
     )
@@ -265,6 +268,9 @@ class MenuSerializer(serializers.ModelSerializer):
 class BookingSerializer(DateTimeParsingMixin, serializers.ModelSerializer):
     """Serializer for Booking objects."""
 
+    # Bump whenever the serialized shape changes so cached payloads are rebuilt
+    cache_version = 1
+
     booking_id = serializers.IntegerField(
         read_only=True, help_text="Unique identifier for the booking"
     )
@@ -0,0 +1,1096 @@
+import time
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.db.models import F
+from django.test import SimpleTestCase, TransactionTestCase, modify_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from redis import Redis
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+
+from applications.byte_patrol.middleware import IPRestrictionMiddleware
+from applications.resturant.endpoints import BookingListView, MenuListView, MenuView
+from applications.resturant.models import Menu
+from applications.resturant.serializers.core import MenuSerializer
+from utils.cache import (
+    CACHE_TTL_MAX,
+    CACHE_TTL_MIN,
+    GENERATION_TTL,
+    POPULARITY_KEY,
+    STALE_RESPONSE_HEADER,
+    VIEW_CACHE_TTL,
+    TieredCache,
+    bump_generation,
+    bump_generations,
+    cache_invalidation_batch,
+    canonicalize_query_params,
+    database_breaker,
+    get_cache_ttl,
+    get_generation_key,
+    get_generations,
+    get_object_version_name,
+    local_cache,
+    local_failed_invalidations,
+    local_generations,
+    local_write_intervals,
+    metrics,
+    record_write_interval,
+)
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.codecs import CacheCodec, CodecError
+from utils.local_cache import LocalCache
+from utils.predicates import row_matches
+from utils.request_cache import redis_breaker, request_cache
+from utils.throttling import AnonRateThrottle, UserRateThrottle
+from utils.warming import replay_request, warm_popular_requests
+
+
+def clear_caches():
+    """Drop every cached entry; rows rolled back between tests never invalidate what was cached from them."""
+    cache.clear()
+    local_cache.clear()
+    local_generations.clear()
+    local_write_intervals.clear()
+    local_failed_invalidations.clear()
+    # The worker's policy snapshot outlives the policy version cleared with Redis
+    IPRestrictionMiddleware._policy = None
+
+
+class AuthenticatedCacheTestCase(APITestCase):
+    """Runs each test with empty caches, as an authenticated user, against a single "Tacos" menu item.
+
+    Subclasses needing other rows override `create_menus`, which runs with on-commit invalidation executed.
+    """
+
+    def setUp(self):
+        clear_caches()
+        self.client = APIClient()
+        self.test_user = User.objects.create_user(
+            username=f"{self.__class__.__name__.lower()}_user", password="testpassword"
+        )
+        self.test_token = Token.objects.create(user=self.test_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.test_token.key}")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_menus()
+        self.menu_list_url = reverse("menu-list")
+
+    def create_menus(self):
+        self.menu = Menu.objects.create(title="Tacos", price=5.99, inventory=30)
+
+
+class CacheInvalidationTestCase(AuthenticatedCacheTestCase):
+    def test_bump_generation_is_monotonic(self):
+        before = get_generations(["Menu"])["Menu"]
+        bumped = bump_generation("Menu")
+        self.assertGreater(bumped, before)
+        self.assertGreater(bump_generation("Menu"), bumped)
+        self.assertGreaterEqual(get_generations(["Menu"])["Menu"], bumped + 1)
+
+    def test_generation_counters_expire_when_idle(self):
+        get_generations(["Menu:list:seeded"])
+        bump_generation("Menu:list:bumped")
+
+        for name in ("Menu:list:seeded", "Menu:list:bumped"):
+            ttl = cache.ttl(get_generation_key(name))
+            self.assertGreaterEqual(ttl, CACHE_TTL_MAX)
+            self.assertLessEqual(ttl, GENERATION_TTL)
+
+    def test_instance_bump_advances_past_the_objects_epoch(self):
+        version_name = get_object_version_name("Menu", self.menu.pk)
+        # An epoch set by a worker whose clock runs ahead
+        ahead = get_generations([version_name])[version_name] + 10**9
+        cache.set(get_generation_key("Menu:objects"), ahead, timeout=None)
+        local_generations.clear()
+        self.assertEqual(get_generations([version_name])[version_name], ahead)
+
+        self.assertGreater(bump_generation(version_name), ahead)
+        self.assertGreater(get_generations([version_name])[version_name], ahead)
+
+    def test_save_advances_generation(self):
+        before = get_generations(["Menu"])["Menu"]
+        self.menu.inventory = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+        self.assertGreater(get_generations(["Menu"])["Menu"], before)
+
+    def test_writes_in_a_transaction_are_invalidated_once_on_commit(self):
+        with mock.patch(
+            "utils.cache.bump_generations", wraps=bump_generations
+        ) as bump, self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for index in range(20):
+                Menu.objects.create(title=f"Special {index}", price=9.99, inventory=5)
+            self.assertEqual(bump.call_count, 0)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(bump.call_count, 1)
+
+    def test_writes_to_uncached_models_are_ignored(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.create_user(username="uncached_testuser", password="pw")
+        self.assertEqual(callbacks, [])
+
+    def test_rolled_back_writes_are_not_invalidated(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+                raise RuntimeError
+            self.assertEqual(callbacks, [])
+            Menu.objects.create(title="Nachos", price=6.99, inventory=8)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_write_orphans_cached_list(self):
+        response = self.client.get(self.menu_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+        response = self.client.get(self.menu_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [item["title"] for item in response.json()["results"]]
+        self.assertIn("Burrito", titles)
+
+
+class CacheKeyTestCase(APITestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.test_user = User.objects.create_user(
+            username="cache_key_testuser", password="testpassword"
+        )
+        self.menu_list_url = reverse("menu-list")
+
+    def build_view(self, query="", view_class=MenuListView, user=None):
+        request = Request(self.factory.get(f"{self.menu_list_url}{query}"))
+        request.user = user or self.test_user
+        view = view_class()
+        view.setup(request)
+        view.format_kwarg = None
+        return view
+
+    def test_canonicalize_query_params_sorts_and_drops_blanks(self):
+        self.assertEqual(
+            canonicalize_query_params({"title": ["salad"], "max_price": [""]}),
+            canonicalize_query_params({"max_price": [], "title": ["salad"]}),
+        )
+        self.assertEqual(canonicalize_query_params({"b": ["2"], "a": ["1"]}), "a=1&b=2")
+
+    def test_equivalent_queries_share_a_key(self):
+        self.assertEqual(
+            self.build_view("?min_price=5&title=salad").get_cache_key(),
+            self.build_view("?title=salad&min_price=5&max_price=").get_cache_key(),
+        )
+
+    def test_default_pagination_is_normalized(self):
+        self.assertEqual(
+            self.build_view().get_cache_key(),
+            self.build_view("?limit=10&offset=0").get_cache_key(),
+        )
+        self.assertNotEqual(
+            self.build_view().get_cache_key(),
+            self.build_view("?offset=10").get_cache_key(),
+        )
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertNotEqual(
+            self.build_view("?min_price=5").get_cache_key(),
+            self.build_view("?min_price=50").get_cache_key(),
+        )
+
+    def test_key_derivation_does_not_query_the_database(self):
+        view = self.build_view("?min_price=5")
+        with self.assertNumQueries(0):
+            view.get_cache_key()
+
+    def test_public_scope_shares_one_entry(self):
+        other_user = User.objects.create_user(
+            username="cache_key_otheruser", password="testpassword"
+        )
+        self.assertEqual(
+            self.build_view().get_cache_key(),
+            self.build_view(user=other_user).get_cache_key(),
+        )
+
+    def test_user_scope_keeps_entries_per_user(self):
+        other_user = User.objects.create_user(
+            username="cache_key_otheruser", password="testpassword"
+        )
+        cache_key = self.build_view(view_class=BookingListView).get_cache_key()
+        self.assertIn(f"_{self.test_user.pk}_", cache_key)
+        self.assertNotEqual(
+            cache_key,
+            self.build_view(
+                view_class=BookingListView, user=other_user
+            ).get_cache_key(),
+        )
+
+
+class RenderedCacheTestCase(AuthenticatedCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.menu_detail_url = reverse("menu-detail", args=[self.menu.pk])
+
+    def test_list_hit_serves_rendered_bytes_with_pagination_envelope(self):
+        miss = self.client.get(self.menu_list_url)
+        hit = self.client.get(self.menu_list_url)
+
+        self.assertIsInstance(miss, Response)
+        self.assertNotIsInstance(hit, Response)
+        self.assertEqual(hit.status_code, status.HTTP_200_OK)
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit["Content-Type"], miss["Content-Type"])
+        self.assertEqual(hit.json()["count"], 1)
+
+    def test_detail_hit_serves_rendered_bytes(self):
+        miss = self.client.get(self.menu_detail_url)
+        hit = self.client.get(self.menu_detail_url)
+
+        self.assertNotIsInstance(hit, Response)
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit.json()["title"], "Tacos")
+
+    def test_redis_holds_encoded_bytes(self):
+        miss = self.client.get(self.menu_list_url)
+        local_cache.clear()
+
+        for key in cache.keys("Menu:MenuListView_*"):
+            self.assertIsInstance(cache.get(key), bytes)
+        hit = self.client.get(self.menu_list_url)
+        self.assertNotIsInstance(hit, Response)
+        self.assertEqual(hit.content, miss.content)
+
+
+class CacheCodecTestCase(SimpleTestCase):
+    def test_round_trip_keeps_bytes_and_compresses_large_values(self):
+        codec = CacheCodec(serializer="json", compressor="zlib", compress_threshold=64)
+        small = {"content": b"\x00body", "headers": {}}
+        large = {"results": [{"title": "Tacos", "price": "5.99"}] * 50}
+
+        self.assertEqual(codec.decode(codec.encode(small)), small)
+        self.assertEqual(codec.encode(small)[0] & 0x0F, 0)
+        self.assertEqual(codec.decode(codec.encode(large)), large)
+        self.assertNotEqual(codec.encode(large)[0] & 0x0F, 0)
+
+    def test_values_decode_whichever_codec_wrote_them(self):
+        writer = CacheCodec(serializer="json", compressor="zlib", compress_threshold=0)
+        value = {"count": 1, "results": [{"title": "Tacos"}]}
+        self.assertEqual(CacheCodec().decode(writer.encode(value)), value)
+
+    def test_objects_that_are_not_plain_data_are_rejected(self):
+        with self.assertRaises(CodecError):
+            CacheCodec(serializer="json").encode({"menu": Menu(title="Tacos")})
+
+
+class LocalCacheTestCase(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        local = LocalCache(max_entries=2, default_timeout=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("c"), 3)
+
+    def test_expired_entry_is_not_served(self):
+        local = LocalCache(max_entries=2, default_timeout=60)
+        local.set("a", 1, timeout=0)
+        self.assertIsNone(local.get("a"))
+
+
+class TieredCacheTestCase(SimpleTestCase):
+    def test_l2_hit_is_promoted_to_l1(self):
+        tiered = TieredCache(LocalCache(max_entries=8, default_timeout=60))
+        cache.set("tiered:test", {"title": "Tacos"}, timeout=60)
+
+        self.assertEqual(tiered.get("tiered:test", model="Menu"), {"title": "Tacos"})
+        cache.delete("tiered:test")
+        self.assertEqual(tiered.get("tiered:test", model="Menu"), {"title": "Tacos"})
+
+    def test_undecodable_l2_entry_is_a_miss_and_deleted(self):
+        tiered = TieredCache(
+            LocalCache(max_entries=8, default_timeout=60), codec=CacheCodec()
+        )
+        # Written by a serializer this worker does not have installed
+        cache.set("tiered:test", b"\xf0payload", timeout=60)
+
+        self.assertIsNone(tiered.get("tiered:test", model="Menu"))
+        self.assertIsNone(cache.get("tiered:test"))
+
+
+class CacheInstrumentationTestCase(AuthenticatedCacheTestCase):
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_redis_operations_are_timed_per_view(self):
+        labels = {"view": "MenuListView", "model": "Menu"}
+        misses = self.sample(
+            "cache_operation_seconds_count", operation="get", result="miss", **labels
+        )
+        hits = self.sample(
+            "cache_operation_seconds_count", operation="get", result="hit", **labels
+        )
+        writes = self.sample("cache_value_bytes_count", **labels)
+
+        self.client.get(self.menu_list_url)
+        local_cache.clear()
+        self.client.get(self.menu_list_url)
+
+        # The first request misses both the page and the ID list it is hydrated from
+        self.assertEqual(
+            self.sample(
+                "cache_operation_seconds_count",
+                operation="get",
+                result="miss",
+                **labels,
+            ),
+            misses + 2,
+        )
+        self.assertEqual(
+            self.sample(
+                "cache_operation_seconds_count", operation="get", result="hit", **labels
+            ),
+            hits + 1,
+        )
+        self.assertEqual(self.sample("cache_value_bytes_count", **labels), writes + 2)
+
+    def test_invalidation_records_generation_lifetime(self):
+        before = self.sample(
+            "cache_generation_lifetime_seconds_count", model="Menu", scope="model"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+
+        self.assertEqual(
+            self.sample(
+                "cache_generation_lifetime_seconds_count", model="Menu", scope="model"
+            ),
+            before + 1,
+        )
+        self.assertGreater(
+            self.sample(
+                "cache_generation_lifetime_seconds_count", model="Menu", scope="object"
+            ),
+            0,
+        )
+
+    def test_key_counts_are_reported_per_tier(self):
+        self.client.get(self.menu_list_url)
+
+        self.assertEqual(self.sample("cache_keys", tier="l1"), len(local_cache))
+        self.assertGreater(self.sample("cache_keys", tier="l2"), 0)
+
+
+class AdaptiveTtlTestCase(AuthenticatedCacheTestCase):
+    def test_write_interval_is_averaged(self):
+        record_write_interval("Menu", 100)
+        self.assertAlmostEqual(record_write_interval("Menu", 200), 120)
+
+    def test_ttl_follows_write_frequency_within_bounds(self):
+        record_write_interval("Menu", 10**9)
+        record_write_interval("Booking", 0.01)
+
+        self.assertEqual(get_cache_ttl(["Menu"]), CACHE_TTL_MAX)
+        self.assertEqual(get_cache_ttl(["Booking"]), CACHE_TTL_MIN)
+        self.assertEqual(get_cache_ttl(["Menu", "Booking"]), CACHE_TTL_MIN)
+
+    def test_ttl_falls_back_to_the_default_without_redis(self):
+        local_generations.clear()
+        local_write_intervals.clear()
+        redis_breaker.opened_at = time.monotonic()
+        self.addCleanup(redis_breaker.reset)
+
+        self.assertEqual(get_cache_ttl(["Menu"]), VIEW_CACHE_TTL)
+
+    def test_writes_shorten_the_ttl_of_cached_responses(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+        self.client.get(self.menu_list_url)
+
+        keys = [key for key in cache.keys("Menu:MenuListView_*") if "stale" not in key]
+        self.assertTrue(keys)
+        for key in keys:
+            self.assertLessEqual(cache.ttl(key), CACHE_TTL_MIN)
+
+    def test_fixed_view_ttl_overrides_the_adaptive_one(self):
+        record_write_interval("Menu", 0.01)
+        with mock.patch.object(MenuListView, "cache_ttl", 600):
+            self.client.get(self.menu_list_url)
+
+        for key in cache.keys("Menu:MenuListView_*"):
+            self.assertGreater(cache.ttl(key), CACHE_TTL_MIN)
+
+
+class ConditionalGetTestCase(AuthenticatedCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.menu_detail_url = reverse("menu-detail", args=[self.menu.pk])
+
+    def create_menus(self):
+        super().create_menus()
+        self.other_menu = Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get(self.menu_list_url)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):  # Token authentication only
+            not_modified = self.client.get(
+                self.menu_list_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_if_modified_since_is_not_modified(self):
+        response = self.client.get(self.menu_detail_url)
+        not_modified = self.client.get(
+            self.menu_detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_changes_the_etag(self):
+        response = self.client.get(self.menu_list_url)
+        self.menu.inventory = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+
+        modified = self.client.get(
+            self.menu_list_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], response["ETag"])
+
+    def test_detail_etag_only_tracks_its_own_instance(self):
+        response = self.client.get(self.menu_detail_url)
+        self.other_menu.inventory = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_menu.save()
+
+        not_modified = self.client.get(
+            self.menu_detail_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class StampedeProtectionTestCase(AuthenticatedCacheTestCase):
+    def test_regeneration_lock_is_released(self):
+        self.client.get(self.menu_list_url)
+        self.assertEqual(cache.keys("lock:*"), [])
+
+    def test_stale_copy_served_while_another_request_regenerates(self):
+        self.client.get(self.menu_list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+
+        with mock.patch("utils.cache.acquire_lock", return_value=None):
+            response = self.client.get(self.menu_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response[STALE_RESPONSE_HEADER], "true")
+        self.assertNotIn("ETag", response)
+        titles = [item["title"] for item in response.json()["results"]]
+        self.assertEqual(titles, ["Tacos"])
+
+    def test_stale_copy_of_deleted_instance_is_not_served(self):
+        menu_detail_url = reverse("menu-detail", args=[self.menu.pk])
+        self.client.get(menu_detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.delete()
+
+        with mock.patch("utils.cache.acquire_lock", return_value=None), mock.patch(
+            "utils.cache.CACHE_LOCK_WAIT", 0
+        ):
+            response = self.client.get(menu_detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn(STALE_RESPONSE_HEADER, response)
+
+    def test_regenerates_when_no_copy_arrives(self):
+        with mock.patch("utils.cache.acquire_lock", return_value=None), mock.patch(
+            "utils.cache.CACHE_LOCK_WAIT", 0
+        ):
+            response = self.client.get(self.menu_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(STALE_RESPONSE_HEADER, response)
+        self.assertEqual(response.json()["count"], 1)
+
+
+class CachedManagerTestCase(APITestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu = Menu.objects.create(title="Tacos", price=5.99, inventory=30)
+            self.other_menu = Menu.objects.create(
+                title="Burrito", price=8.99, inventory=12
+            )
+
+    def test_cached_get_reads_through(self):
+        self.assertEqual(Menu.objects.cached_get(self.menu.pk).title, "Tacos")
+        with self.assertNumQueries(0):
+            self.assertEqual(Menu.objects.cached_get(self.menu.pk).title, "Tacos")
+
+    def test_save_writes_through(self):
+        Menu.objects.cached_get(self.menu.pk)
+        self.menu.inventory = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(Menu.objects.cached_get(self.menu.pk).inventory, 5)
+
+    def test_delete_evicts(self):
+        pk = self.menu.pk
+        Menu.objects.cached_get(pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.delete()
+        with self.assertRaises(Menu.DoesNotExist):
+            Menu.objects.cached_get(pk)
+
+    def test_write_keeps_other_detail_entries(self):
+        factory = APIRequestFactory()
+        user = User.objects.create_user(username="manager_testuser", password="pw")
+
+        def detail_cache_key(menu):
+            url = reverse("menu-detail", args=[menu.pk])
+            request = Request(factory.get(url))
+            request.user = user
+            view = MenuView()
+            view.setup(request, item_id=str(menu.pk))
+            view.format_kwarg = None
+            return view.get_cache_key()
+
+        before = detail_cache_key(self.other_menu)
+        self.menu.inventory = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+        self.assertEqual(detail_cache_key(self.other_menu), before)
+
+
+class PredicateInvalidationTestCase(AuthenticatedCacheTestCase):
+    def get_list(self, query, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(f"{self.menu_list_url}{query}", **headers)
+
+    def test_write_keeps_lists_the_row_never_matches(self):
+        filtered = self.get_list("?min_price=50")
+        unfiltered = self.get_list("")
+        self.menu.price = Decimal("6.50")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+
+        self.assertEqual(
+            self.get_list("?min_price=50", filtered["ETag"]).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        self.assertEqual(
+            self.get_list("", unfiltered["ETag"]).status_code, status.HTTP_200_OK
+        )
+
+    def test_row_entering_a_filter_invalidates_it(self):
+        self.assertEqual(self.get_list("?min_price=50").json()["count"], 0)
+        self.menu.price = Decimal("60.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+        self.assertEqual(self.get_list("?min_price=50").json()["count"], 1)
+
+    def test_row_leaving_a_filter_invalidates_it(self):
+        menu = Menu.objects.get(pk=self.menu.pk)
+        self.assertEqual(self.get_list("?max_price=10").json()["count"], 1)
+        menu.price = Decimal("20.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.save(update_fields=["price"])
+        self.assertEqual(self.get_list("?max_price=10").json()["count"], 0)
+
+    def test_unknown_previous_values_invalidate_every_list(self):
+        filtered = self.get_list("?min_price=50")
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu(pk=self.menu.pk, title="Tacos", price=6.50, inventory=30).save()
+        self.assertEqual(
+            self.get_list("?min_price=50", filtered["ETag"]).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_row_matches_evaluates_filter_lookups(self):
+        row = {"item_id": 1, "title": "Fish Tacos", "price": Decimal("12.50")}
+        self.assertTrue(row_matches(Menu, [["price", "gte", "10", False]], row))
+        self.assertFalse(row_matches(Menu, [["price", "lte", "10", False]], row))
+        self.assertTrue(row_matches(Menu, [["title", "icontains", "taco", False]], row))
+        self.assertFalse(row_matches(Menu, [["title", "icontains", "taco", True]], row))
+        # Predicates on fields the row does not carry cannot rule it out
+        self.assertTrue(row_matches(Menu, [["inventory", "gte", "5", False]], row))
+
+
+@mock.patch("utils.cache.CACHE_POPULARITY_SAMPLE_RATE", 1.0)
+class CacheWarmingTestCase(AuthenticatedCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.delete_many([POPULARITY_KEY, f"{POPULARITY_KEY}:users"])
+
+    def test_requests_are_ranked_by_popularity(self):
+        self.client.get(self.menu_list_url)
+        self.client.get(f"{self.menu_list_url}?min_price=5")
+        self.client.get(f"{self.menu_list_url}?min_price=5")
+
+        popular = metrics.get_popular_requests(2, model="Menu")
+        self.assertEqual(len(popular), 2)
+        self.assertTrue(popular[0]["path"].endswith("?min_price=5"))
+        self.assertEqual(popular[0]["hits"], 2)
+        self.assertEqual(popular[0]["user"], str(self.test_user.pk))
+
+    def test_popular_requests_are_read_in_windows_of_the_limit(self):
+        for query in ("", "?min_price=1", "?min_price=2"):
+            self.client.get(f"{self.menu_list_url}{query}")
+
+        with mock.patch.object(
+            Redis, "zrevrange", autospec=True, side_effect=Redis.zrevrange
+        ) as zrevrange:
+            self.assertEqual(len(metrics.get_popular_requests(2)), 2)
+            self.assertEqual(metrics.get_popular_requests(2, model="Booking"), [])
+        self.assertEqual(
+            [call.args[2:] for call in zrevrange.call_args_list],
+            [(0, 1), (0, 1), (2, 3)],
+        )
+
+    def test_replay_rebuilds_the_cache_entry(self):
+        self.client.get(self.menu_list_url)
+        bump_generation("Menu")
+
+        [request] = metrics.get_popular_requests(1)
+        self.assertEqual(replay_request(request), status.HTTP_200_OK)
+        with self.assertNumQueries(1):  # Token authentication only
+            response = self.client.get(self.menu_list_url)
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_replay_is_not_throttled_or_counted(self):
+        self.client.get(self.menu_list_url)
+        bump_generation("Menu")
+
+        [request] = metrics.get_popular_requests(1)
+        with mock.patch.object(
+            UserRateThrottle, "allow_request", return_value=False
+        ), mock.patch.object(metrics, "record_request") as record_request:
+            self.assertEqual(replay_request(request), status.HTTP_200_OK)
+        record_request.assert_not_called()
+
+    def test_warming_replays_at_most_the_limit(self):
+        for query in ("", "?min_price=1", "?min_price=2"):
+            self.client.get(f"{self.menu_list_url}{query}")
+        with mock.patch(
+            "utils.warming.replay_request", return_value=status.HTTP_200_OK
+        ) as replay:
+            results = warm_popular_requests(limit=2, workers=2, rate=0)
+        self.assertEqual(replay.call_count, 2)
+        self.assertEqual([outcome for _, outcome in results], [200, 200])
+
+
+class IdListCacheTestCase(AuthenticatedCacheTestCase):
+    def create_menus(self):
+        Menu.objects.bulk_create(
+            Menu(title=f"Dish {index:02}", price=index, inventory=index)
+            for index in range(25)
+        )
+
+    def test_pages_are_sliced_from_one_id_list(self):
+        first = self.client.get(f"{self.menu_list_url}?limit=10")
+        # The created rows were written through to the object cache
+        with self.assertNumQueries(1):  # Token authentication only
+            second = self.client.get(f"{self.menu_list_url}?limit=10&offset=10")
+
+        self.assertEqual(second.json()["count"], 25)
+        self.assertEqual(
+            [
+                item["title"]
+                for item in first.json()["results"] + second.json()["results"]
+            ],
+            [f"Dish {index:02}" for index in range(20)],
+        )
+
+    def test_uncached_objects_are_loaded_in_one_query(self):
+        self.client.get(f"{self.menu_list_url}?limit=10")
+        bump_generations(
+            get_object_version_name("Menu", pk)
+            for pk in Menu.objects.values_list("pk", flat=True)
+        )
+        with self.assertNumQueries(2):  # Token authentication and the page's rows
+            response = self.client.get(f"{self.menu_list_url}?limit=5")
+
+        self.assertEqual(
+            [item["title"] for item in response.json()["results"]],
+            [f"Dish {index:02}" for index in range(5)],
+        )
+
+    def test_write_rebuilds_the_id_list(self):
+        self.client.get(f"{self.menu_list_url}?limit=10")
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(title="Dish 00a", price=1, inventory=1)
+
+        response = self.client.get(f"{self.menu_list_url}?limit=10")
+        self.assertEqual(response.json()["count"], 26)
+        self.assertEqual(response.json()["results"][1]["title"], "Dish 00a")
+
+
+class FragmentCacheTestCase(AuthenticatedCacheTestCase):
+    def create_menus(self):
+        super().create_menus()
+        Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+        Menu.objects.create(title="Churros", price=3.50, inventory=40)
+
+    def count_serialized_rows(self, url):
+        with mock.patch.object(
+            MenuSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=MenuSerializer.to_representation,
+        ) as to_representation:
+            response = self.client.get(url)
+        return response, to_representation.call_count
+
+    def test_only_changed_rows_are_serialized(self):
+        _, serialized = self.count_serialized_rows(self.menu_list_url)
+        self.assertEqual(serialized, 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.title = "Fish Tacos"
+            self.menu.save()
+        response, serialized = self.count_serialized_rows(self.menu_list_url)
+
+        self.assertEqual(serialized, 1)
+        self.assertEqual(
+            [item["title"] for item in response.json()["results"]],
+            ["Burrito", "Churros", "Fish Tacos"],
+        )
+
+    def test_fragments_are_shared_between_lists(self):
+        self.count_serialized_rows(f"{self.menu_list_url}?max_price=6")
+        response, serialized = self.count_serialized_rows(self.menu_list_url)
+
+        self.assertEqual(serialized, 1)
+        self.assertEqual(response.json()["count"], 3)
+
+
+class CacheInspectTestCase(AuthenticatedCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.get(self.menu_list_url)
+        self.client.get(reverse("bookings-list"))
+
+    def inspect(self, *args):
+        out = StringIO()
+        call_command("cache_inspect", *args, stdout=out)
+        return out.getvalue()
+
+    def test_report_groups_keys_by_namespace(self):
+        report = self.inspect("--top", "1")
+
+        self.assertRegex(report, r"\nMenu\s+\d+\s+\d+")
+        self.assertIn("Largest entries in Menu:", report)
+        self.assertIn("generation", report)
+
+    def test_purge_by_view_and_user(self):
+        # The page, its stale copy and the ID list it was sliced from
+        self.assertIn(
+            "Would purge 3 keys",
+            self.inspect("--purge-view", "MenuListView", "--dry-run"),
+        )
+        self.inspect("--purge-view", "MenuListView")
+        self.assertFalse(cache.keys("Menu:MenuListView_*"))
+        self.assertTrue(cache.keys("Booking:BookingListView_*"))
+
+        self.inspect("--purge-user", str(self.test_user.pk))
+        self.assertFalse(cache.keys("Booking:BookingListView_*"))
+
+
+class RequestCacheTestCase(AuthenticatedCacheTestCase):
+    def test_prefetched_reads_and_deferred_writes_are_batched(self):
+        cache.set_many({"batched:a": 1, "batched:b": 2})
+        with request_cache.batch() as batch:
+            request_cache.prefetch(["batched:a", "batched:b", "batched:c"])
+            self.assertEqual(request_cache.get("batched:a"), 1)
+            self.assertEqual(
+                request_cache.get_many(["batched:a", "batched:b", "batched:c"]),
+                {"batched:a": 1, "batched:b": 2},
+            )
+            request_cache.set("batched:c", 3, timeout=60, defer=True)
+            self.assertIsNone(cache.get("batched:c"))
+            self.assertEqual(request_cache.get("batched:c"), 3)
+
+        self.assertEqual(batch.round_trips, 2)
+        self.assertEqual(cache.get("batched:c"), 3)
+
+    @modify_settings(MIDDLEWARE={"prepend": "utils.middleware.RequestCacheMiddleware"})
+    @mock.patch("utils.cache.CACHE_POPULARITY_SAMPLE_RATE", 0)
+    def test_cached_request_reads_redis_in_few_round_trips(self):
+        throttles = mock.patch.object(
+            MenuListView, "throttle_classes", [AnonRateThrottle, UserRateThrottle]
+        )
+        rates = mock.patch.dict(
+            UserRateThrottle.THROTTLE_RATES,
+            {"anon": "100/minute", "user": "100/minute"},
+        )
+        labels = {"view": "menu-list"}
+        with throttles, rates:
+            self.client.get(self.menu_list_url)
+            before = REGISTRY.get_sample_value("cache_request_round_trips_sum", labels)
+            self.client.get(self.menu_list_url)
+
+        # The throttle history with the generations, then the history write; access control reads no Redis at all
+        self.assertEqual(
+            REGISTRY.get_sample_value("cache_request_round_trips_sum", labels) - before,
+            2,
+        )
+        self.assertEqual(len(cache.get(f"throttle_user_{self.test_user.pk}")), 2)
+
+    @mock.patch.dict(UserRateThrottle.THROTTLE_RATES, {"anon": "100/minute"})
+    def test_throttle_history_is_written_before_other_views_run(self):
+        throttle = AnonRateThrottle()
+        request = Request(APIRequestFactory().get("/"))
+        with request_cache.batch():
+            self.assertTrue(throttle.allow_request(request, APIView()))
+            self.assertEqual(len(cache.get(throttle.key)), 1)
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def test_opens_after_consecutive_failures_and_probes_after_reset(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            with self.assertRaises(ValueError), breaker.guard(errors=(ValueError,)):
+                raise ValueError()
+
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError), breaker.guard():
+            pass
+
+        breaker.opened_at -= 60
+        self.assertEqual(breaker.state, "half-open")
+        with breaker.guard():
+            pass
+        self.assertEqual(breaker.state, "closed")
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, latency_threshold=0.001)
+        with breaker.guard():
+            time.sleep(0.01)
+        self.assertEqual(breaker.state, "open")
+
+
+class SlowCache:
+    """Wraps the cache, delaying every call to inject Redis latency."""
+
+    def __init__(self, shared, latency: float) -> None:
+        self.shared = shared
+        self.latency = latency
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.shared, name)
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            time.sleep(self.latency)
+            return attribute(*args, **kwargs)
+
+        return call
+
+
+class DegradedModeTestCase(AuthenticatedCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(redis_breaker.reset)
+        self.addCleanup(database_breaker.reset)
+
+    def fail_menu_queries(self):
+        """Make every query on the menu table fail, as the database driver would."""
+        execute = CursorWrapper._execute
+
+        def fail(cursor, sql, params, *args):
+            if "inventory" in sql:
+                raise DatabaseError("Injected database failure")
+            return execute(cursor, sql, params, *args)
+
+        return mock.patch.object(
+            CursorWrapper, "_execute", autospec=True, side_effect=fail
+        )
+
+    def fail_all_queries(self):
+        """Make every query fail, authentication's included, as in a database outage."""
+        return mock.patch.object(
+            CursorWrapper,
+            "_execute",
+            autospec=True,
+            side_effect=DatabaseError("Injected database failure"),
+        )
+
+    def test_slow_redis_is_skipped_and_requests_served_from_database(self):
+        slow_cache = SlowCache(cache, latency=0.02)
+        with mock.patch.object(request_cache, "shared", slow_cache), mock.patch.object(
+            redis_breaker, "latency_threshold", 0.01
+        ):
+            first = self.client.get(self.menu_list_url)
+            self.assertEqual(redis_breaker.state, "open")
+            calls = slow_cache.calls
+            second = self.client.get(self.menu_list_url)
+
+        self.assertEqual(slow_cache.calls, calls)
+        for response in (first, second):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["count"], 1)
+
+    def test_writes_succeed_while_redis_is_down(self):
+        failed = (
+            REGISTRY.get_sample_value(
+                "cache_invalidation_failed_total", {"model": "Menu"}
+            )
+            or 0
+        )
+        redis_breaker.opened_at = time.monotonic()
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+
+        self.assertTrue(Menu.objects.filter(title="Burrito").exists())
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "cache_invalidation_failed_total", {"model": "Menu"}
+            ),
+            failed + 1,
+        )
+        redis_breaker.reset()
+        self.assertEqual(get_cache_ttl(["Menu"]), CACHE_TTL_MIN)
+
+    def test_stale_copy_served_while_database_fails(self):
+        self.client.get(self.menu_list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(title="Burrito", price=8.99, inventory=12)
+
+        with self.fail_menu_queries():
+            responses = [self.client.get(self.menu_list_url) for _ in range(6)]
+
+        self.assertEqual(database_breaker.state, "open")
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response[STALE_RESPONSE_HEADER], "true")
+            titles = [item["title"] for item in response.json()["results"]]
+            self.assertEqual(titles, ["Tacos"])
+
+    def test_public_view_served_stale_when_authentication_fails(self):
+        self.client.get(self.menu_list_url)
+        with mock.patch.object(
+            MenuListView, "permission_classes", [AllowAny]
+        ), self.fail_all_queries():
+            response = self.client.get(self.menu_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response[STALE_RESPONSE_HEADER], "true")
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_authenticated_view_fails_when_authentication_fails(self):
+        self.client.get(self.menu_list_url)
+        with self.fail_all_queries(), self.assertRaises(DatabaseError):
+            self.client.get(self.menu_list_url)
+
+    def test_unavailable_without_stale_copy_when_database_breaker_is_open(self):
+        database_breaker.opened_at = time.monotonic()
+        response = self.client.get(self.menu_list_url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class BulkInvalidationTestCase(AuthenticatedCacheTestCase):
+    def get_count(self, query=""):
+        return self.client.get(f"{self.menu_list_url}{query}").json()["count"]
+
+    def test_update_invalidates_lists_the_rows_enter(self):
+        self.assertEqual(self.get_count("?min_price=50"), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.filter(pk=self.menu.pk).update(price=Decimal("60.00"))
+        self.assertEqual(self.get_count("?min_price=50"), 1)
+
+    def test_update_keeps_lists_the_rows_never_match(self):
+        response = self.client.get(f"{self.menu_list_url}?min_price=50")
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.filter(pk=self.menu.pk).update(price=Decimal("6.50"))
+        not_modified = self.client.get(
+            f"{self.menu_list_url}?min_price=50", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update_reads_only_the_fields_lists_filter_on(self):
+        self.get_count("?min_price=50")
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                Menu.objects.filter(pk=self.menu.pk).update(inventory=5)
+        pre_read = queries.captured_queries[0]["sql"]
+        self.assertIn('"price"', pre_read)
+        self.assertNotIn('"title"', pre_read)
+
+    @mock.patch("utils.cache.CACHE_WRITE_THROUGH_MAX_ROWS", 0)
+    def test_large_update_skips_write_through(self):
+        Menu.objects.cached_get(self.menu.pk)
+        with mock.patch.object(Menu.objects, "write_through") as write_through:
+            with self.captureOnCommitCallbacks(execute=True):
+                Menu.objects.filter(pk=self.menu.pk).update(inventory=3)
+        write_through.assert_not_called()
+        with self.assertNumQueries(1):
+            self.assertEqual(Menu.objects.cached_get(self.menu.pk).inventory, 3)
+
+    @mock.patch("utils.managers.CACHE_UPDATE_MAX_ROWS", 0)
+    def test_large_update_invalidates_every_instance_and_list(self):
+        Menu.objects.cached_get(self.menu.pk)
+        self.assertEqual(self.get_count("?min_price=50"), 0)
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                Menu.objects.filter(pk=self.menu.pk).update(price=Decimal("60.00"))
+
+        self.assertIn("LIMIT 1", queries.captured_queries[0]["sql"])
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                Menu.objects.cached_get(self.menu.pk).price, Decimal("60.00")
+            )
+        self.assertEqual(self.get_count("?min_price=50"), 1)
+
+    def test_expression_update_invalidates_every_list(self):
+        self.assertEqual(self.get_count("?min_price=50"), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.filter(pk=self.menu.pk).update(price=F("price") + 100)
+        self.assertEqual(self.get_count("?min_price=50"), 1)
+
+    def test_bulk_create_invalidates_lists(self):
+        self.assertEqual(self.get_count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.bulk_create(
+                [
+                    Menu(title="Burrito", price=8.99, inventory=12),
+                    Menu(title="Nachos", price=6.99, inventory=8),
+                ]
+            )
+        self.assertEqual(self.get_count(), 3)
+
+    def test_bulk_update_writes_through(self):
+        Menu.objects.cached_get(self.menu.pk)
+        self.menu.inventory = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.bulk_update([self.menu], ["inventory"])
+        with self.assertNumQueries(0):
+            self.assertEqual(Menu.objects.cached_get(self.menu.pk).inventory, 3)
+
+
+class CacheInvalidationBatchTestCase(TransactionTestCase):
+    def test_autocommitted_writes_are_invalidated_once(self):
+        with mock.patch("utils.cache.bump_generations", wraps=bump_generations) as bump:
+            with cache_invalidation_batch():
+                menu = Menu.objects.create(title="Tacos", price=5.99, inventory=30)
+                menu.inventory = 10
+                menu.save()
+                Menu.objects.filter(pk=menu.pk).update(inventory=5)
+                self.assertEqual(bump.call_count, 0)
+            self.assertEqual(bump.call_count, 1)
@@ -1,7 +1,8 @@
 """
 ASGI config for config project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``. Django is wrapped by BytePatrol so
+requests denied access to protected paths are rejected before any middleware runs.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -14,3 +15,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from applications.byte_patrol.gateway import EarlyRejectASGIApp  # noqa: E402
+
+application = EarlyRejectASGIApp(application)
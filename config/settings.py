@@ -168,8 +168,8 @@ class Base(Configuration):
         "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
         "PAGE_SIZE": 10,
         "DEFAULT_THROTTLE_CLASSES": [
-            "rest_framework.throttling.AnonRateThrottle",
-            "rest_framework.throttling.UserRateThrottle",
+            "utils.throttling.AnonRateThrottle",
+            "utils.throttling.UserRateThrottle",
         ],
         "DEFAULT_THROTTLE_RATES": {"anon": "20/minute", "user": "30/minute"},
         "DEFAULT_AUTHENTICATION_CLASSES": [
@@ -314,7 +314,7 @@ class Grading(Base):
 
     MIDDLEWARE = [
         "django_prometheus.middleware.PrometheusBeforeMiddleware",
-        "django.middleware.cache.UpdateCacheMiddleware",
+        "utils.middleware.RequestCacheMiddleware",
         "django.middleware.security.SecurityMiddleware",
         "django.contrib.sessions.middleware.SessionMiddleware",
         "django.middleware.common.CommonMiddleware",
@@ -322,7 +322,6 @@ class Grading(Base):
         "django.contrib.auth.middleware.AuthenticationMiddleware",
         "django.contrib.messages.middleware.MessageMiddleware",
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
-        "django.middleware.cache.FetchFromCacheMiddleware",
         "django_prometheus.middleware.PrometheusAfterMiddleware",
         "applications.byte_patrol.middleware.IPRestrictionMiddleware",
     ]
@@ -369,7 +368,7 @@ class Development(Base):
 
     MIDDLEWARE = [
         "django_prometheus.middleware.PrometheusBeforeMiddleware",
-        "django.middleware.cache.UpdateCacheMiddleware",
+        "utils.middleware.RequestCacheMiddleware",
         "django.middleware.security.SecurityMiddleware",
         "django.contrib.sessions.middleware.SessionMiddleware",
         "corsheaders.middleware.CorsMiddleware",
@@ -379,7 +378,6 @@ class Development(Base):
         "django.contrib.auth.middleware.AuthenticationMiddleware",
         "django.contrib.messages.middleware.MessageMiddleware",
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
-        "django.middleware.cache.FetchFromCacheMiddleware",
         "django_prometheus.middleware.PrometheusAfterMiddleware",
         "applications.byte_patrol.middleware.IPRestrictionMiddleware",
     ]
@@ -1,7 +1,8 @@
 """
 WSGI config for config project.
 
-It exposes the WSGI callable as a module-level variable named ``application``.
+It exposes the WSGI callable as a module-level variable named ``application``. Django is wrapped by BytePatrol so
+requests denied access to protected paths are rejected before any middleware runs.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
@@ -15,3 +16,7 @@ os.environ.setdefault("DJANGO_CONFIGURATION", "Grading")
 from configurations.wsgi import get_wsgi_application
 
 application = get_wsgi_application()
+
+from applications.byte_patrol.gateway import EarlyRejectWSGIApp  # noqa: E402
+
+application = EarlyRejectWSGIApp(application)
@@ -1,22 +1,135 @@
 import hashlib
+import json
+import math
 import os
-from typing import Union
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Union
+from urllib.parse import urlencode
 
+from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, router, transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.http.response import JsonResponse
+from django.http import Http404
+from django.http.response import HttpResponse, JsonResponse
 from django.template.response import TemplateResponse
+from django.utils.cache import get_conditional_response, quote_etag
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from django.views.decorators.cache import cache_page, never_cache
 from django.views.generic import TemplateView
+from django_redis import get_redis_connection
 from loguru import logger
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 from rest_framework import status
-from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import APIException
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
+from utils.circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker, CircuitOpenError
+from utils.codecs import COMPRESSORS, CacheCodec, CodecError, best_available
+from utils.local_cache import LocalCache
+from utils.predicates import (
+    LoadedValuesMixin,
+    get_field_values,
+    get_filter_predicates,
+    get_predicate_signature,
+    row_matches,
+)
+from utils.request_cache import CacheUnavailable, redis_breaker, request_cache
+
 VIEW_CACHE_TTL = int(os.environ["VIEW_CACHE_TTL"])
+GENERATION_KEY_PREFIX = "generation"
+DEFAULT_SCHEMA_VERSION = 1
+# In-process (L1) tier: entries held per worker, and how long a worker may trust its copy of a model's generation
+CACHE_L1_MAX_ENTRIES = int(os.environ.get("CACHE_L1_MAX_ENTRIES", 1024))
+CACHE_L1_MAX_STALENESS = int(os.environ.get("CACHE_L1_MAX_STALENESS_MS", 1000)) / 1000
+# Stampede protection: lease of the single-flight regeneration lock, how long other requests wait for the rebuild,
+# how long the last good copy of a response is kept to be served while it is rebuilt, and the XFetch early refresh beta
+CACHE_LOCK_LEASE = int(os.environ.get("CACHE_LOCK_LEASE_MS", 3000)) / 1000
+CACHE_LOCK_WAIT = int(os.environ.get("CACHE_LOCK_WAIT_MS", 500)) / 1000
+CACHE_STALE_TTL = int(os.environ.get("CACHE_STALE_TTL", VIEW_CACHE_TTL * 10))
+CACHE_EARLY_REFRESH_BETA = float(os.environ.get("CACHE_EARLY_REFRESH_BETA", 1.0))
+STALE_RESPONSE_HEADER = "X-Cache-Stale"
+# Who a cached response is shared between: every caller, each user, or users holding the same permissions
+CACHE_SCOPE_PUBLIC = "public"
+CACHE_SCOPE_USER = "user"
+CACHE_SCOPE_PERMISSIONS = "permissions"
+# Adaptive TTLs: entries live CACHE_TTL_WRITE_INTERVALS times the average interval between writes to their models,
+# within [CACHE_TTL_MIN, CACHE_TTL_MAX]. The average weighs each new interval by CACHE_TTL_SMOOTHING, and workers
+# re-read it at most every CACHE_TTL_REFRESH seconds
+WRITE_INTERVALS_KEY = "write_intervals"
+CACHE_TTL_MIN = int(os.environ.get("CACHE_TTL_MIN", max(1, VIEW_CACHE_TTL // 10)))
+CACHE_TTL_MAX = int(os.environ.get("CACHE_TTL_MAX", VIEW_CACHE_TTL * 12))
+CACHE_TTL_WRITE_INTERVALS = float(os.environ.get("CACHE_TTL_WRITE_INTERVALS", 2))
+CACHE_TTL_SMOOTHING = float(os.environ.get("CACHE_TTL_SMOOTHING", 0.2))
+CACHE_TTL_REFRESH = int(os.environ.get("CACHE_TTL_REFRESH", 60))
+# Filter predicates of the cached lists of each model, kept long enough to outlive every entry built under them
+PREDICATE_REGISTRY_PREFIX = "predicates"
+PREDICATE_REGISTRY_TTL = CACHE_TTL_MAX * 2
+# Generation counters expire once idle for longer than any adaptive entry lives, so the counters of one-off filter
+# signatures do not accumulate; a counter re-seeded after expiring restarts above every value it held
+GENERATION_TTL = CACHE_TTL_MAX * 2
+# Popularity tracking for cache warming: the share of requests recorded, how many distinct requests are tracked, and
+# how many of a model's most popular requests are rebuilt after an invalidation (0 disables it) at most how often
+POPULARITY_KEY = "popularity"
+CACHE_POPULARITY_SAMPLE_RATE = float(
+    os.environ.get("CACHE_POPULARITY_SAMPLE_RATE", 0.1)
+)
+CACHE_POPULARITY_MAX_ENTRIES = int(
+    os.environ.get("CACHE_POPULARITY_MAX_ENTRIES", 10_000)
+)
+CACHE_WARM_ON_INVALIDATE = int(os.environ.get("CACHE_WARM_ON_INVALIDATE", 0))
+CACHE_WARM_DEBOUNCE = int(os.environ.get("CACHE_WARM_DEBOUNCE_MS", 5000)) / 1000
+# Cached responses are stored in Redis as plain bytes: the serializer and compressor used (the fastest installed by
+# default), and the size from which values are compressed
+CACHE_CODEC_SERIALIZER = os.environ.get("CACHE_CODEC_SERIALIZER")
+CACHE_CODEC_COMPRESSOR = os.environ.get(
+    "CACHE_CODEC_COMPRESSOR", best_available(("lz4", "zstd", "zlib"), COMPRESSORS)
+)
+CACHE_CODEC_COMPRESS_MIN_BYTES = int(
+    os.environ.get("CACHE_CODEC_COMPRESS_MIN_BYTES", 1024)
+)
+# Paginator attributes naming the query parameters that select a page rather than rows
+PAGINATION_QUERY_PARAMS = (
+    "limit_query_param",
+    "offset_query_param",
+    "page_query_param",
+    "page_size_query_param",
+    "cursor_query_param",
+)
+# Longest ordered primary-key list cached per filter signature; longer results are paginated straight from the database
+CACHE_ID_LIST_MAX_LENGTH = int(os.environ.get("CACHE_ID_LIST_MAX_LENGTH", 10_000))
+# Most saved instances written through to the object cache per invalidation; larger bulk writes only bump generations
+# Most rows `CachedQuerySet.update()` reads before writing them; larger updates invalidate every instance and list of
+# the model instead
+CACHE_UPDATE_MAX_ROWS = int(os.environ.get("CACHE_UPDATE_MAX_ROWS", 1000))
+CACHE_WRITE_THROUGH_MAX_ROWS = int(os.environ.get("CACHE_WRITE_THROUGH_MAX_ROWS", 100))
+# Database circuit breaker: consecutive failed or slow queries made while rebuilding a cached response that open it,
+# the query latency counted as a failure, and how long it stays open, serving stale copies, before probing again
+DB_BREAKER_FAILURES = int(os.environ.get("DB_BREAKER_FAILURES", 5))
+DB_BREAKER_LATENCY = int(os.environ.get("DB_BREAKER_LATENCY_MS", 2000)) / 1000
+DB_BREAKER_RESET = int(os.environ.get("DB_BREAKER_RESET_MS", 10_000)) / 1000
+
+
+# Counts a request and remembers who last made it, dropping the least popular requests beyond the tracked maximum
+RECORD_REQUEST_SCRIPT = """
+redis.call('ZINCRBY', KEYS[1], 1, ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[3])
+if excess > 0 then
+    local dropped = redis.call('ZRANGE', KEYS[1], 0, excess - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+    redis.call('HDEL', KEYS[2], unpack(dropped))
+end
+"""
 
 
 class Metrics:
@@ -53,6 +166,63 @@ class Metrics:
         self.cached_queryset_evicted = Counter(
             "cached_queryset_evicted", "Number of cached Querysets evicted", ["model"]
         )
+        self.cached_queryset_coalesced = Counter(
+            "cached_queryset_coalesced",
+            "Number of cache misses coalesced onto another request's regeneration",
+            ["model"],
+        )
+        self.cache_invalidation_failed = Counter(
+            "cache_invalidation_failed",
+            "Number of committed writes whose cache invalidation failed because Redis was unavailable",
+            ["model"],
+        )
+        self.cache_tier_hit = Counter(
+            "cache_tier_hit",
+            "Number of cache lookups served by a cache tier",
+            ["model", "tier"],
+        )
+        self.cache_tier_miss = Counter(
+            "cache_tier_miss",
+            "Number of cache lookups not served by a cache tier",
+            ["model", "tier"],
+        )
+        self.cache_operation_seconds = Histogram(
+            "cache_operation_seconds",
+            "Latency of Redis cache reads and writes; the count of reads by result gives each view's hit ratio",
+            ["view", "model", "operation", "result"],
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+        )
+        self.cache_value_bytes = Histogram(
+            "cache_value_bytes",
+            "Size of the values written to Redis",
+            ["view", "model"],
+            buckets=tuple(256 * 4**exponent for exponent in range(9)),
+        )
+        self.cache_generation_lifetime_seconds = Histogram(
+            "cache_generation_lifetime_seconds",
+            "How long a generation, and so every entry cached under it, lived before being invalidated",
+            ["model", "scope"],
+            buckets=(1, 5, 15, 60, 300, 900, 3600, 4 * 3600, 24 * 3600, 7 * 24 * 3600),
+        )
+        self.cache_keys = Gauge(
+            "cache_keys", "Number of keys held by a cache tier", ["tier"]
+        )
+        self.cache_request_round_trips = Histogram(
+            "cache_request_round_trips",
+            "Number of round-trips to Redis made while serving a request",
+            ["view"],
+            buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30),
+        )
+        self.ip_restriction_verdict_cache = Counter(
+            "ip_restriction_verdict_cache",
+            "Number of access control verdicts served by, or missing from, the per-worker verdict cache",
+            ["result"],
+        )
+        self.circuit_breaker_state = Gauge(
+            "circuit_breaker_state",
+            "State of a circuit breaker: 0 closed, 1 half-open, 2 open",
+            ["breaker"],
+        )
         self.initialized = True
 
     def increment_cache(self, model: str, cache_event_type: str) -> None:
@@ -64,7 +234,8 @@ class Metrics:
         Args:
             model(str): String representation of the name the database model being cached.
 
-            cache_event_type(str: The type of cache interaction ('hit', 'miss', or 'eviction').
+            cache_event_type(str: The type of cache interaction ('hit', 'miss', 'eviction', 'coalesced' or
+                'invalidation_failed').
 
         Returns:
             None
@@ -75,194 +246,2392 @@ class Metrics:
             self.cached_queryset_miss.labels(model=model).inc()
         elif cache_event_type == "eviction":
             self.cached_queryset_evicted.labels(model=model).inc()
+        elif cache_event_type == "coalesced":
+            self.cached_queryset_coalesced.labels(model=model).inc()
+        elif cache_event_type == "invalidation_failed":
+            self.cache_invalidation_failed.labels(model=model).inc()
 
+    def increment_cache_tier(
+        self, model: str, tier: str, cache_event_type: str, count: int = 1
+    ) -> None:
+        """Tracks hit and miss rates of an individual cache tier.
 
-# Create a singleton instance for global use
-metrics = Metrics()
+        Args:
+            model(str): String representation of the name the database model being cached.
 
+            tier(str): The cache tier consulted ('l1' for the in-process cache, 'l2' for Redis).
 
-class CachedTemplateView(TemplateView):
-    """A TemplateView that caches its rendered output.
+            cache_event_type(str): The type of cache interaction ('hit' or 'miss').
 
-    This class method wraps the standard Django TemplateView with caching, improving performance for repeated requests.
-    """
+            count(int): Number of lookups with this outcome.
 
-    @classmethod
-    def as_view(cls, **initkwargs):  # @NoSelf
-        return cache_page(VIEW_CACHE_TTL)(
-            super(CachedTemplateView, cls).as_view(**initkwargs)
-        )
+        Returns:
+            None
+        """
+        if cache_event_type == "hit":
+            self.cache_tier_hit.labels(model=model, tier=tier).inc(count)
+        elif cache_event_type == "miss":
+            self.cache_tier_miss.labels(model=model, tier=tier).inc(count)
 
+    def observe_cache_operation(
+        self,
+        view: str,
+        model: str,
+        operation: str,
+        result: str,
+        seconds: float,
+        size: Optional[int] = None,
+    ) -> None:
+        """Tracks the latency of a Redis cache operation and the size of the value it moved.
 
-class NeverCacheMixin(object):
-    @method_decorator(never_cache)
-    def dispatch(self, *args, **kwargs):
-        return super(NeverCacheMixin, self).dispatch(*args, **kwargs)
+        Args:
+            view(str): Name of the view, or other caller, the entry belongs to.
 
+            model(str): String representation of the name the database model being cached.
 
-class CachedResponseMixin:
-    """Mixin class to provide caching functionality for API responses.
+            operation(str): The operation performed ('get', 'set', 'get_many' or 'set_many').
 
-    This mixin allows views to cache their responses based on user identity and query parameters,
-    improving performance by reducing the need for repeated database queries.
-    """
+            result(str): The outcome of the operation ('hit', 'miss' or 'stored').
 
-    def get_cache_key(self) -> str:
-        """Generate a unique cache key based on the request and model information.
+            seconds(float): How long the operation took.
 
-        This method constructs a cache key that incorporates the user ID, query parameters,
-        and model names associated with the view.
+            size(int): Size in bytes of the value written, if known.
 
         Returns:
-            str: A unique cache key for the current request.
-
-        Raises:
-            AttributeError: If the view does not have a 'primary_model' attribute.
+            None
         """
-        if api_request_key := self.request.META.get("HTTP_AUTHORIZATION"):
-            api_key = api_request_key.split(" ")[1]
-            user_id = Token.objects.get(key=api_key).user.id
-        else:
-            user_id = "anonymous"
-        query_params = self.request.META["PATH_INFO"]
-        query_params_hash = hashlib.md5(
-            query_params.encode("utf-8"), usedforsecurity=False
-        ).hexdigest()
+        self.cache_operation_seconds.labels(
+            view=view, model=model, operation=operation, result=result
+        ).observe(seconds)
+        if size is not None:
+            self.cache_value_bytes.labels(view=view, model=model).observe(size)
 
-        # Get the mo
-        # del name(s) associated with the view
-        model_names = []
+    def observe_generation_lifetime(self, name: str, seconds: float) -> None:
+        """Tracks how long a generation lived before it was advanced.
 
-        # Add the primary model name
-        primary_model = getattr(self, "primary_model", None)
-        if primary_model:
-            model_names.append(primary_model.__name__)
+        Args:
+            name(str): The versioned name: a model, an instance ('Model:pk') or a list ('Model:lists', 'Model:list:sig').
+
+            seconds(float): Time between the previous change of the name and this one.
+
+        Returns:
+            None
+        """
+        model, _, rest = name.partition(":")
+        if not rest:
+            scope = "model"
+        elif rest == "lists" or rest.startswith("list:"):
+            scope = "list"
         else:
-            raise AttributeError("View must have a 'primary_model' attribute.")
+            scope = "object"
+        self.cache_generation_lifetime_seconds.labels(model=model, scope=scope).observe(
+            seconds
+        )
 
-        # Add the cache_models names
-        cache_models = getattr(self, "cache_models", [])
-        model_names.extend(model.__name__ for model in cache_models)
-        # Combine the model names into a string
-        model_names_str = "_".join(model_names)
+    def watch_key_count(self, tier: str, count: Callable[[], float]) -> None:
+        """Reports the number of keys held by a cache tier, computed whenever metrics are scraped.
 
-        return f"{primary_model.__name__}:{self.__class__.__name__}_{model_names_str}_{user_id}_{query_params_hash}_cache_key"
+        Args:
+            tier(str): The cache tier ('l1' for the in-process cache, 'l2' for Redis).
 
-    def get_cached_response(self, cache_key) -> Union[Response | None]:
-        """Retrieve cached data using the provided cache key.
+            count(Callable[[], float]): Returns the tier's current key count.
+
+        Returns:
+            None
+        """
+        self.cache_keys.labels(tier=tier).set_function(count)
 
-        This method checks if there is cached data for the given cache key and returns it if available.
+    def increment_verdict_cache(self, cache_event_type: str) -> None:
+        """Tracks the hit rate of the access control verdict cache.
 
         Args:
-            cache_key (str): The cache key to look up.
+            cache_event_type(str): The type of cache interaction ('hit' or 'miss').
 
         Returns:
-            Response or None: The cached response if found, otherwise None.
+            None
         """
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            logger.debug(
-                f"Cache Hit for {self.primary_model.__name__} - Cache Key: {cache_key}"
-            )
-            metrics.increment_cache(
-                model=self.primary_model.__name__, cache_event_type="hit"
-            )
-            return Response(cached_data, status=status.HTTP_200_OK)
-        else:
-            logger.debug(
-                f"Cache Miss for {self.primary_model.__name__}  - Cache Key: {cache_key}"
-            )
-            metrics.increment_cache(
-                model=self.primary_model.__name__, cache_event_type="miss"
-            )
-            return None
-
-    def cache_response(self, cache_key, data):
-        """Store data in the cache with the specified cache key.
+        self.ip_restriction_verdict_cache.labels(result=cache_event_type).inc()
 
-        This method saves the provided data in the cache for a duration of one hour.
+    def watch_circuit_breaker(self, breaker: CircuitBreaker) -> None:
+        """Reports the state of a circuit breaker, read whenever metrics are scraped.
 
         Args:
-            cache_key (str): The cache key under which to store the data.
-            data: The data to be cached.
-        """
-        if type(data) in [JsonResponse, TemplateResponse]:
-            data = data.render()
-        logger.debug(f"New Cache Set {cache_key}: {data}")
-        cache.set(cache_key, data, timeout=VIEW_CACHE_TTL)
+            breaker(CircuitBreaker): The breaker to report.
 
-    def list(self, request, *args, **kwargs) -> Response:
-        """Handle GET requests for listing resources with caching.
+        Returns:
+            None
+        """
+        states = {CLOSED: 0, HALF_OPEN: 1}
+        self.circuit_breaker_state.labels(breaker=breaker.name).set_function(
+            lambda: states.get(breaker.state, 2)
+        )
 
-        This method attempts to return a cached response if available;
-        otherwise, it retrieves the data, caches it, and returns the response.
+    def observe_request_round_trips(self, view: str, round_trips: int) -> None:
+        """Tracks how many round-trips to Redis a request made.
 
         Args:
-            request: The HTTP request object.
-            *args: Additional positional arguments.
-            **kwargs: Additional keyword arguments.
+            view(str): Name of the URL pattern that served the request.
+
+            round_trips(int): Number of round-trips made through the request cache.
 
         Returns:
-            Response: The cached or newly generated response.
+            None
         """
-        cache_key = self.get_cache_key()
-        if cached_response := self.get_cached_response(cache_key):
-            return cached_response
+        self.cache_request_round_trips.labels(view=view).observe(round_trips)
 
-        # If cache miss, proceed as usual
-        queryset = self.filter_queryset(self.get_queryset())
+    def record_request(self, request: Mapping[str, str], user_pk=None) -> None:
+        """Counts a sample of cacheable requests so the most popular ones can be replayed to warm the cache.
 
-        # Apply pagination if needed
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = serializer.data
-            self.cache_response(cache_key, data)
-            return self.get_paginated_response(data)
+        Requests are stored in a Redis sorted set scored by how often they were sampled, alongside the primary key
+        of the user who last made each one so it can be replayed with the same permissions.
 
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        self.cache_response(cache_key, data)
-        return Response(data)
+        Args:
+            request(Mapping[str, str]): The model, host, canonical path, media type and cache identity of the request.
 
-    def retrieve(self, request, *args, **kwargs) -> Response:
-        """Handle GET requests for retrieving a single resource with caching.
+            user_pk: Primary key of the authenticated user, or None for anonymous requests.
 
-        This method checks for a cached response and returns it if available;
-        otherwise, it retrieves the resource, caches it, and returns the response.
+        Returns:
+            None
+        """
+        if random.random() >= CACHE_POPULARITY_SAMPLE_RATE:
+            return
+        keys = [
+            cache.make_key(POPULARITY_KEY),
+            cache.make_key(f"{POPULARITY_KEY}:users"),
+        ]
+        request_cache.get_connection().eval(
+            RECORD_REQUEST_SCRIPT,
+            len(keys),
+            *keys,
+            json.dumps(dict(request), sort_keys=True),
+            "" if user_pk is None else str(user_pk),
+            CACHE_POPULARITY_MAX_ENTRIES,
+        )
+
+    def get_popular_requests(self, limit: int, model: str = None) -> List[dict]:
+        """Returns the most frequently recorded requests, most popular first.
+
+        Only the top `limit` requests are read from Redis; when filtering by model, further windows of `limit` are
+        read until enough requests for the model are found or the set is exhausted.
 
         Args:
-            request: The HTTP request object.
-            *args: Additional positional arguments.
-            **kwargs: Additional keyword arguments.
+            limit(int): The maximum number of requests returned.
+
+            model(str): Only return requests for this model, if given.
 
         Returns:
-            Response: The cached or newly generated response.
+            List[dict]: The recorded requests, each with its sampled `hits` and the `user` to replay it as.
         """
-        cache_key = self.get_cache_key()
-        if cached_response := self.get_cached_response(cache_key):
-            return cached_response
+        connection = request_cache.get_connection()
+        key = cache.make_key(POPULARITY_KEY)
+        selected, popular = [], []
+        start = 0
+        while len(popular) < limit:
+            window = connection.zrevrange(
+                key, start, start + limit - 1, withscores=True
+            )
+            for member, hits in window:
+                request = json.loads(member)
+                if model is None or request["model"] == model:
+                    request["hits"] = int(hits)
+                    selected.append(member)
+                    popular.append(request)
+                    if len(popular) >= limit:
+                        break
+            if len(window) < limit:
+                break
+            start += limit
+        if not selected:
+            return []
+        user_pks = connection.hmget(cache.make_key(f"{POPULARITY_KEY}:users"), selected)
+        for request, user_pk in zip(popular, user_pks):
+            request["user"] = user_pk.decode() if user_pk else None
+        return popular
+
 
-        # If cache miss, proceed as usual
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        data = serializer.data
-        self.cache_response(cache_key, data)
-        return Response(data)
+# Create a singleton instance for global use
+metrics = Metrics()
 
+# Per-worker copies of model generations, trusted for at most CACHE_L1_MAX_STALENESS seconds
+local_generations = LocalCache(
+    max_entries=CACHE_L1_MAX_ENTRIES, default_timeout=CACHE_L1_MAX_STALENESS
+)
+# Per-worker copies of the average interval between writes to each model, trusted for CACHE_TTL_REFRESH seconds
+local_write_intervals = LocalCache(
+    max_entries=CACHE_L1_MAX_ENTRIES, default_timeout=CACHE_TTL_REFRESH
+)
+# Models whose invalidation this worker could not apply, cached for CACHE_TTL_MIN until entries built before the
+# failure have expired
+local_failed_invalidations = LocalCache(
+    max_entries=CACHE_L1_MAX_ENTRIES, default_timeout=CACHE_TTL_MAX
+)
 
-@receiver([post_save, post_delete])
-def invalidate_cache(sender, **kwargs):
+
+def get_generation_key(model_name: str) -> str:
+    """Build the cache key holding the generation counter of a model namespace.
+
+    The counter lives outside the `<model>:*` namespace so that it is never swept up with the entries it versions.
+
+    Args:
+        model_name (str): Name of the model whose namespace is versioned.
+
+    Returns:
+        str: The cache key of the generation counter.
+    """
+    return f"{GENERATION_KEY_PREFIX}:{model_name}"
+
+
+def _seed_generation(generation_key: str) -> None:
+    """Initialise a missing generation counter.
+
+    The seed is the current time in microseconds so that a counter lost to a Redis flush, eviction or expiry
+    restarts above every value it previously held, and entries written under old generations can never be served
+    again. Counters expire after `GENERATION_TTL` without a write.
+
+    Args:
+        generation_key (str): The cache key of the generation counter.
+    """
+    request_cache.add(generation_key, time.time_ns() // 1000, timeout=GENERATION_TTL)
+
+
+def get_generations(model_names: Iterable[str]) -> Dict[str, int]:
+    """Fetch the current generation of each model namespace.
+
+    Generations are read from the worker's local copy while it is younger than `CACHE_L1_MAX_STALENESS`; the rest
+    are fetched from Redis in a single round-trip. This bounds how long a worker can serve entries another worker
+    has already invalidated. An instance's generation is never lower than its model's objects epoch, see
+    `get_objects_version_name`.
+
+    Args:
+        model_names (Iterable[str]): Names of the models whose generations are needed.
+
+    Returns:
+        Dict[str, int]: Mapping of model name to its current generation.
+    """
+    model_names = list(model_names)
+    epochs = {name: epoch for name in model_names if (epoch := get_epoch_name(name))}
+    generations = _get_raw_generations([*model_names, *epochs.values()])
+    for name, epoch in epochs.items():
+        generations[name] = max(generations[name], generations[epoch])
+    return {name: generations[name] for name in model_names}
+
+
+def _get_raw_generations(model_names: Iterable[str]) -> Dict[str, int]:
+    """Fetch the generation counter of each name as stored, from the local copy where possible."""
+    generations = {}
+    generation_keys = {}
+    for model_name in dict.fromkeys(model_names):
+        generation = local_generations.get(model_name)
+        if generation is not None:
+            generations[model_name] = generation
+        else:
+            generation_keys[get_generation_key(model_name)] = model_name
+    if not generation_keys:
+        return generations
+
+    found = request_cache.get_many(generation_keys)
+    for generation_key in generation_keys.keys() - found.keys():
+        _seed_generation(generation_key)
+        found[generation_key] = request_cache.get(generation_key)
+    for generation_key, model_name in generation_keys.items():
+        generations[model_name] = found[generation_key]
+        local_generations.set(model_name, found[generation_key])
+    return generations
+
+
+# Advances each generation to max(generation + 1, now in microseconds), so generations are strictly increasing and
+# double as the time of the last change, and refreshes each counter's TTL. The first half of KEYS are the counters;
+# the second half holds, for each, the epoch it must also advance past, or the counter itself if it has none. A missing
+# epoch is seeded first, so it never later rises above the instances just bumped. Returns each new generation followed
+# by the one it replaced
+BUMP_GENERATIONS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local count = #KEYS / 2
+local generations = {}
+for index = 1, count do
+    local key = KEYS[index]
+    local previous = tonumber(redis.call('GET', key) or '0')
+    local generation = redis.call('INCR', key)
+    if generation < now then
+        redis.call('SET', key, ARGV[1])
+        generation = now
+    end
+    local epoch = KEYS[count + index]
+    if epoch ~= key then
+        local floor = redis.call('GET', epoch)
+        if not floor then
+            floor = ARGV[1]
+            redis.call('SET', epoch, floor)
+        end
+        if tonumber(floor) >= generation then
+            redis.call('SET', key, floor)
+            generation = redis.call('INCR', key)
+        end
+        redis.call('EXPIRE', epoch, ttl)
+    end
+    redis.call('EXPIRE', key, ttl)
+    generations[2 * index - 1] = generation
+    generations[2 * index] = previous
+end
+return generations
+"""
+
+
+def get_object_version_name(model_name: str, pk) -> str:
+    """Build the versioned name of a single model instance.
+
+    Args:
+        model_name (str): Name of the instance's model.
+        pk: The instance's primary key.
+
+    Returns:
+        str: The name under which the instance's generation is tracked.
+    """
+    return f"{model_name}:{pk}"
+
+
+def get_objects_version_name(model_name: str) -> str:
+    """Build the versioned name of the objects epoch of a model.
+
+    Every instance's generation is at least the epoch, so advancing it invalidates every instance of the model at
+    once, for writes too large to name the instances they touched.
+
+    Args:
+        model_name (str): Name of the model.
+
+    Returns:
+        str: The name under which the epoch is tracked.
+    """
+    return f"{model_name}:objects"
+
+
+def get_epoch_name(version_name: str) -> Union[str | None]:
+    """Get the objects epoch bounding a versioned name from below.
+
+    Args:
+        version_name (str): A model, instance or list versioned name.
+
+    Returns:
+        str or None: The epoch's versioned name if `version_name` names an instance, otherwise None.
+    """
+    model_name, separator, rest = version_name.partition(":")
+    if not separator or rest in ("lists", "objects") or rest.startswith("list:"):
+        return None
+    return get_objects_version_name(model_name)
+
+
+def get_tombstone_key(version_name: str) -> str:
+    """Build the key marking a deleted instance, so stale copies of its detail responses are never served.
+
+    Args:
+        version_name (str): The instance's versioned name, from `get_object_version_name`.
+
+    Returns:
+        str: The cache key of the instance's tombstone.
+    """
+    return f"tombstone:{version_name}"
+
+
+def get_object_cache_key(model_name: str, pk, generation: int) -> str:
+    """Build the key under which a single model instance is cached.
+
+    Args:
+        model_name (str): Name of the instance's model.
+        pk: The instance's primary key.
+        generation (int): The instance's current generation.
+
+    Returns:
+        str: The cache key of the instance.
+    """
+    return f"{model_name}:object:{pk}:g{generation}"
+
+
+def get_fragment_cache_key(
+    model_name: str, serializer_class, pk, generation: int
+) -> str:
+    """Build the key under which the serialized representation of a single model instance is cached.
+
+    Args:
+        model_name (str): Name of the instance's model.
+        serializer_class: The serializer producing the representation; its `cache_version` is part of the key.
+        pk: The instance's primary key.
+        generation (int): The instance's current generation.
+
+    Returns:
+        str: The cache key of the fragment.
+    """
+    schema_version = getattr(serializer_class, "cache_version", DEFAULT_SCHEMA_VERSION)
+    return f"{model_name}:fragment:{serializer_class.__name__}_v{schema_version}:{pk}:g{generation}"
+
+
+def get_lists_version_name(model_name: str) -> str:
+    """Build the versioned name shared by every predicate-aware cached list of a model.
+
+    Args:
+        model_name (str): Name of the listed model.
+
+    Returns:
+        str: The name under which the generation of all of the model's lists is tracked.
+    """
+    return f"{model_name}:lists"
+
+
+def get_list_version_name(model_name: str, signature: str) -> str:
+    """Build the versioned name of the cached lists selecting rows with one set of filter predicates.
+
+    Args:
+        model_name (str): Name of the listed model.
+        signature (str): The predicate signature from `get_predicate_signature`.
+
+    Returns:
+        str: The name under which the generation of the filtered lists is tracked.
+    """
+    return f"{model_name}:list:{signature}"
+
+
+def get_predicate_registry_key(model_name: str) -> str:
+    """Build the key of the Redis hash mapping a model's predicate signatures to their predicates."""
+    return f"{PREDICATE_REGISTRY_PREFIX}:{model_name}"
+
+
+def register_list_predicates(model_name: str, predicates: List[list]) -> None:
+    """Record the filter predicates of a list about to be cached, so writes can tell whether they affect it.
+
+    Registration must happen before the list is queried: a write landing after the query then always finds the
+    predicates and invalidates the entry being built.
+
+    Args:
+        model_name (str): Name of the listed model.
+        predicates (List[list]): Predicates from `get_filter_predicates`.
+    """
+    registry_key = cache.make_key(get_predicate_registry_key(model_name))
+    registration = json.dumps({"predicates": predicates, "registered_at": time.time()})
+    pipeline = request_cache.get_connection().pipeline(transaction=False)
+    pipeline.hset(registry_key, get_predicate_signature(predicates), registration)
+    pipeline.expire(registry_key, PREDICATE_REGISTRY_TTL)
+    pipeline.execute()
+
+
+def get_registered_predicates(model_name: str) -> Dict[str, List[list]]:
+    """Fetch the predicates of a model's cached lists, pruning registrations older than any entry they version.
+
+    Args:
+        model_name (str): Name of the listed model.
+
+    Returns:
+        Dict[str, List[list]]: Mapping of predicate signature to its predicates.
+    """
+    registry_key = cache.make_key(get_predicate_registry_key(model_name))
+    connection = request_cache.get_connection()
+    registered, expired = {}, []
+    cutoff = time.time() - PREDICATE_REGISTRY_TTL
+    for signature, registration in connection.hgetall(registry_key).items():
+        registration = json.loads(registration)
+        if registration["registered_at"] < cutoff:
+            expired.append(signature)
+        else:
+            registered[signature.decode()] = registration["predicates"]
+    if expired:
+        connection.hdel(registry_key, *expired)
+    return registered
+
+
+def get_predicate_attnames(sender) -> List[str]:
+    """Get the attribute names of the fields filtered on by the predicates of a model's cached lists.
+
+    Args:
+        sender: The listed model class.
+
+    Returns:
+        List[str]: Sorted attribute names of the concrete fields the registered predicates use. Predicates on other
+        fields cannot be evaluated against a row and need no values read.
+    """
+    attnames = set()
+    for predicates in get_registered_predicates(sender.__name__).values():
+        for field_name, *_ in predicates:
+            try:
+                field = sender._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                attnames.add(field.attname)
+    return sorted(attnames)
+
+
+def get_written_rows(sender, instance=None, **kwargs) -> Union[List[dict] | None]:
+    """Capture the values a written row held before and after the write.
+
+    Args:
+        sender: The model class that was written.
+        instance: The saved or deleted instance, if any.
+        **kwargs: The remaining `post_save` or `post_delete` signal arguments.
+
+    Returns:
+        List[dict] or None: The row's previous and new field values, omitting those that do not exist because it was
+        created or deleted, or None if its previous values are unknown.
+    """
+    if not isinstance(instance, LoadedValuesMixin):
+        return None
+    deleted = kwargs.get("signal") is post_delete
+    old_values = None if kwargs.get("created") else instance._loaded_values
+    if old_values is None and not kwargs.get("created"):
+        return None
+    new_values = None
+    if not deleted:
+        new_values = get_field_values(instance)
+        if (update_fields := kwargs.get("update_fields")) is not None:
+            # Only the listed fields were written; the row keeps its previous values for the rest
+            written = {sender._meta.get_field(name).attname for name in update_fields}
+            new_values = {
+                **old_values,
+                **{name: new_values[name] for name in written if name in new_values},
+            }
+        # The next save of this instance is compared against what it just wrote
+        instance._loaded_values = new_values
+    return [values for values in (old_values, new_values) if values is not None]
+
+
+def get_invalidated_list_names(sender, rows: Union[List[dict] | None]) -> List[str]:
+    """Find the versioned names of the cached lists affected by writes to a model.
+
+    A list can only change if a written row satisfies its filter predicates before or after the write, so only
+    those lists are invalidated. When the previous values of a row are unknown every list of the model is.
+
+    Args:
+        sender: The model class that was written.
+        rows (List[dict] or None): Values of the written rows from `get_written_rows`, or None if any are unknown.
+
+    Returns:
+        List[str]: The versioned names whose generations must be advanced.
+    """
     model_name = sender.__name__
-    logger.debug(f"Signal Received For {model_name}")
-    # Pattern to match cache keys that include the model name as namespace
-    cache_key_pattern = f"{model_name}:*"
-    logger.debug(f'Searching For Cache Key Pattern" {cache_key_pattern}')
-    if cache_keys := cache.keys(cache_key_pattern):
-        cache.delete_many(cache_keys)
-        metrics.increment_cache(model=model_name, cache_event_type="eviction")
-        logger.info(f"Cache invalidated for model: {model_name}")
-    else:
-        logger.debug(
-            f"No cache keys found for model: {model_name} using {cache_key_pattern}"
+    if rows is None:
+        return [get_lists_version_name(model_name)]
+    return [
+        get_list_version_name(model_name, signature)
+        for signature, predicates in get_registered_predicates(model_name).items()
+        if any(row_matches(sender, predicates, values) for values in rows)
+    ]
+
+
+def bump_generations(names: Iterable[str]) -> Dict[str, int]:
+    """Atomically advance the generations of several namespaces in one round-trip.
+
+    Every cache key embeds the generation it was written under, so advancing it orphans all existing entries of the
+    namespace in O(1); the orphans are never read again and expire with their TTL. Instances are advanced past their
+    model's objects epoch too, so their bump is never hidden by an epoch set on a server with a faster clock.
+
+    Args:
+        names (Iterable[str]): Names of the models or instances whose namespaces are invalidated.
+
+    Returns:
+        Dict[str, int]: Mapping of name to its new generation.
+    """
+    names = list(names)
+    keys = [cache.make_key(get_generation_key(name)) for name in names]
+    epoch_keys = [
+        (
+            cache.make_key(get_generation_key(epoch))
+            if (epoch := get_epoch_name(name))
+            else key
+        )
+        for name, key in zip(names, keys)
+    ]
+    results = request_cache.get_connection().eval(
+        BUMP_GENERATIONS_SCRIPT,
+        len(keys) * 2,
+        *keys,
+        *epoch_keys,
+        time.time_ns() // 1000,
+        GENERATION_TTL,
+    )
+    bumped = {}
+    for name, generation, previous in zip(names, results[::2], results[1::2]):
+        bumped[name] = int(generation)
+        # The writing worker sees its own invalidation immediately
+        local_generations.set(name, bumped[name])
+        if previous:
+            lifetime = (bumped[name] - int(previous)) / 1_000_000
+            metrics.observe_generation_lifetime(name, lifetime)
+            if ":" not in name:
+                record_write_interval(name, lifetime)
+    return bumped
+
+
+# Folds a new interval into the exponentially weighted average interval between writes to a model
+RECORD_WRITE_INTERVAL_SCRIPT = """
+local interval = tonumber(ARGV[2])
+local average = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+if average then
+    interval = average + tonumber(ARGV[3]) * (interval - average)
+end
+redis.call('HSET', KEYS[1], ARGV[1], tostring(interval))
+return tostring(interval)
+"""
+
+
+def record_write_interval(model_name: str, interval: float) -> float:
+    """Fold the time between two invalidations of a model into its average write interval.
+
+    Args:
+        model_name (str): Name of the model that was written.
+        interval (float): Seconds since the model was previously written.
+
+    Returns:
+        float: The model's new average write interval in seconds.
+    """
+    average = float(
+        request_cache.get_connection().eval(
+            RECORD_WRITE_INTERVAL_SCRIPT,
+            1,
+            cache.make_key(WRITE_INTERVALS_KEY),
+            model_name,
+            interval,
+            CACHE_TTL_SMOOTHING,
         )
+    )
+    local_write_intervals.set(model_name, average)
+    return average
+
+
+def get_cache_ttl(model_names: Iterable[str]) -> int:
+    """Choose how long entries built from a set of models are cached, from how often those models are written.
+
+    An entry dies when any of its models is next written, so keeping it much longer than the write interval only
+    wastes Redis memory, while rarely written models can be cached far longer than `VIEW_CACHE_TTL`. The TTL is
+    `CACHE_TTL_WRITE_INTERVALS` times the shortest write interval of the models, bounded by `CACHE_TTL_MIN` and
+    `CACHE_TTL_MAX`. A model that has been quiet for longer than its average interval is treated as having slowed down,
+    and a model with no recorded interval yet, or whose interval or generation cannot be read from Redis, is cached
+    for `VIEW_CACHE_TTL`. Entries built from a model whose last invalidation failed are cached for `CACHE_TTL_MIN`.
+
+    Args:
+        model_names (Iterable[str]): Names of the models the entry is built from.
+
+    Returns:
+        int: The TTL in seconds.
+    """
+    model_names = list(model_names)
+    if any(local_failed_invalidations.get(name) for name in model_names):
+        return CACHE_TTL_MIN
+    intervals = {}
+    missing = []
+    for model_name in model_names:
+        interval = local_write_intervals.get(model_name)
+        if interval is not None:
+            intervals[model_name] = interval
+        else:
+            missing.append(model_name)
+    try:
+        if missing:
+            fetched = request_cache.get_connection().hmget(
+                cache.make_key(WRITE_INTERVALS_KEY), missing
+            )
+            for model_name, interval in zip(missing, fetched):
+                intervals[model_name] = float(interval) if interval is not None else 0.0
+                local_write_intervals.set(model_name, intervals[model_name])
+        generations = get_generations(model_names)
+    except CacheUnavailable:
+        # The TTL only tunes memory use, and must not cost the response it is computed for
+        return VIEW_CACHE_TTL
+
+    now = time.time()
+    ttls = []
+    for model_name in model_names:
+        average = intervals[model_name] or VIEW_CACHE_TTL / CACHE_TTL_WRITE_INTERVALS
+        # Generations double as the time of the model's last write
+        quiet = now - generations[model_name] / 1_000_000
+        ttls.append(CACHE_TTL_WRITE_INTERVALS * max(average, quiet))
+    ttl = min(ttls, default=VIEW_CACHE_TTL)
+    return int(min(max(ttl, CACHE_TTL_MIN), CACHE_TTL_MAX))
+
+
+# Deletes the lock only while it still holds the caller's token, so an expired lease never releases another owner's lock
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_lock(lock_key: str, lease: float) -> Union[int | None]:
+    """Try to take a short-lived lock with SET NX.
+
+    Args:
+        lock_key (str): The cache key of the lock.
+        lease (float): Seconds after which the lock expires if it is never released.
+
+    Returns:
+        int or None: The owner token needed to release the lock, or None if it is held elsewhere.
+    """
+    token = random.getrandbits(62)
+    if request_cache.add(lock_key, token, timeout=lease):
+        return token
+    return None
+
+
+def release_lock(lock_key: str, token: int) -> None:
+    """Release a lock taken with `acquire_lock` if it is still owned by `token`."""
+    request_cache.get_connection().eval(
+        RELEASE_LOCK_SCRIPT, 1, cache.make_key(lock_key), token
+    )
+
+
+def bump_generation(model_name: str) -> int:
+    """Atomically advance the generation of a single model namespace.
+
+    Args:
+        model_name (str): Name of the model whose namespace is invalidated.
+
+    Returns:
+        int: The new generation.
+    """
+    return bump_generations([model_name])[model_name]
+
+
+# Models whose writes invalidate cached responses or objects; writes to any other model are ignored
+cached_models = set()
+
+
+def register_cached_model(model) -> None:
+    """Register a model whose writes must invalidate the cache.
+
+    Models are registered by the views that cache them and by `CachedManager`, so a model is only tracked once
+    something caches it.
+
+    Args:
+        model: The model class to register.
+    """
+    cached_models.add(model)
+
+
+class TieredCache:
+    """A two-tier cache with a per-worker in-process L1 in front of the shared Redis L2.
+
+    Cache keys embed model generations, so the value stored under a key never changes and an L1 copy cannot go
+    stale on its own; invalidation reaches every worker through the generation check in `get_generations`. With a
+    codec, values are stored in L2 as encoded bytes and only decoded when promoted, so L1 hits cost no decoding.
+
+    Attributes:
+        local (LocalCache): The in-process L1 tier.
+        shared: The django_redis L2 tier, through the request cache so L2 reads can be batched with the request's.
+        codec (CacheCodec or None): The codec values are stored in L2 with, or None to let django_redis pickle them.
+    """
+
+    def __init__(
+        self,
+        local: LocalCache,
+        shared=request_cache,
+        codec: Optional[CacheCodec] = None,
+    ) -> None:
+        self.local = local
+        self.shared = shared
+        self.codec = codec
+
+    def get(self, key: str, model: str, view: str = ""):
+        """Read `key` from L1, falling back to L2 and promoting L2 hits into L1.
+
+        Args:
+            key (str): The cache key to look up.
+            model (str): Name of the model the entry belongs to, used to label metrics.
+            view (str): Name of the view or other caller the entry belongs to, used to label metrics.
+
+        Returns:
+            The cached value, or None if neither tier holds it.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            metrics.increment_cache_tier(model=model, tier="l1", cache_event_type="hit")
+            return value
+        metrics.increment_cache_tier(model=model, tier="l1", cache_event_type="miss")
+
+        started = time.perf_counter()
+        value = self.shared.get(key)
+        metrics.observe_cache_operation(
+            view=view,
+            model=model,
+            operation="get",
+            result="miss" if value is None else "hit",
+            seconds=time.perf_counter() - started,
+        )
+        value = self.decode_or_discard(key, value)
+        if value is not None:
+            metrics.increment_cache_tier(model=model, tier="l2", cache_event_type="hit")
+            self.local.set(key, value)
+        else:
+            metrics.increment_cache_tier(
+                model=model, tier="l2", cache_event_type="miss"
+            )
+        return value
+
+    def set(self, key: str, value, timeout: int, model: str = "", view: str = ""):
+        """Write `value` to both tiers for `timeout` seconds.
+
+        Args:
+            key (str): The cache key to write.
+            value: The value to cache.
+            timeout (int): Lifetime of the entry in seconds.
+            model (str): Name of the model the entry belongs to, used to label metrics.
+            view (str): Name of the view or other caller the entry belongs to, used to label metrics.
+
+        Returns:
+            The value as stored in L2, encoded if the cache has a codec.
+
+        Raises:
+            CodecError: If the value cannot be encoded by the cache's codec.
+        """
+        stored = value if self.codec is None else self.codec.encode(value)
+        started = time.perf_counter()
+        self.shared.set(key, stored, timeout=timeout)
+        metrics.observe_cache_operation(
+            view=view,
+            model=model,
+            operation="set",
+            result="stored",
+            seconds=time.perf_counter() - started,
+            # Pickled values are only measured by django_redis
+            size=len(stored) if isinstance(stored, bytes) else None,
+        )
+        self.local.set(key, value, timeout)
+        return stored
+
+    def get_many(self, keys: Iterable[str], model: str, view: str = "") -> Dict:
+        """Read several keys, from L1 where possible and from L2 with a single MGET, promoting L2 hits into L1.
+
+        Args:
+            keys (Iterable[str]): The cache keys to look up.
+            model (str): Name of the model the entries belong to, used to label metrics.
+            view (str): Name of the view or other caller the entries belong to, used to label metrics.
+
+        Returns:
+            Dict: The cached values keyed by cache key; keys neither tier holds are left out.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        metrics.increment_cache_tier(
+            model=model, tier="l1", cache_event_type="hit", count=len(found)
+        )
+        if not missing:
+            return found
+        metrics.increment_cache_tier(
+            model=model, tier="l1", cache_event_type="miss", count=len(missing)
+        )
+
+        started = time.perf_counter()
+        shared = self.shared.get_many(missing)
+        metrics.observe_cache_operation(
+            view=view,
+            model=model,
+            operation="get_many",
+            result="hit" if len(shared) == len(missing) else "miss",
+            seconds=time.perf_counter() - started,
+        )
+        hits = 0
+        for key, stored in shared.items():
+            value = self.decode_or_discard(key, stored)
+            if value is not None:
+                found[key] = value
+                self.local.set(key, value)
+                hits += 1
+        metrics.increment_cache_tier(
+            model=model, tier="l2", cache_event_type="hit", count=hits
+        )
+        metrics.increment_cache_tier(
+            model=model,
+            tier="l2",
+            cache_event_type="miss",
+            count=len(missing) - hits,
+        )
+        return found
+
+    def set_many(
+        self,
+        values: Mapping[str, object],
+        timeout: int,
+        model: str = "",
+        view: str = "",
+    ) -> None:
+        """Write several values to both tiers for `timeout` seconds, in a single round-trip to L2.
+
+        Args:
+            values (Mapping[str, object]): The values to cache, keyed by cache key.
+            timeout (int): Lifetime of the entries in seconds.
+            model (str): Name of the model the entries belong to, used to label metrics.
+            view (str): Name of the view or other caller the entries belong to, used to label metrics.
+
+        Raises:
+            CodecError: If a value cannot be encoded by the cache's codec.
+        """
+        if not values:
+            return
+        stored = {
+            key: value if self.codec is None else self.codec.encode(value)
+            for key, value in values.items()
+        }
+        started = time.perf_counter()
+        self.shared.set_many(stored, timeout=timeout)
+        metrics.observe_cache_operation(
+            view=view,
+            model=model,
+            operation="set_many",
+            result="stored",
+            seconds=time.perf_counter() - started,
+        )
+        for key, value in values.items():
+            self.local.set(key, value, timeout)
+
+    def decode(self, stored):
+        """Decode a value read from L2 directly, or return None if it is missing."""
+        if stored is None or self.codec is None:
+            return stored
+        return self.codec.decode(stored)
+
+    def decode_or_discard(self, key: str, stored):
+        """Decode a value read from L2, deleting the entry and returning None if it cannot be decoded.
+
+        An entry written by a serializer or compressor this worker does not have installed is treated as a miss, so
+        the caller rebuilds it instead of failing the request.
+        """
+        try:
+            return self.decode(stored)
+        except CodecError as e:
+            logger.warning(f"Discarding undecodable cache entry {key}: {e}")
+            self.shared.delete(key)
+            return None
+
+
+local_cache = LocalCache(
+    max_entries=CACHE_L1_MAX_ENTRIES, default_timeout=VIEW_CACHE_TTL
+)
+tiered_cache = TieredCache(local_cache)
+# Responses are plain data and are stored as bytes; the object cache holds model instances, which only pickle
+response_cache = TieredCache(
+    local_cache,
+    codec=CacheCodec(
+        serializer=CACHE_CODEC_SERIALIZER,
+        compressor=CACHE_CODEC_COMPRESSOR,
+        compress_threshold=CACHE_CODEC_COMPRESS_MIN_BYTES,
+    ),
+)
+
+
+def count_redis_keys() -> float:
+    """Count the keys in the Redis database backing the cache, for the key-count gauge."""
+    try:
+        return get_redis_connection("default").dbsize()
+    except Exception:
+        return float("nan")
+
+
+metrics.watch_key_count("l1", lambda: len(local_cache))
+metrics.watch_key_count("l2", count_redis_keys)
+
+database_breaker = CircuitBreaker(
+    "database",
+    failure_threshold=DB_BREAKER_FAILURES,
+    latency_threshold=DB_BREAKER_LATENCY,
+    reset_timeout=DB_BREAKER_RESET,
+)
+metrics.watch_circuit_breaker(redis_breaker)
+metrics.watch_circuit_breaker(database_breaker)
+
+
+def guard_database_query(execute, sql, params, many, context):
+    """Database execute wrapper sending each query through the database circuit breaker."""
+    with database_breaker.guard(errors=(DatabaseError,)):
+        return execute(sql, params, many, context)
+
+
+class ServiceUnavailable(APIException):
+    """Raised when the database is unavailable and no stale copy of the response is cached."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Service temporarily unavailable, try again later."
+    default_code = "service_unavailable"
+
+
+def canonicalize_query_params(query_params: Mapping[str, List[str]]) -> str:
+    """Render query parameters in a canonical, order-independent form.
+
+    Parameters are sorted by name and blank values, which filters treat as absent, are dropped, so equivalent
+    requests such as `?b=2&a=1` and `?a=1&b=2&c=` produce the same string.
+
+    Args:
+        query_params (Mapping[str, List[str]]): Mapping of parameter name to its list of values.
+
+    Returns:
+        str: The canonical, URL-encoded query string.
+    """
+    canonical = [
+        (name, value)
+        for name in sorted(query_params)
+        for value in query_params[name]
+        if value != ""
+    ]
+    return urlencode(canonical)
+
+
+class CachedTemplateView(TemplateView):
+    """A TemplateView that caches its rendered output.
+
+    This class method wraps the standard Django TemplateView with caching, improving performance for repeated requests.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):  # @NoSelf
+        return cache_page(VIEW_CACHE_TTL)(
+            super(CachedTemplateView, cls).as_view(**initkwargs)
+        )
+
+
+class NeverCacheMixin(object):
+    @method_decorator(never_cache)
+    def dispatch(self, *args, **kwargs):
+        return super(NeverCacheMixin, self).dispatch(*args, **kwargs)
+
+
+class CachedIdList:
+    """An ordered list of primary keys standing in for a queryset, loading instances only for the slices taken from it.
+
+    Paginators count it with `len` and slice the requested page out of it, so each page is hydrated through the
+    model's object cache without querying the rows of any other page.
+
+    Attributes:
+        manager (CachedManager): The manager hydrating instances through the object cache.
+        pks (list): The primary keys, in the order of the queryset they were read from.
+    """
+
+    def __init__(self, manager, pks: list) -> None:
+        self.manager = manager
+        self.pks = pks
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def __getitem__(self, index):
+        pks = self.pks[index] if isinstance(index, slice) else [self.pks[index]]
+        instances = self.manager.cached_in_bulk(pks)
+        hydrated = [instances[pk] for pk in pks if pk in instances]
+        return hydrated if isinstance(index, slice) else hydrated[0]
+
+
+class CachedResponseMixin:
+    """Mixin class to provide caching functionality for API responses.
+
+    This mixin allows views to cache their responses based on user identity and query parameters,
+    improving performance by reducing the need for repeated database queries.
+
+    Attributes:
+        cache_rendered_response (bool): When True, the fully rendered body, content type and headers are cached per
+            renderer and hits are served as a raw HttpResponse, skipping content negotiation and rendering.
+        rendered_cache_formats (tuple): Renderer formats eligible for rendered caching. Other formats, such as the
+            browsable API whose HTML embeds per-session CSRF tokens, fall back to caching the response data.
+        cache_objects (bool): When True, safe detail requests fetch their instance through the primary model's
+            `CachedManager` instead of querying the database.
+        conditional_get (bool): When True, responses carry a strong ETag and a Last-Modified date derived from the
+            model (list) or instance (detail) generation, and matching If-None-Match/If-Modified-Since requests are
+            answered with 304 before the ORM or serializers are touched.
+        predicate_invalidation (bool): When True, list entries are versioned by the filter predicates they select
+            rows with rather than by the whole model, so a write only invalidates the lists its row matches before or
+            after the write. The primary model should mix in `LoadedValuesMixin`; without it every write invalidates
+            every list.
+        cache_scope (str): Who cached responses are shared between. `CACHE_SCOPE_PUBLIC` stores one entry for every
+            caller and must only be used for user-agnostic resources; `CACHE_SCOPE_USER` stores one entry per user;
+            `CACHE_SCOPE_PERMISSIONS` stores one entry per distinct permission set.
+        cache_ttl (int or None): Fixed lifetime of the view's entries in seconds. When None, the lifetime adapts to how
+            often the view's models are written, see `get_cache_ttl`.
+        cache_id_lists (bool): When True, a paginated list miss reads the ordered primary keys of the filtered
+            queryset from a cache entry shared by every page, and hydrates the requested page through the primary
+            model's `CachedManager`, so only rows missing from the object cache are queried. The view's queryset must
+            not rely on `select_related` or annotations, which hydrated instances do not carry.
+        cache_fragments (bool): When True, list misses assemble their results from the cached representation of
+            each row, keyed by primary key and row generation, and only serialize rows that are new or changed. The
+            serializer's output must not depend on the request, as fragments are shared by every caller.
+        batch_throttle_writes (bool): Marks the view as writing its throttle histories back together once every
+            throttle has been checked, see `check_throttles`.
+
+    Both Redis and the database are guarded by circuit breakers. While Redis is failing, requests are served from the
+    in-process tier where it holds the entry and straight from the database otherwise. While the database is failing,
+    misses are served the last good copy of the response, flagged with the `X-Cache-Stale` header. Authentication
+    queries the database before the view runs, so during an outage only public views an anonymous caller may read
+    are served stale; requests to every other view fail while authenticating.
+    """
+
+    cache_rendered_response = False
+    rendered_cache_formats = ("json",)
+    conditional_get = False
+    cache_objects = False
+    predicate_invalidation = False
+    cache_scope = CACHE_SCOPE_USER
+    cache_ttl = None
+    cache_id_lists = False
+    cache_fragments = False
+    batch_throttle_writes = True
+    _rendered_cache_key = None
+    _regeneration_lock = None
+    _regeneration_started = None
+    _cache_unavailable = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Register the models a view caches, so writes to them invalidate its responses."""
+        super().__init_subclass__(**kwargs)
+        for model in [
+            getattr(cls, "primary_model", None),
+            *getattr(cls, "cache_models", []),
+        ]:
+            if model is not None:
+                register_cached_model(model)
+
+    def get_cache_identity(self) -> str:
+        """Identify who the cached response is shared between, according to the view's `cache_scope`.
+
+        The identity is read from the user DRF has already authenticated for this request, so building a key for a
+        public or per-user scope never costs a database query of its own.
+
+        Returns:
+            str: "public", the primary key of the authenticated user, a digest of their permission set, or
+            "anonymous".
+        """
+        if self.cache_scope == CACHE_SCOPE_PUBLIC:
+            return CACHE_SCOPE_PUBLIC
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            return "anonymous"
+        if self.cache_scope == CACHE_SCOPE_PERMISSIONS:
+            permission_set = ",".join(sorted(user.get_all_permissions()))
+            if user.is_superuser:
+                permission_set = f"superuser|{permission_set}"
+            permission_digest = hashlib.md5(
+                permission_set.encode("utf-8"), usedforsecurity=False
+            ).hexdigest()
+            return f"perms-{permission_digest}"
+        return str(user.pk)
+
+    def get_canonical_query(self, paginated: bool = True) -> str:
+        """Build the canonical form of the request's query string.
+
+        `limit` and `offset` are resolved exactly as the paginator would resolve them, and dropped when they equal the
+        paginator's defaults, so `?offset=0`, `?limit=10` and no parameters at all share a single cache entry.
+
+        Args:
+            paginated (bool): When False, `limit` and `offset` are dropped altogether, so every page of a list shares
+                the same canonical query.
+
+        Returns:
+            str: The canonical query string for the current request.
+        """
+        query_params = {
+            name: self.request.query_params.getlist(name)
+            for name in self.request.query_params
+        }
+        paginator = getattr(self, "paginator", None)
+        if not paginated and paginator is not None:
+            for param in PAGINATION_QUERY_PARAMS:
+                query_params.pop(getattr(paginator, param, None), None)
+        elif isinstance(paginator, LimitOffsetPagination):
+            limit = paginator.get_limit(self.request)
+            offset = paginator.get_offset(self.request)
+            query_params.pop(paginator.limit_query_param, None)
+            query_params.pop(paginator.offset_query_param, None)
+            if limit != paginator.default_limit:
+                query_params[paginator.limit_query_param] = [str(limit)]
+            if offset:
+                query_params[paginator.offset_query_param] = [str(offset)]
+        return canonicalize_query_params(query_params)
+
+    def get_schema_version(self) -> int:
+        """Return the version of the serialized representation being cached.
+
+        Serializers declare a `cache_version` that is bumped whenever their output shape changes, so a deploy never
+        serves payloads cached under the previous shape.
+
+        Returns:
+            int: The serializer's cache version.
+        """
+        serializer_class = None
+        if hasattr(self, "get_serializer_class"):
+            serializer_class = self.get_serializer_class()
+        return getattr(serializer_class, "cache_version", DEFAULT_SCHEMA_VERSION)
+
+    def get_cache_model_names(self) -> List[str]:
+        """Get the model name(s) associated with the view.
+
+        Returns:
+            List[str]: The primary model's name followed by the names of any `cache_models`.
+
+        Raises:
+            AttributeError: If the view does not have a 'primary_model' attribute.
+        """
+        model_names = []
+
+        # Add the primary model name
+        primary_model = getattr(self, "primary_model", None)
+        if primary_model:
+            model_names.append(primary_model.__name__)
+        else:
+            raise AttributeError("View must have a 'primary_model' attribute.")
+
+        # Add the cache_models names
+        cache_models = getattr(self, "cache_models", [])
+        model_names.extend(model.__name__ for model in cache_models)
+        return model_names
+
+    def get_cache_ttl(self) -> int:
+        """Get how long this view's entries are cached.
+
+        Returns:
+            int: The view's `cache_ttl` if set, otherwise a TTL adapted to the write rate of its models.
+        """
+        if self.cache_ttl is not None:
+            return self.cache_ttl
+        return get_cache_ttl(self.get_cache_model_names())
+
+    def get_cache_key(self) -> str:
+        """Generate a unique cache key based on the request and model information.
+
+        This method constructs a cache key that incorporates the user ID, the path and canonical query parameters,
+        the serializer version, and the names and current generations of the models associated with the view.
+        Detail requests use the generation of the addressed instance in place of the primary model's, so writes to
+        other rows leave them cached. Building the key only touches Redis.
+
+        Returns:
+            str: A unique cache key for the current request.
+
+        Raises:
+            AttributeError: If the view does not have a 'primary_model' attribute.
+        """
+        return self.build_cache_key(self.get_version_tag())
+
+    def get_version_tag(self) -> str:
+        """Embed the current generation of each version name, so a bump orphans every key built before it."""
+        version_names = self.get_version_names()
+        generations = get_generations(version_names)
+        generations_str = ".".join(str(generations[name]) for name in version_names)
+        return f"g{generations_str}"
+
+    def get_id_list_cache_key(self) -> str:
+        """Generate the key of the ordered primary-key list shared by every page of the current list request.
+
+        Returns:
+            str: The cache key, versioned like the request's pages but independent of pagination and rendering.
+        """
+        return self.build_cache_key(
+            self.get_version_tag(), representation="ids", paginated=False
+        )
+
+    def get_stale_cache_key(self) -> str:
+        """Generate the generation-independent key holding the last good copy of this request's response.
+
+        Returns:
+            str: The stale cache key for the current request.
+        """
+        return self.build_cache_key("stale")
+
+    def build_cache_key(
+        self,
+        version_tag: str,
+        representation: Optional[str] = None,
+        paginated: bool = True,
+    ) -> str:
+        """Assemble a cache key for the current request around a version tag.
+
+        Args:
+            version_tag (str): The generations the entry belongs to, or a fixed tag for unversioned entries.
+            representation (str): What the entry holds; defaults to the rendered format or response data.
+            paginated (bool): Whether the entry is specific to the requested page.
+
+        Returns:
+            str: The cache key, namespaced by the primary model.
+        """
+        user_id = self.get_cache_identity()
+        request_signature = (
+            f"{self.request.META['PATH_INFO']}?{self.get_canonical_query(paginated)}"
+        )
+        request_signature_hash = hashlib.md5(
+            request_signature.encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+
+        model_names = self.get_cache_model_names()
+        primary_model = self.primary_model
+        # Combine the model names into a string
+        model_names_str = "_".join(model_names)
+
+        # Rendered entries are specific to the renderer that produced them
+        if representation is None:
+            representation = (
+                f"r{self.request.accepted_renderer.format}"
+                if self.uses_rendered_cache()
+                else "d"
+            )
+
+        return f"{primary_model.__name__}:{self.__class__.__name__}_{model_names_str}_{version_tag}_v{self.get_schema_version()}_{representation}_{user_id}_{request_signature_hash}_cache_key"
+
+    def uses_rendered_cache(self) -> bool:
+        """Determine whether this request caches rendered bytes rather than response data.
+
+        Returns:
+            bool: True if rendered caching is enabled and the negotiated renderer is eligible for it.
+        """
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return (
+            self.cache_rendered_response
+            and renderer is not None
+            and renderer.format in self.rendered_cache_formats
+        )
+
+    def get_cached_response(self, cache_key) -> Union[Response | HttpResponse | None]:
+        """Retrieve cached data using the provided cache key.
+
+        This method checks if there is cached data for the given cache key and returns it if available. As an entry
+        approaches expiry, a request may be chosen at random (XFetch) to rebuild it early, so that entries are
+        refreshed before they expire rather than all at once afterwards.
+
+        Args:
+            cache_key (str): The cache key to look up.
+
+        Returns:
+            Response, HttpResponse or None: The cached response if found, otherwise None. Rendered entries are
+            returned as a raw HttpResponse.
+        """
+        entry = response_cache.get(
+            cache_key, model=self.primary_model.__name__, view=self.__class__.__name__
+        )
+        if entry is not None:
+            if self.should_refresh_early(entry) and self.acquire_regeneration_lock(
+                cache_key
+            ):
+                logger.debug(
+                    f"Early Refresh for {self.primary_model.__name__} - Cache Key: {cache_key}"
+                )
+                return None
+            logger.debug(
+                f"Cache Hit for {self.primary_model.__name__} - Cache Key: {cache_key}"
+            )
+            metrics.increment_cache(
+                model=self.primary_model.__name__, cache_event_type="hit"
+            )
+            return self.build_cached_response(entry["data"])
+        else:
+            logger.debug(
+                f"Cache Miss for {self.primary_model.__name__}  - Cache Key: {cache_key}"
+            )
+            metrics.increment_cache(
+                model=self.primary_model.__name__, cache_event_type="miss"
+            )
+            self._regeneration_started = time.perf_counter()
+            return None
+
+    def should_refresh_early(self, entry) -> bool:
+        """Decide probabilistically whether to rebuild an entry before it expires.
+
+        Implements XFetch: the closer the entry is to expiry, and the longer it took to build, the more likely a
+        request is to refresh it early.
+
+        Args:
+            entry (dict): The cached entry, carrying its build time (`delta`) and expiry (`expires_at`).
+
+        Returns:
+            bool: True if this request should rebuild the entry.
+        """
+        jitter = (
+            -entry["delta"] * CACHE_EARLY_REFRESH_BETA * math.log(1.0 - random.random())
+        )
+        if time.time() + jitter < entry["expires_at"]:
+            return False
+        self._regeneration_started = time.perf_counter()
+        return True
+
+    def build_cached_response(self, payload) -> Union[Response | HttpResponse]:
+        """Rebuild a response from a cached payload in the representation this request uses.
+
+        Args:
+            payload: The response data, or the rendered payload stored by `cache_rendered`.
+
+        Returns:
+            Response or HttpResponse: The response to return to the client.
+        """
+        if self.uses_rendered_cache():
+            return self.build_rendered_response(payload)
+        return Response(payload, status=status.HTTP_200_OK)
+
+    def acquire_regeneration_lock(self, cache_key) -> bool:
+        """Try to become the single request that rebuilds `cache_key`.
+
+        Args:
+            cache_key (str): The cache key about to be rebuilt.
+
+        Returns:
+            bool: True if this request holds the regeneration lock.
+        """
+        lock_key = f"lock:{cache_key}"
+        try:
+            token = acquire_lock(lock_key, lease=CACHE_LOCK_LEASE)
+        except CacheUnavailable:
+            # Without Redis the rebuild cannot be coalesced, so every request rebuilds for itself
+            return True
+        if token is None:
+            return False
+        self._regeneration_lock = (lock_key, token)
+        return True
+
+    def release_regeneration_lock(self) -> None:
+        """Release the regeneration lock if this request holds it."""
+        if self._regeneration_lock is not None:
+            lock_key, token = self._regeneration_lock
+            self._regeneration_lock = None
+            try:
+                release_lock(lock_key, token)
+            except CacheUnavailable:
+                # The lease expires on its own
+                pass
+
+    def get_stale_response(self) -> Union[Response | HttpResponse | None]:
+        """Build a response from the last good copy of the entry, flagged with the `X-Cache-Stale` header.
+
+        Detail responses of deleted instances are never served stale: their tombstone is read together with the copy.
+
+        Returns:
+            Response, HttpResponse or None: The stale response, or None if no copy is cached or the instance was
+            deleted.
+        """
+        stale_key = self.get_stale_cache_key()
+        version_name = self.get_object_version_name()
+        tombstone_key = (
+            get_tombstone_key(version_name) if version_name is not None else None
+        )
+        request_cache.prefetch(
+            [stale_key, tombstone_key] if tombstone_key else [stale_key]
+        )
+        if tombstone_key is not None and request_cache.get(tombstone_key):
+            return None
+        stale_entry = response_cache.decode(request_cache.get(stale_key))
+        if stale_entry is None:
+            return None
+        response = self.build_cached_response(stale_entry["data"])
+        response[STALE_RESPONSE_HEADER] = "true"
+        return response
+
+    def wait_for_regeneration(self, cache_key) -> Union[Response | HttpResponse | None]:
+        """Coalesce a cache miss onto a regeneration already in flight.
+
+        The first request to miss takes the regeneration lock and rebuilds the entry. Every other request is
+        served the last good copy of the response, flagged with the `X-Cache-Stale` header, or, if there is none,
+        waits up to `CACHE_LOCK_WAIT` for the rebuilt entry before rebuilding it itself.
+
+        Args:
+            cache_key (str): The cache key that missed.
+
+        Returns:
+            Response, HttpResponse or None: A stale or freshly rebuilt response, or None if this request must
+            rebuild the entry.
+        """
+        if self._regeneration_lock is not None or self.acquire_regeneration_lock(
+            cache_key
+        ):
+            return None
+
+        metrics.increment_cache(
+            model=self.primary_model.__name__, cache_event_type="coalesced"
+        )
+        if (stale_response := self.get_stale_response()) is not None:
+            logger.debug(
+                f"Serving Stale {self.primary_model.__name__} While Regenerating - Cache Key: {cache_key}"
+            )
+            return stale_response
+
+        deadline = time.monotonic() + CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.025)
+            polled = request_cache.get(cache_key, fresh=True)
+            if (entry := response_cache.decode(polled)) is not None:
+                return self.build_cached_response(entry["data"])
+        logger.debug(
+            f"Regeneration Wait Timed Out for {self.primary_model.__name__} - Cache Key: {cache_key}"
+        )
+        return None
+
+    def write_cache_entry(self, cache_key, payload) -> None:
+        """Write a rebuilt payload to the cache and release the regeneration lock.
+
+        The entry records how long it took to build and when it expires, for early refresh. A copy is also kept under
+        the stale key, where it outlives invalidation and expiry so it can be served while the entry is rebuilt.
+        Both are stored as bytes encoded by the response codec rather than as pickled DRF objects.
+
+        Args:
+            cache_key (str): The cache key under which to store the payload.
+            payload: The response data, or the rendered payload built by `cache_rendered`.
+        """
+        started = self._regeneration_started or time.perf_counter()
+        ttl = self.get_cache_ttl()
+        entry = {
+            "data": payload,
+            "delta": time.perf_counter() - started,
+            "expires_at": time.time() + ttl,
+        }
+        try:
+            stored = response_cache.set(
+                cache_key,
+                entry,
+                timeout=ttl,
+                model=self.primary_model.__name__,
+                view=self.__class__.__name__,
+            )
+        except CodecError as e:
+            logger.warning(f"Response for {cache_key} is not cacheable: {e}")
+        else:
+            request_cache.set(
+                self.get_stale_cache_key(),
+                stored,
+                timeout=max(CACHE_STALE_TTL, ttl),
+            )
+        self.release_regeneration_lock()
+
+    def cache_response(self, cache_key, data):
+        """Store data in the cache with the specified cache key.
+
+        This method saves the provided data in the cache for the view's `get_cache_ttl` seconds.
+
+        Args:
+            cache_key (str): The cache key under which to store the data.
+            data: The data to be cached.
+        """
+        if type(data) in [JsonResponse, TemplateResponse]:
+            data = data.render()
+        logger.debug(f"New Cache Set {cache_key}: {data}")
+        self.write_cache_entry(cache_key, data)
+
+    def store_response(self, cache_key, response: Response) -> None:
+        """Cache a freshly built response in the representation this request uses.
+
+        Response data is cached immediately. Rendered bytes only exist once the response has been bound to the
+        negotiated renderer, so in rendered mode the key is remembered and the entry is written by `finalize_response`.
+
+        Args:
+            cache_key (str): The cache key under which to store the response.
+            response (Response): The response returned to the client, including any pagination envelope.
+        """
+        if self.uses_rendered_cache():
+            self._rendered_cache_key = cache_key
+        else:
+            self.cache_response(cache_key, response.data)
+
+    def cache_rendered(self, cache_key, response: Response) -> None:
+        """Render a response and cache its body, content type and headers.
+
+        Args:
+            cache_key (str): The cache key under which to store the rendered response.
+            response (Response): A response already bound to its renderer by `finalize_response`.
+        """
+        response.render()
+        payload = {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "headers": {
+                header: value
+                for header, value in response.items()
+                if header
+                not in ("Content-Type", "Content-Length", "ETag", "Last-Modified")
+            },
+        }
+        logger.debug(f"New Rendered Cache Set {cache_key}")
+        self.write_cache_entry(cache_key, payload)
+
+    def build_rendered_response(self, payload) -> HttpResponse:
+        """Rebuild a raw HttpResponse from a cached rendered payload.
+
+        Args:
+            payload (dict): The body, content type and headers stored by `cache_rendered`.
+
+        Returns:
+            HttpResponse: The response, ready to be sent without any re-serialization.
+        """
+        response = HttpResponse(
+            payload["content"],
+            content_type=payload["content_type"],
+            status=status.HTTP_200_OK,
+        )
+        for header, value in payload["headers"].items():
+            response[header] = value
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Finalize the response, write any pending rendered cache entry and release the regeneration lock."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._rendered_cache_key is not None:
+            cache_key, self._rendered_cache_key = self._rendered_cache_key, None
+            if (
+                isinstance(response, Response)
+                and response.status_code == status.HTTP_200_OK
+            ):
+                self.cache_rendered(cache_key, response)
+        # A failed rebuild must not keep other requests waiting for the rest of the lease
+        self.release_regeneration_lock()
+        return response
+
+    def get_lookup_pk(self):
+        """Get the primary key addressed by a detail request.
+
+        Returns:
+            The primary key from the URL, or None for list requests and views that look objects up by any other
+            field.
+        """
+        pk_field = self.primary_model._meta.pk
+        lookup_field = getattr(self, "lookup_field", None)
+        lookup_url_kwarg = getattr(self, "lookup_url_kwarg", None) or lookup_field
+        if lookup_field not in ("pk", pk_field.name) or (
+            lookup_url_kwarg not in self.kwargs
+        ):
+            return None
+        return pk_field.to_python(self.kwargs[lookup_url_kwarg])
+
+    def get_object_version_name(self) -> Union[str | None]:
+        """Get the versioned name of the instance addressed by a detail request.
+
+        Instance generations are tracked by primary key, so views looking objects up by any other field fall back to
+        the model generation.
+
+        Returns:
+            str or None: The instance's versioned name, or None if it cannot be derived from the URL.
+        """
+        pk = self.get_lookup_pk()
+        if pk is None:
+            return None
+        return get_object_version_name(self.primary_model.__name__, pk)
+
+    @cached_property
+    def list_predicates(self) -> Union[List[list] | None]:
+        """The filter predicates selecting the rows of a predicate-aware list request.
+
+        Returns:
+            List[list] or None: The predicates, or None if predicate invalidation is disabled, the request addresses a
+            single instance, or a filter backend applies filters that cannot be expressed as predicates.
+        """
+        if not self.predicate_invalidation or self.get_lookup_pk() is not None:
+            return None
+        predicates = []
+        for backend_class in self.filter_backends:
+            backend = backend_class()
+            if not hasattr(backend, "get_filterset"):
+                return None
+            filterset = backend.get_filterset(self.request, self.get_queryset(), self)
+            if filterset is None:
+                continue
+            if (filterset_predicates := get_filter_predicates(filterset)) is None:
+                return None
+            predicates.extend(filterset_predicates)
+        return sorted(predicates)
+
+    def register_list_predicates(self) -> None:
+        """Register the predicates of a predicate-aware list before it is rebuilt."""
+        if self.list_predicates is not None:
+            register_list_predicates(self.primary_model.__name__, self.list_predicates)
+
+    def get_version_names(self) -> List[str]:
+        """Get the names whose generations version the current request's cache entries and validators.
+
+        Returns:
+            List[str]: The model names, with the addressed instance replacing the primary model on detail requests,
+            and the lists of the model together with the lists sharing this request's predicates replacing it on
+            predicate-aware list requests.
+        """
+        names = self.get_cache_model_names()
+        if (object_version_name := self.get_object_version_name()) is not None:
+            names[0] = object_version_name
+        elif self.list_predicates is not None:
+            model_name = names[0]
+            names[0:1] = [
+                get_lists_version_name(model_name),
+                get_list_version_name(
+                    model_name, get_predicate_signature(self.list_predicates)
+                ),
+            ]
+        return names
+
+    def get_object(self):
+        """Fetch the addressed instance, through the model's object cache where it is safe to do so.
+
+        Only safe, unfiltered requests on views with `cache_objects` enabled are read from the cache; writes always
+        load the row from the database so they never update a stale copy.
+
+        Returns:
+            The model instance addressed by the URL.
+
+        Raises:
+            Http404: If no instance exists with the requested primary key.
+        """
+        manager = self.primary_model._default_manager
+        pk = self.get_lookup_pk()
+        if (
+            not self.cache_objects
+            or self._cache_unavailable
+            or pk is None
+            or self.request.method not in SAFE_METHODS
+            or self.request.query_params
+            or not hasattr(manager, "cached_get")
+        ):
+            return super().get_object()
+        try:
+            instance = manager.cached_get(pk)
+        except self.primary_model.DoesNotExist as e:
+            raise Http404(
+                f"No {self.primary_model._meta.object_name} matches the given query."
+            ) from e
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    def get_cached_id_list(self, queryset):
+        """Replace a filtered queryset by its cached ordered primary keys, for pages to be hydrated from.
+
+        Args:
+            queryset (QuerySet): The filtered queryset of a list request.
+
+        Returns:
+            CachedIdList or QuerySet: The primary keys, or the queryset itself if ID lists are disabled, the list is
+            not paginated, the primary model has no `CachedManager`, or the result is too long to cache.
+        """
+        manager = self.primary_model._default_manager
+        if (
+            not self.cache_id_lists
+            or self.paginator is None
+            or not hasattr(manager, "cached_in_bulk")
+        ):
+            return queryset
+        cache_key = self.get_id_list_cache_key()
+        model_name = self.primary_model.__name__
+        view_name = self.__class__.__name__
+        pks = response_cache.get(cache_key, model=model_name, view=view_name)
+        if pks is None:
+            pks = list(
+                queryset.values_list("pk", flat=True)[: CACHE_ID_LIST_MAX_LENGTH + 1]
+            )
+            if len(pks) > CACHE_ID_LIST_MAX_LENGTH:
+                return queryset
+            try:
+                response_cache.set(
+                    cache_key,
+                    pks,
+                    timeout=self.get_cache_ttl(),
+                    model=model_name,
+                    view=view_name,
+                )
+            except CodecError as e:
+                logger.warning(f"ID list for {cache_key} is not cacheable: {e}")
+                return queryset
+        return CachedIdList(manager, pks)
+
+    def serialize_rows(self, rows) -> list:
+        """Serialize the rows of a list, reusing the cached representation of every row that has not changed.
+
+        Fragments are read with a single MGET and are versioned by each row's generation, so a write to a row only
+        orphans that row's fragment; the rows without one are serialized together and their fragments cached.
+
+        Args:
+            rows: The instances of the page, or of the whole list when it is not paginated.
+
+        Returns:
+            list: The serialized rows, in order.
+        """
+        if not self.cache_fragments:
+            return self.get_serializer(rows, many=True).data
+        rows = list(rows)
+        model_name = self.primary_model.__name__
+        view_name = self.__class__.__name__
+        serializer_class = self.get_serializer_class()
+        version_names = {
+            row.pk: get_object_version_name(model_name, row.pk) for row in rows
+        }
+        generations = get_generations(version_names.values())
+        fragment_keys = {
+            pk: get_fragment_cache_key(
+                model_name, serializer_class, pk, generations[version_name]
+            )
+            for pk, version_name in version_names.items()
+        }
+        fragments = response_cache.get_many(
+            fragment_keys.values(), model=model_name, view=view_name
+        )
+        if missing := [row for row in rows if fragment_keys[row.pk] not in fragments]:
+            serialized = {
+                fragment_keys[row.pk]: dict(data)
+                for row, data in zip(
+                    missing, self.get_serializer(missing, many=True).data
+                )
+            }
+            try:
+                response_cache.set_many(
+                    serialized,
+                    timeout=get_cache_ttl([model_name]),
+                    model=model_name,
+                    view=view_name,
+                )
+            except CodecError as e:
+                logger.warning(f"Fragments of {model_name} are not cacheable: {e}")
+            fragments.update(serialized)
+        return [fragments[fragment_keys[row.pk]] for row in rows]
+
+    def get_prefetch_keys(self) -> List[str]:
+        """List the cache keys the request reads before its cache entry can be looked up.
+
+        Returns:
+            List[str]: The keys holding the throttle histories of the request and, for safe requests, the generations
+            versioning its cache entries that this worker does not hold a local copy of.
+        """
+        keys = [
+            throttle.get_cache_key(self.request, self)
+            for throttle in self.get_throttles()
+            if hasattr(throttle, "get_cache_key")
+        ]
+        if self.request.method in ("GET", "HEAD") and getattr(
+            self, "primary_model", None
+        ):
+            names = self.get_version_names()
+            names.extend(filter(None, map(get_epoch_name, names)))
+            keys.extend(
+                get_generation_key(name)
+                for name in names
+                if local_generations.get(name) is None
+            )
+        return [key for key in keys if key]
+
+    def get_throttles(self) -> list:
+        """Get the view's throttles, skipping them for requests replayed by the cache warmer.
+
+        Replays run as the user who made the original request, and must neither be refused by nor count against that
+        user's rate limits.
+        """
+        if getattr(self.request, "cache_warming", False):
+            return []
+        return super().get_throttles()
+
+    def check_throttles(self, request) -> None:
+        """Check the request's throttles with its Redis reads and writes batched.
+
+        The throttle histories and the generations needed for the cache key are fetched together with a single MGET,
+        and the updated histories are written back together once every throttle has been checked.
+
+        Args:
+            request: The DRF request.
+        """
+        request_cache.prefetch(self.get_prefetch_keys())
+        try:
+            super().check_throttles(request)
+        finally:
+            request_cache.flush()
+
+    def record_popularity(self) -> None:
+        """Record this request in the popularity counts used to warm the cache.
+
+        Requests replayed by the warmer are not recorded, so warming never feeds the ranking it reads.
+        """
+        if getattr(self.request, "cache_warming", False):
+            return
+        user = getattr(self.request, "user", None)
+        try:
+            metrics.record_request(
+                {
+                    "model": self.primary_model.__name__,
+                    "host": self.request.get_host(),
+                    "path": f"{self.request.META['PATH_INFO']}?{self.get_canonical_query()}",
+                    "accept": str(getattr(self.request, "accepted_media_type", "")),
+                    "identity": self.get_cache_identity(),
+                },
+                user_pk=user.pk if user is not None and user.is_authenticated else None,
+            )
+        except CacheUnavailable:
+            # Popularity only steers warming, which cannot run without Redis anyway
+            pass
+
+    @contextmanager
+    def guard_database(self):
+        """Send the queries made while rebuilding a response through the database circuit breaker."""
+        alias = router.db_for_read(self.primary_model)
+        with connections[alias].execute_wrapper(guard_database_query):
+            yield
+
+    def serve_stale(self, error: Exception) -> Union[Response | HttpResponse]:
+        """Answer a miss whose rebuild failed on the database with the last good copy of the response.
+
+        Args:
+            error (Exception): The database error, or `CircuitOpenError` if the database breaker is open.
+
+        Returns:
+            Response or HttpResponse: The stale response.
+
+        Raises:
+            ServiceUnavailable: If the database breaker is open and no stale copy is cached.
+            DatabaseError: The original error, if the query failed and no stale copy is cached.
+        """
+        self.release_regeneration_lock()
+        if (stale_response := self.get_stale_response()) is not None:
+            logger.warning(
+                f"Serving Stale {self.primary_model.__name__} While the Database Is Unavailable - {error}"
+            )
+            return stale_response
+        if isinstance(error, CircuitOpenError):
+            raise ServiceUnavailable() from error
+        raise error
+
+    def handle_exception(self, exc):
+        """Serve the last good copy of a public response when the request failed on the database before the view ran.
+
+        Args:
+            exc (Exception): The error raised while handling the request.
+
+        Returns:
+            Response or HttpResponse: The stale response, or the response DRF builds for the error.
+        """
+        if isinstance(exc, DatabaseError):
+            if (stale_response := self.serve_stale_unauthenticated(exc)) is not None:
+                return stale_response
+        return super().handle_exception(exc)
+
+    def serve_stale_unauthenticated(
+        self, error: DatabaseError
+    ) -> Union[Response | HttpResponse | None]:
+        """Answer a safe request whose authentication failed on the database with the last good copy of the response.
+
+        Public entries are shared by every caller, so they are served without knowing who the caller is, but only if
+        the view's permissions let an anonymous caller read them. Views requiring an authenticated caller cannot be
+        served while the database is unavailable.
+
+        Args:
+            error (DatabaseError): The database error raised before the view ran.
+
+        Returns:
+            Response, HttpResponse or None: The stale response, or None if it cannot be served.
+        """
+        if (
+            self.cache_scope != CACHE_SCOPE_PUBLIC
+            or self.request.method not in SAFE_METHODS
+        ):
+            return None
+        self.request.user = AnonymousUser()
+        self.request.auth = None
+        try:
+            self.check_permissions(self.request)
+            stale_response = self.get_stale_response()
+        except (APIException, CacheUnavailable):
+            return None
+        if stale_response is not None:
+            logger.warning(
+                f"Serving Stale {self.primary_model.__name__} Without Authentication While the Database Is "
+                f"Unavailable - {error}"
+            )
+        return stale_response
+
+    def serve_uncached(
+        self, handler, error: CacheUnavailable, request, *args, **kwargs
+    ):
+        """Serve a request straight from the database while Redis is unavailable.
+
+        Nothing is read from or written to the cache, and no validators are attached, as they need the generations
+        held by Redis.
+
+        Args:
+            handler (callable): The uncached DRF handler, `ListModelMixin.list` or `RetrieveModelMixin.retrieve`.
+            error (CacheUnavailable): Why Redis could not be used.
+            request: The DRF request.
+
+        Returns:
+            Response: The response built by `handler`.
+        """
+        logger.warning(
+            f"Serving {self.primary_model.__name__} Without Cache While Redis Is Unavailable - {error}"
+        )
+        self._cache_unavailable = True
+        self._rendered_cache_key = None
+        self.release_regeneration_lock()
+        return handler(request, *args, **kwargs)
+
+    def get_validators(self) -> Union[tuple | None]:
+        """Derive the ETag and Last-Modified validators of the current request.
+
+        The strong ETag hashes every input that determines the response bytes: the view, the relevant generations,
+        the serializer version, the caller, the path with its canonical query, the negotiated media type and the host.
+        Generations are microsecond timestamps of the last change, so the newest one is the Last-Modified date.
+        Detail requests are versioned by their own instance rather than the whole model.
+
+        Returns:
+            tuple or None: The (etag, last_modified) pair, or None if conditional GET is disabled for the view.
+        """
+        if not self.conditional_get:
+            return None
+        names = self.get_version_names()
+        generations = get_generations(names)
+        signature = "|".join(
+            [
+                self.__class__.__name__,
+                ".".join(f"{name}={generations[name]}" for name in names),
+                f"v{self.get_schema_version()}",
+                self.get_cache_identity(),
+                f"{self.request.META['PATH_INFO']}?{self.get_canonical_query()}",
+                str(getattr(self.request, "accepted_media_type", "")),
+                self.request.get_host(),
+            ]
+        )
+        etag = quote_etag(
+            hashlib.md5(signature.encode("utf-8"), usedforsecurity=False).hexdigest()
+        )
+        last_modified = max(generations.values()) // 1_000_000
+        return etag, last_modified
+
+    def get_not_modified_response(self, validators) -> Union[HttpResponse | None]:
+        """Answer a conditional GET whose validators still match with 304 Not Modified.
+
+        Args:
+            validators (tuple or None): The (etag, last_modified) pair from `get_validators`.
+
+        Returns:
+            HttpResponse or None: A 304 response carrying the validators, or None if the request must be served.
+        """
+        if validators is None:
+            return None
+        etag, last_modified = validators
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            return None
+        logger.debug(f"Not Modified for {self.primary_model.__name__} - ETag: {etag}")
+        return self.set_validators(response, validators)
+
+    def set_validators(self, response, validators):
+        """Attach the ETag and Last-Modified headers to a response.
+
+        Args:
+            response: The response being returned.
+            validators (tuple or None): The (etag, last_modified) pair from `get_validators`.
+
+        Returns:
+            The same response.
+        """
+        if validators is not None:
+            etag, last_modified = validators
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs) -> Response:
+        """Handle GET requests for listing resources with caching.
+
+        This method attempts to return a cached response if available;
+        otherwise, it retrieves the data, caches it, and returns the response.
+
+        Args:
+            request: The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The cached or newly generated response.
+        """
+        self.record_popularity()
+        try:
+            cache_key = self.get_cache_key()
+            validators = self.get_validators()
+            if not_modified := self.get_not_modified_response(validators):
+                return not_modified
+            if cached_response := self.get_cached_response(cache_key):
+                return self.set_validators(cached_response, validators)
+            if coalesced_response := self.wait_for_regeneration(cache_key):
+                return coalesced_response
+
+            # If cache miss, proceed as usual
+            try:
+                with self.guard_database():
+                    self.register_list_predicates()
+                    queryset = self.get_cached_id_list(
+                        self.filter_queryset(self.get_queryset())
+                    )
+
+                    # Apply pagination if needed
+                    page = self.paginate_queryset(queryset)
+                    if page is not None:
+                        # Cache the paginated response so hits keep the count/next/previous envelope
+                        response = self.get_paginated_response(
+                            self.serialize_rows(page)
+                        )
+                    else:
+                        response = Response(self.serialize_rows(queryset))
+            except (DatabaseError, CircuitOpenError) as e:
+                return self.serve_stale(e)
+            self.store_response(cache_key, response)
+            return self.set_validators(response, validators)
+        except CacheUnavailable as e:
+            return self.serve_uncached(super().list, e, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        """Handle GET requests for retrieving a single resource with caching.
+
+        This method checks for a cached response and returns it if available;
+        otherwise, it retrieves the resource, caches it, and returns the response.
+
+        Args:
+            request: The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The cached or newly generated response.
+        """
+        self.record_popularity()
+        try:
+            cache_key = self.get_cache_key()
+            validators = self.get_validators()
+            if not_modified := self.get_not_modified_response(validators):
+                return not_modified
+            if cached_response := self.get_cached_response(cache_key):
+                return self.set_validators(cached_response, validators)
+            if coalesced_response := self.wait_for_regeneration(cache_key):
+                return coalesced_response
+
+            # If cache miss, proceed as usual
+            try:
+                with self.guard_database():
+                    instance = self.get_object()
+                    serializer = self.get_serializer(instance)
+                    response = Response(serializer.data)
+            except (DatabaseError, CircuitOpenError) as e:
+                return self.serve_stale(e)
+            self.store_response(cache_key, response)
+            return self.set_validators(response, validators)
+        except CacheUnavailable as e:
+            return self.serve_uncached(super().retrieve, e, request, *args, **kwargs)
+
+
+def schedule_warming(model_name: str) -> None:
+    """Rebuild the most popular cached responses of a model in the background.
+
+    Warming runs at most once per `CACHE_WARM_DEBOUNCE` seconds per model, so a burst of writes triggers a single
+    replay of the `CACHE_WARM_ON_INVALIDATE` most popular requests.
+
+    Args:
+        model_name (str): Name of the invalidated model.
+    """
+    if acquire_lock(f"warm:{model_name}", lease=CACHE_WARM_DEBOUNCE) is None:
+        return
+    # Imported here as replaying requests needs the URLconf, whose views import this module
+    from utils.warming import warm_popular_requests
+
+    threading.Thread(
+        target=warm_popular_requests,
+        kwargs={"limit": CACHE_WARM_ON_INVALIDATE, "model": model_name},
+        daemon=True,
+    ).start()
+
+
+class ModelWrites:
+    """The writes to one model recorded during a transaction, applied as a single invalidation.
+
+    Attributes:
+        objects (dict): Whether each written primary key ended up deleted.
+        every_object (bool): Whether instances missing from `objects` may have been written too.
+        rows (List[dict] or None): Values of the written rows before and after each write, or None once the
+            previous values of any row are unknown.
+    """
+
+    def __init__(self) -> None:
+        self.objects = {}
+        self.every_object = False
+        self.rows = []
+
+    def record(self, sender, instance=None, **kwargs) -> None:
+        """Record a `post_save` or `post_delete` of `sender`."""
+        if instance is not None and instance.pk is not None:
+            self.objects[instance.pk] = kwargs.get("signal") is post_delete
+        self.record_rows(get_written_rows(sender, instance, **kwargs))
+
+    def record_rows(self, rows: Union[List[dict] | None]) -> None:
+        """Record the values of written rows before and after the write, or None if they are unknown."""
+        if rows is None or self.rows is None:
+            self.rows = None
+        else:
+            self.rows.extend(rows)
+
+    def merge(self, other: "ModelWrites") -> None:
+        """Fold the writes recorded in `other` into these."""
+        self.objects.update(other.objects)
+        self.every_object |= other.every_object
+        self.record_rows(other.rows)
+
+
+class PendingInvalidations:
+    """The invalidations recorded during one transaction, applied once it commits.
+
+    Attributes:
+        writes (dict): The writes recorded for each model.
+        flushed (bool): Whether the invalidations have been applied.
+    """
+
+    def __init__(self) -> None:
+        self.writes = {}
+        self.flushed = False
+
+    def flush(self) -> None:
+        """Apply every recorded invalidation.
+
+        The writes have already been committed, so a Redis failure must not fail the request that made them. The
+        invalidation is logged and counted instead, and entries built from the model are cached for `CACHE_TTL_MIN`
+        until any entry cached before the failure has expired.
+        """
+        self.flushed = True
+        for sender, writes in self.writes.items():
+            try:
+                invalidate_model(sender, writes)
+            except CacheUnavailable as e:
+                logger.error(
+                    f"Cache invalidation failed for model: {sender.__name__} ({len(writes.objects)} rows) - {e}"
+                )
+                metrics.increment_cache(
+                    model=sender.__name__, cache_event_type="invalidation_failed"
+                )
+                local_failed_invalidations.set(sender.__name__, True)
+
+
+# Writes recorded inside `cache_invalidation_batch`, per database alias and model
+_invalidation_batch = threading.local()
+
+
+def get_pending_invalidations(using: str) -> PendingInvalidations:
+    """Get the invalidations pending on the current transaction of a database connection, starting them if needed.
+
+    Args:
+        using (str): Alias of the database written to.
+
+    Returns:
+        PendingInvalidations: The invalidations applied when the transaction commits, or immediately in autocommit.
+    """
+    connection = transaction.get_connection(using)
+    pending = getattr(connection, "pending_cache_invalidations", None)
+    # The flush leaves the commit callbacks once it runs, or when the savepoint that registered it rolls back
+    if pending is not None and not pending.flushed:
+        if any(
+            callback == pending.flush for _, callback, _ in connection.run_on_commit
+        ):
+            return pending
+    pending = PendingInvalidations()
+    connection.pending_cache_invalidations = pending
+    return pending
+
+
+def invalidate_model(sender, writes: Optional[ModelWrites] = None) -> Dict[str, int]:
+    """Invalidate the cached responses of a model affected by a set of writes.
+
+    Rather than scanning Redis for the model's keys, the generation counters of the model, of each written instance and
+    of the lists the written rows match are advanced with a single atomic script, along with the model's objects epoch
+    when the written instances are not all known; entries written under the previous generations are no longer
+    addressable and expire naturally. Deleted instances are also tombstoned, so the stale
+    copies of their detail responses are not served while they are rebuilt. Models managed by a `CachedManager` then
+    have up to `CACHE_WRITE_THROUGH_MAX_ROWS` saved instances written through to their object cache, and the model's
+    most popular responses are rebuilt if `CACHE_WARM_ON_INVALIDATE` is set.
+
+    Args:
+        sender: The model class that was written.
+        writes (ModelWrites): The recorded writes, or None to invalidate every list of the model.
+
+    Returns:
+        Dict[str, int]: Mapping of each advanced name to its new generation.
+    """
+    model_name = sender.__name__
+    writes = writes or ModelWrites()
+    object_version_names = {
+        pk: get_object_version_name(model_name, pk) for pk in writes.objects
+    }
+    names = [
+        model_name,
+        *object_version_names.values(),
+        *get_invalidated_list_names(sender, writes.rows if writes.objects else None),
+    ]
+    if writes.every_object:
+        names.append(get_objects_version_name(model_name))
+    generations = bump_generations(names)
+    # Deletes are hard invalidations: the instance's stale detail copies must not outlive it
+    if tombstones := {
+        get_tombstone_key(object_version_names[pk]): 1
+        for pk, deleted in writes.objects.items()
+        if deleted
+    }:
+        request_cache.set_many(tombstones, timeout=CACHE_STALE_TTL)
+
+    saved = {
+        pk: generations[object_version_names[pk]]
+        for pk, deleted in writes.objects.items()
+        if not deleted
+    }
+    manager = getattr(sender, "_default_manager", None)
+    # Bulk writes would re-read and re-cache every row; their bumped generations already orphan the old copies
+    if hasattr(manager, "write_through") and len(saved) <= CACHE_WRITE_THROUGH_MAX_ROWS:
+        manager.write_through(saved)
+    if CACHE_WARM_ON_INVALIDATE:
+        schedule_warming(model_name)
+    metrics.increment_cache(model=model_name, cache_event_type="eviction")
+    logger.debug(
+        f"Cache invalidated for model: {model_name} (generation {generations[model_name]}, {len(writes.objects)} rows)"
+    )
+    return generations
+
+
+@receiver([post_save, post_delete])
+def invalidate_cache(sender, **kwargs):
+    """Record a write to a cached model, to be invalidated once its transaction commits.
+
+    Writes to models nothing caches are ignored. Within a transaction every write to the same model is folded into a
+    single invalidation applied on commit, so a bulk admin action costs one Redis round-trip per model rather than one
+    per row, and no cache is rebuilt from data that could still be rolled back.
+    """
+    if sender not in cached_models:
+        return
+    record_writes(
+        sender,
+        kwargs.get("using") or DEFAULT_DB_ALIAS,
+        lambda writes: writes.record(sender, **kwargs),
+    )
+
+
+def record_writes(sender, using: str, record: Callable[[ModelWrites], None]) -> None:
+    """Record writes to a model so they are invalidated once the transaction they belong to commits.
+
+    Args:
+        sender: The model class that was written.
+        using (str): Alias of the database written to.
+        record (Callable[[ModelWrites], None]): Records the writes on the model's pending `ModelWrites`.
+    """
+    batch = getattr(_invalidation_batch, "writes", None)
+    if batch is not None:
+        record(batch.setdefault(using, {}).setdefault(sender, ModelWrites()))
+        return
+    pending = get_pending_invalidations(using)
+    first_write = not pending.writes
+    record(pending.writes.setdefault(sender, ModelWrites()))
+    # Outside a transaction the flush runs immediately
+    if first_write:
+        transaction.on_commit(pending.flush, using=using)
+
+
+@contextmanager
+def cache_invalidation_batch():
+    """Fold every cache invalidation triggered inside the block into one per model, applied when the block exits.
+
+    Transactions already coalesce their invalidations; a batch does the same for runs of autocommitted writes, such
+    as a loop of saves or bulk operations in a management command. Invalidations are still deferred to the commit of
+    any transaction still open when the block exits. Nested batches are folded into the outermost one.
+    """
+    if getattr(_invalidation_batch, "writes", None) is not None:
+        yield
+        return
+    _invalidation_batch.writes = {}
+    try:
+        yield
+    finally:
+        # Writes made before an error have already been committed, so they are invalidated regardless
+        batch, _invalidation_batch.writes = _invalidation_batch.writes, None
+        for using, model_writes in batch.items():
+            for sender, writes in model_writes.items():
+                record_writes(sender, using, lambda pending: pending.merge(writes))
@@ -0,0 +1,123 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple, Type
+
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a failing or slow dependency until it has had time to recover.
+
+    Calls that raise one of the guarded errors, or take longer than `latency_threshold`, count as failures. After
+    `failure_threshold` consecutive failures the breaker opens and every call is refused with `CircuitOpenError`
+    without touching the dependency. Once `reset_timeout` has passed the breaker is half-open: a single probe call is
+    let through, closing the breaker if it succeeds and reopening it if it fails.
+
+    Attributes:
+        name (str): Name of the guarded dependency, for logging and metrics.
+        failure_threshold (int): Consecutive failures that open the breaker.
+        latency_threshold (float or None): Seconds after which a successful call still counts as a failure.
+        reset_timeout (float): Seconds the breaker stays open before letting a probe through.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        latency_threshold: Optional[float] = None,
+        reset_timeout: float = 5.0,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The breaker's current state: closed, open or half-open."""
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Decide whether a call may go through, reserving the probe when half-open."""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a call that succeeded in time, closing the breaker."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit breaker {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed or slow call, opening the breaker once failures reach the threshold or a probe fails."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    f"Circuit breaker {self.name} opened after {self.failures} failures"
+                )
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        self.record_success()
+
+    @contextmanager
+    def guard(self, errors: Tuple[Type[BaseException], ...] = (Exception,)):
+        """Guard a call to the dependency.
+
+        Args:
+            errors (tuple): Exception types raised by the call that count as failures of the dependency.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit breaker {self.name} is open")
+        started = time.perf_counter()
+        try:
+            yield
+        except errors:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Errors of the caller's own making say nothing about the dependency, but must free a probe
+            with self._lock:
+                self._probing = False
+            raise
+        if (
+            self.latency_threshold is not None
+            and time.perf_counter() - started > self.latency_threshold
+        ):
+            self.record_failure()
+        else:
+            self.record_success()
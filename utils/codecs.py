@@ -0,0 +1,221 @@
+import base64
+import json
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4 = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded, or bytes were written by a serializer or compressor not available here."""
+
+
+class Serializer(NamedTuple):
+    """Turns plain Python values into bytes and back."""
+
+    id: int
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+class Compressor(NamedTuple):
+    """Compresses and decompresses encoded bytes."""
+
+    id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+SERIALIZERS: Dict[str, Serializer] = {}
+COMPRESSORS: Dict[str, Compressor] = {}
+
+
+def register_serializer(name: str, serializer: Serializer) -> None:
+    """Make a serializer available to codecs under `name`. Ids are written into every value and must stay stable."""
+    SERIALIZERS[name] = serializer
+
+
+def register_compressor(name: str, compressor: Compressor) -> None:
+    """Make a compressor available to codecs under `name`. Ids are written into every value and must stay stable."""
+    COMPRESSORS[name] = compressor
+
+
+def _encode_bytes(value):
+    """JSON fallback for bytes, such as rendered response bodies, which JSON cannot represent natively."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+
+
+def _decode_bytes(value: dict):
+    if len(value) == 1 and "__bytes__" in value:
+        return base64.b64decode(value["__bytes__"])
+    return value
+
+
+register_serializer(
+    "json",
+    Serializer(
+        1,
+        lambda value: json.dumps(
+            value, default=_encode_bytes, separators=(",", ":")
+        ).encode("utf-8"),
+        lambda data: json.loads(data, object_hook=_decode_bytes),
+    ),
+)
+if orjson is not None:
+
+    def _orjson_loads(data: bytes):
+        value = orjson.loads(data)
+        if b'"__bytes__"' not in data:
+            return value
+
+        # orjson has no object hook, so restore bytes with a walk over the decoded value
+        def restore(value):
+            if isinstance(value, dict):
+                value = _decode_bytes(value)
+                if isinstance(value, dict):
+                    return {key: restore(item) for key, item in value.items()}
+            elif isinstance(value, list):
+                return [restore(item) for item in value]
+            return value
+
+        return restore(value)
+
+    register_serializer(
+        "orjson",
+        Serializer(
+            2,
+            lambda value: orjson.dumps(value, default=_encode_bytes),
+            _orjson_loads,
+        ),
+    )
+if msgpack is not None:
+    register_serializer(
+        "msgpack",
+        Serializer(
+            3,
+            lambda value: msgpack.packb(value, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False),
+        ),
+    )
+
+register_compressor("zlib", Compressor(1, zlib.compress, zlib.decompress))
+if lz4 is not None:
+    register_compressor("lz4", Compressor(2, lz4.frame.compress, lz4.frame.decompress))
+if zstandard is not None:
+    register_compressor(
+        "zstd",
+        Compressor(
+            3,
+            zstandard.ZstdCompressor().compress,
+            lambda data: zstandard.ZstdDecompressor().decompress(data),
+        ),
+    )
+
+
+def best_available(preferences, registry) -> str:
+    """Pick the first name in `preferences` that is registered."""
+    return next(name for name in preferences if name in registry)
+
+
+class CacheCodec:
+    """Encodes cache values as plain bytes instead of pickled Python objects.
+
+    Values are serialized, then compressed when they reach `compress_threshold` bytes. Every encoded value starts
+    with a header byte naming the serializer (high nibble) and compressor (low nibble) that produced it, so values
+    written by workers configured differently, for example during a rolling deploy, still decode.
+
+    Only plain data can be encoded: dicts, lists, strings, numbers, booleans, None and bytes. DRF's `ReturnDict` and
+    `ReturnList` are encoded as the dict and list they are.
+
+    Attributes:
+        serializer (str): Name of the registered serializer used to encode.
+        compressor (str or None): Name of the registered compressor used to encode, or None to never compress.
+        compress_threshold (int): Size in bytes from which serialized values are compressed.
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compressor: Optional[str] = None,
+        compress_threshold: int = 1024,
+    ) -> None:
+        self.serializer = serializer or best_available(
+            ("msgpack", "orjson", "json"), SERIALIZERS
+        )
+        self.compressor = compressor
+        self.compress_threshold = compress_threshold
+        if self.serializer not in SERIALIZERS:
+            raise CodecError(f"Cache serializer '{self.serializer}' is not installed")
+        if self.compressor is not None and self.compressor not in COMPRESSORS:
+            raise CodecError(f"Cache compressor '{self.compressor}' is not installed")
+
+    def encode(self, value) -> bytes:
+        """Encode a plain value to bytes.
+
+        Args:
+            value: The value to encode.
+
+        Returns:
+            bytes: The header byte followed by the serialized, possibly compressed, value.
+
+        Raises:
+            CodecError: If the value holds objects the serializer cannot represent.
+        """
+        serializer = SERIALIZERS[self.serializer]
+        try:
+            data = serializer.dumps(value)
+        except (TypeError, ValueError) as e:
+            raise CodecError(str(e)) from e
+        compressor_id = 0
+        if self.compressor is not None and len(data) >= self.compress_threshold:
+            compressor = COMPRESSORS[self.compressor]
+            data = compressor.compress(data)
+            compressor_id = compressor.id
+        return bytes([serializer.id << 4 | compressor_id]) + data
+
+    def decode(self, data: bytes):
+        """Decode bytes produced by `encode`, whichever serializer and compressor wrote them.
+
+        Args:
+            data (bytes): The encoded value.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            CodecError: If the value was written with a serializer or compressor that is not installed.
+        """
+        serializer_id, compressor_id = data[0] >> 4, data[0] & 0x0F
+        data = memoryview(data)[1:]
+        if compressor_id:
+            compressor = self._find(COMPRESSORS, compressor_id, "compressor")
+            data = compressor.decompress(data)
+        serializer = self._find(SERIALIZERS, serializer_id, "serializer")
+        return serializer.loads(bytes(data))
+
+    @staticmethod
+    def _find(registry, registered_id: int, kind: str):
+        for entry in registry.values():
+            if entry.id == registered_id:
+                return entry
+        raise CodecError(f"No cache {kind} is installed with id {registered_id}")
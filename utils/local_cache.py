@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LocalCache:
+    """A bounded, thread-safe, in-process LRU cache with per-entry expiry.
+
+    Each gunicorn worker holds its own instance, so reads are served from process memory without a network
+    round-trip. Once `max_entries` is reached the least recently used entry is discarded.
+
+    Attributes:
+        max_entries (int): The maximum number of entries held. Zero disables the cache.
+        default_timeout (float): Lifetime in seconds of entries stored without an explicit timeout.
+    """
+
+    def __init__(self, max_entries: int, default_timeout: float) -> None:
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the live value stored under `key`, or `default` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        """Store `value` under `key` for `timeout` seconds, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,214 @@
+import copy
+from typing import Dict, Iterable, Mapping
+
+from django.db import models
+
+from utils.cache import (
+    CACHE_UPDATE_MAX_ROWS,
+    get_cache_ttl,
+    get_generations,
+    get_object_cache_key,
+    get_object_version_name,
+    get_predicate_attnames,
+    record_writes,
+    register_cached_model,
+    tiered_cache,
+)
+from utils.predicates import LoadedValuesMixin
+from utils.request_cache import CacheUnavailable
+
+
+class CachedQuerySet(models.QuerySet):
+    """QuerySet whose bulk operations invalidate the cache like saves and deletes do.
+
+    `update()`, `bulk_create()` and `bulk_update()` write rows without sending `post_save`, so they record their writes
+    for invalidation themselves, deferred to the commit of the transaction they run in.
+    """
+
+    def update(self, **kwargs):
+        """Update every row in the queryset and invalidate the cached responses the rows appeared in.
+
+        The primary keys of the rows are read before the update so that only the affected instances are invalidated.
+        On predicate-aware models the fields the cached lists filter on are read with them, so only the lists the rows
+        match before or after the update are invalidated. Updates of more than `CACHE_UPDATE_MAX_ROWS` rows are not
+        read, and invalidate every instance and list of the model instead.
+        """
+        model = self.model
+        pk_attname = model._meta.pk.attname
+        attnames = [pk_attname]
+        # Values computed by the database, such as F() expressions, are unknown until the rows are read again
+        rows_known = issubclass(model, LoadedValuesMixin) and not any(
+            hasattr(value, "resolve_expression") for value in kwargs.values()
+        )
+        if rows_known:
+            try:
+                attnames.extend(
+                    attname
+                    for attname in get_predicate_attnames(model)
+                    if attname != pk_attname
+                )
+            except CacheUnavailable:
+                rows_known = False
+        before = list(self.order_by().values(*attnames)[: CACHE_UPDATE_MAX_ROWS + 1])
+        if len(before) > CACHE_UPDATE_MAX_ROWS:
+            before = None
+        updated = super().update(**kwargs)
+
+        rows = None
+        if rows_known and before is not None:
+            changes = {
+                model._meta.get_field(name).attname: value
+                for name, value in kwargs.items()
+            }
+            rows = before + [{**row, **changes} for row in before]
+
+        def record(writes):
+            if before is None:
+                writes.every_object = True
+            else:
+                for row in before:
+                    writes.objects[row[pk_attname]] = False
+            writes.record_rows(rows)
+
+        record_writes(model, self.db, record)
+        return updated
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert the given instances and invalidate the cached lists they match."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        # Upserts may have overwritten rows whose previous values are unknown
+        upsert = kwargs.get("update_conflicts", False)
+
+        def record(writes):
+            for obj in objs:
+                writes.record(self.model, instance=obj, created=not upsert)
+
+        record_writes(self.model, self.db, record)
+        return objs
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update the given fields of the given instances and invalidate the cached responses they appeared in."""
+        objs = list(objs)
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+
+        def record(writes):
+            for obj in objs:
+                writes.record(
+                    self.model, instance=obj, created=False, update_fields=fields
+                )
+
+        record_writes(self.model, self.db, record)
+        return updated
+
+    bulk_update.alters_data = True
+
+
+class CachedManager(models.Manager.from_queryset(CachedQuerySet)):
+    """Manager providing a read-through, write-through cache of individual model instances.
+
+    Instances are cached in the two-tier cache under a key carrying the instance's generation, so a write to one row
+    refreshes that row alone and every worker stops reading the old copy within the generation staleness bound. Bulk
+    operations go through `CachedQuerySet` and invalidate the cache too.
+    """
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            register_cached_model(cls)
+
+    def cached_get(self, pk):
+        """Fetch an instance by primary key from the cache, loading and caching it on a miss.
+
+        Args:
+            pk: The primary key of the instance.
+
+        Returns:
+            A copy of the cached instance, safe for the caller to modify.
+
+        Raises:
+            DoesNotExist: If no instance exists with the given primary key.
+        """
+        model_name = self.model.__name__
+        version_name = get_object_version_name(model_name, pk)
+        generation = get_generations([version_name])[version_name]
+        cache_key = get_object_cache_key(model_name, pk, generation)
+
+        instance = tiered_cache.get(cache_key, model=model_name, view="CachedManager")
+        if instance is None:
+            instance = self.get(pk=pk)
+            tiered_cache.set(
+                cache_key,
+                instance,
+                timeout=get_cache_ttl([model_name]),
+                model=model_name,
+                view="CachedManager",
+            )
+        return copy.copy(instance)
+
+    def cached_in_bulk(self, pks: Iterable) -> Dict:
+        """Fetch several instances by primary key through the object cache.
+
+        Cached copies are read with a single MGET; only the misses are loaded from the database, in one `in_bulk`
+        query, and written back to the cache together.
+
+        Args:
+            pks (Iterable): The primary keys of the instances.
+
+        Returns:
+            Dict: Copies of the instances keyed by primary key, safe for the caller to modify. Primary keys without a
+            row are left out.
+        """
+        model_name = self.model.__name__
+        version_names = {pk: get_object_version_name(model_name, pk) for pk in pks}
+        generations = get_generations(version_names.values())
+        cache_keys = {
+            get_object_cache_key(model_name, pk, generations[version_name]): pk
+            for pk, version_name in version_names.items()
+        }
+        instances = {
+            cache_keys[cache_key]: instance
+            for cache_key, instance in tiered_cache.get_many(
+                cache_keys, model=model_name, view="CachedManager"
+            ).items()
+        }
+        if missing := [pk for pk in version_names if pk not in instances]:
+            fetched = self.in_bulk(missing)
+            tiered_cache.set_many(
+                {
+                    cache_key: fetched[pk]
+                    for cache_key, pk in cache_keys.items()
+                    if pk in fetched
+                },
+                timeout=get_cache_ttl([model_name]),
+                model=model_name,
+                view="CachedManager",
+            )
+            instances.update(fetched)
+        return {pk: copy.copy(instance) for pk, instance in instances.items()}
+
+    def write_through(self, generations: Mapping) -> None:
+        """Refresh the cached copies of instances after they have been written.
+
+        Rows are re-read in a single query so the cache holds the values as stored by the database rather than as
+        assigned on the instances, and written to the cache in a single round-trip. Deleted instances need no work:
+        their bumped generation already orphans the old copy.
+
+        Args:
+            generations (Mapping): The generation of each saved instance after the write, keyed by primary key.
+        """
+        if not generations:
+            return
+        model_name = self.model.__name__
+        tiered_cache.set_many(
+            {
+                get_object_cache_key(model_name, pk, generations[pk]): stored
+                for pk, stored in self.in_bulk(list(generations)).items()
+            },
+            timeout=get_cache_ttl([model_name]),
+            model=model_name,
+            view="CachedManager",
+        )
@@ -0,0 +1,24 @@
+from utils.cache import metrics
+from utils.request_cache import request_cache
+
+
+class RequestCacheMiddleware:
+    """Opens a request-scoped batch for the Redis reads and writes made while serving each request.
+
+    Reads made through `request_cache` are reused for the rest of the request, deferred writes are flushed when the
+    response is returned, and the number of round-trips the request made is recorded per view. Place it ahead of every
+    middleware that reads the cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_cache.batch() as batch:
+            response = self.get_response(request)
+        resolver_match = getattr(request, "resolver_match", None)
+        metrics.observe_request_round_trips(
+            view=getattr(resolver_match, "view_name", None) or "unresolved",
+            round_trips=batch.round_trips,
+        )
+        return response
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import operator
+from typing import Any, Dict, List, Mapping, Optional
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import EMPTY_VALUES
+from django.utils import timezone
+
+
+def _contains(value, term) -> bool:
+    return str(term) in str(value)
+
+
+def _icontains(value, term) -> bool:
+    return str(term).lower() in str(value).lower()
+
+
+def _iexact(value, term) -> bool:
+    return str(value).lower() == str(term).lower()
+
+
+def _startswith(value, term) -> bool:
+    return str(value).startswith(str(term))
+
+
+def _istartswith(value, term) -> bool:
+    return str(value).lower().startswith(str(term).lower())
+
+
+# Python equivalents of the ORM lookups a filter predicate may use; other lookups cannot be evaluated against a row
+LOOKUPS = {
+    "exact": operator.eq,
+    "iexact": _iexact,
+    "contains": _contains,
+    "icontains": _icontains,
+    "startswith": _startswith,
+    "istartswith": _istartswith,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+class LoadedValuesMixin:
+    """Model mixin remembering the field values an instance was loaded from the database with.
+
+    Cache invalidation compares these against the values written, so a save only invalidates the cached lists the
+    row belonged to before or after the write.
+    """
+
+    _loaded_values = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+def get_field_values(instance) -> Dict[str, Any]:
+    """Get the current value of every loaded concrete field of a model instance, keyed by attribute name."""
+    deferred_fields = instance.get_deferred_fields()
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in deferred_fields
+    }
+
+
+def get_filter_predicates(filterset) -> Optional[List[list]]:
+    """Express the filters applied by a filterset as predicates that can be evaluated against a single row.
+
+    Args:
+        filterset: A bound django-filter FilterSet.
+
+    Returns:
+        List[list] or None: Sorted `[field_name, lookup_expr, value, exclude]` predicates, JSON-encodable, or None if
+        the filterset is invalid or applies a filter that cannot be evaluated outside the database.
+    """
+    if not filterset.is_valid():
+        return None
+    predicates = []
+    for name, filter_ in filterset.filters.items():
+        value = filterset.form.cleaned_data.get(name)
+        if value in EMPTY_VALUES:
+            continue
+        if filter_.method is not None or filter_.lookup_expr not in LOOKUPS:
+            return None
+        predicates.append(
+            [filter_.field_name, filter_.lookup_expr, value, bool(filter_.exclude)]
+        )
+    # Round-trip through JSON so predicates compare equal whether freshly built or read back from Redis
+    return json.loads(json.dumps(sorted(predicates), cls=DjangoJSONEncoder))
+
+
+def get_predicate_signature(predicates: List[list]) -> str:
+    """Digest a list of predicates into a stable signature shared by every request selecting the same rows."""
+    return hashlib.md5(
+        json.dumps(predicates).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+
+
+def _coerce(field, value):
+    """Convert a row or predicate value to the Python type of its model field, as the ORM would."""
+    value = field.to_python(value)
+    if settings.USE_TZ and hasattr(value, "tzinfo") and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def row_matches(model, predicates: List[list], values: Mapping[str, Any]) -> bool:
+    """Decide whether a row satisfies every predicate.
+
+    A predicate that cannot be evaluated, because the field is unknown, was not loaded or holds an incomparable
+    value, is assumed to be satisfied, so an uncertain match always errs towards invalidation.
+
+    Args:
+        model: The model the row belongs to.
+        predicates (List[list]): Predicates from `get_filter_predicates`.
+        values (Mapping[str, Any]): The row's field values keyed by attribute name.
+
+    Returns:
+        bool: True if the row would be selected by the filters the predicates describe.
+    """
+    for field_name, lookup_expr, term, exclude in predicates:
+        try:
+            field = model._meta.get_field(field_name)
+            value = _coerce(field, values[field.attname])
+            # SQL comparisons with NULL are never true
+            matched = value is not None and LOOKUPS[lookup_expr](
+                value, _coerce(field, term)
+            )
+        except (FieldDoesNotExist, KeyError, TypeError, ValueError, ValidationError):
+            continue
+        if matched == exclude:
+            return False
+    return True
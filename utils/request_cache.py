@@ -0,0 +1,269 @@
+import contextvars
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis import get_redis_connection
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+_current_batch = contextvars.ContextVar("request_cache_batch", default=None)
+
+# Errors raised by the cache that mean Redis itself is failing
+REDIS_ERRORS = (RedisError, ConnectionInterrupted, OSError)
+
+# Opens after this many consecutive failed or slow Redis round-trips, refusing every call until the reset timeout
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=int(os.environ.get("REDIS_BREAKER_FAILURES", 5)),
+    latency_threshold=int(os.environ.get("REDIS_BREAKER_LATENCY_MS", 100)) / 1000,
+    reset_timeout=int(os.environ.get("REDIS_BREAKER_RESET_MS", 5000)) / 1000,
+)
+
+
+class CacheUnavailable(Exception):
+    """Raised when Redis is failing, or skipped because its circuit breaker is open."""
+
+
+def call_redis(method, *args, **kwargs):
+    """Make one round-trip to Redis through its circuit breaker.
+
+    Args:
+        method (callable): The cache or connection method making the round-trip.
+
+    Returns:
+        Whatever `method` returns.
+
+    Raises:
+        CacheUnavailable: If the breaker is open or Redis fails.
+    """
+    try:
+        with redis_breaker.guard(errors=REDIS_ERRORS):
+            return method(*args, **kwargs)
+    except (CircuitOpenError, *REDIS_ERRORS) as e:
+        raise CacheUnavailable(str(e)) from e
+
+
+class RequestBatch:
+    """The Redis reads and deferred writes of a single request.
+
+    Attributes:
+        values (dict): Values read, prefetched or written during the request, keyed by cache key. Keys Redis does not
+            hold map to None, so a miss is not fetched twice.
+        deferred (dict): Writes queued until the batch is flushed, as (value, timeout) pairs keyed by cache key.
+        round_trips (int): Number of round-trips made to Redis through the request cache.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.deferred: Dict[str, tuple] = {}
+        self.round_trips = 0
+
+
+class _CountedPipeline:
+    """A Redis pipeline guarded by the circuit breaker, counting one round-trip per `execute` during a request."""
+
+    def __init__(self, pipeline, batch: Optional[RequestBatch]) -> None:
+        self._pipeline = pipeline
+        self._batch = batch
+
+    def __getattr__(self, name):
+        return getattr(self._pipeline, name)
+
+    def execute(self, *args, **kwargs):
+        if self._batch is not None:
+            self._batch.round_trips += 1
+        return call_redis(self._pipeline.execute, *args, **kwargs)
+
+
+class _CountedConnection:
+    """A Redis connection guarded by the circuit breaker, counting one round-trip per command sent, and per pipeline
+    executed, during a request."""
+
+    def __init__(self, connection, batch: Optional[RequestBatch]) -> None:
+        self._connection = connection
+        self._batch = batch
+
+    def pipeline(self, *args, **kwargs) -> _CountedPipeline:
+        return _CountedPipeline(self._connection.pipeline(*args, **kwargs), self._batch)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._connection, name)
+        if not callable(attribute):
+            return attribute
+
+        def command(*args, **kwargs):
+            if self._batch is not None:
+                self._batch.round_trips += 1
+            return call_redis(attribute, *args, **kwargs)
+
+        return command
+
+
+class RequestCache:
+    """A request-aware front to the shared cache, batching the Redis reads and writes of a request.
+
+    Inside `batch()`, keys the request is about to read can be fetched together with `prefetch`, after which `get` and
+    `get_many` serve them without another round-trip, and writes made with `defer=True` are sent together by `flush`.
+    Every round-trip made through the request cache is counted. Outside a batch every call goes straight to the cache.
+
+    Values are only reused within the request that read them, so a batch never serves data older than the request.
+
+    Every round-trip goes through the Redis circuit breaker. While Redis is failing or the breaker is open, reads miss
+    and writes are dropped, so callers fall back to their local tier or to no cache at all; `add` and the raw
+    connection raise `CacheUnavailable` instead, as callers relying on their result cannot carry on without it.
+
+    Attributes:
+        shared: The django_redis cache the request cache fronts.
+    """
+
+    def __init__(self, shared=cache) -> None:
+        self.shared = shared
+
+    @property
+    def current(self):
+        """The batch of the current request, or None outside a request."""
+        return _current_batch.get()
+
+    @contextmanager
+    def batch(self):
+        """Open a batch for the duration of a request, flushing any deferred writes when it ends.
+
+        Yields:
+            RequestBatch: The request's batch.
+        """
+        batch = RequestBatch()
+        token = _current_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            try:
+                self.flush()
+            finally:
+                _current_batch.reset(token)
+
+    def prefetch(self, keys: Iterable[str]) -> None:
+        """Fetch every key the request is about to read that it has not read yet, with a single MGET.
+
+        Args:
+            keys (Iterable[str]): The cache keys to fetch.
+        """
+        batch = self.current
+        if batch is None:
+            return
+        missing = list(dict.fromkeys(key for key in keys if key not in batch.values))
+        if not missing:
+            return
+        batch.round_trips += 1
+        try:
+            found = call_redis(self.shared.get_many, missing)
+        except CacheUnavailable:
+            # Leave the keys unread, so they are fetched again once Redis recovers
+            return
+        for key in missing:
+            batch.values[key] = found.get(key)
+
+    def get(self, key: str, default=None, fresh: bool = False):
+        """Read a key, from the request's batch if it was already read unless `fresh` is set."""
+        batch = self.current
+        if batch is None:
+            try:
+                return call_redis(self.shared.get, key, default)
+            except CacheUnavailable:
+                return default
+        if fresh:
+            batch.values.pop(key, None)
+        self.prefetch([key])
+        value = batch.values.get(key)
+        return default if value is None else value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Read several keys with at most one round-trip, skipping those already read by the request."""
+        keys = list(keys)
+        batch = self.current
+        if batch is None:
+            try:
+                return call_redis(self.shared.get_many, keys)
+            except CacheUnavailable:
+                return {}
+        self.prefetch(keys)
+        return {
+            key: batch.values[key] for key in keys if batch.values.get(key) is not None
+        }
+
+    def set(self, key: str, value, timeout=DEFAULT_TIMEOUT, defer: bool = False):
+        """Write a key, or queue the write until the batch is flushed when `defer` is set."""
+        batch = self.current
+        if batch is not None:
+            batch.values[key] = value
+            if defer:
+                batch.deferred[key] = (value, timeout)
+                return True
+            batch.deferred.pop(key, None)
+            batch.round_trips += 1
+        try:
+            return call_redis(self.shared.set, key, value, timeout=timeout)
+        except CacheUnavailable:
+            return False
+
+    def set_many(self, values: Mapping[str, Any], timeout=DEFAULT_TIMEOUT):
+        """Write several keys in a single round-trip."""
+        batch = self.current
+        if batch is not None:
+            batch.values.update(values)
+            batch.round_trips += 1
+        try:
+            return call_redis(self.shared.set_many, values, timeout=timeout)
+        except CacheUnavailable:
+            return list(values)
+
+    def add(self, key: str, value, timeout=DEFAULT_TIMEOUT) -> bool:
+        """Write a key only if Redis does not hold it, forgetting what the request read of it.
+
+        Raises:
+            CacheUnavailable: If Redis is failing or its circuit breaker is open.
+        """
+        batch = self.current
+        if batch is not None:
+            batch.values.pop(key, None)
+            batch.round_trips += 1
+        return call_redis(self.shared.add, key, value, timeout=timeout)
+
+    def delete(self, key: str):
+        """Delete a key, forgetting what the request read of it."""
+        batch = self.current
+        if batch is not None:
+            batch.values.pop(key, None)
+            batch.deferred.pop(key, None)
+            batch.round_trips += 1
+        try:
+            return call_redis(self.shared.delete, key)
+        except CacheUnavailable:
+            return False
+
+    def flush(self) -> None:
+        """Send the request's deferred writes, one pipelined round-trip per distinct timeout."""
+        batch = self.current
+        if batch is None or not batch.deferred:
+            return
+        by_timeout = {}
+        for key, (value, timeout) in batch.deferred.items():
+            by_timeout.setdefault(timeout, {})[key] = value
+        batch.deferred.clear()
+        for timeout, values in by_timeout.items():
+            self.set_many(values, timeout=timeout)
+
+    def get_connection(self):
+        """Get the raw Redis connection, guarded by the circuit breaker and counting the round-trips made with it
+        during a request.
+
+        Commands sent on the connection raise `CacheUnavailable` if Redis is failing or its breaker is open.
+        """
+        return _CountedConnection(get_redis_connection("default"), self.current)
+
+
+request_cache = RequestCache()
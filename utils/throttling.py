@@ -0,0 +1,36 @@
+from rest_framework import throttling
+
+from utils.request_cache import request_cache
+
+
+class BatchedThrottleMixin:
+    """Reads throttle histories through the request cache and defers writing them back.
+
+    A request's histories are prefetched together by `CachedResponseMixin.check_throttles`, and the updated histories
+    are written together once every throttle has been checked, instead of one read and one write per throttle. Views
+    that do not flush after their throttle checks have the history written as soon as it is checked, so concurrent
+    requests never count against a history older than the ones already let through.
+    """
+
+    cache = request_cache
+
+    def allow_request(self, request, view) -> bool:
+        """Check the request against the throttle, writing the history back unless the view flushes it later."""
+        allowed = super().allow_request(request, view)
+        if not getattr(view, "batch_throttle_writes", False):
+            self.cache.flush()
+        return allowed
+
+    def throttle_success(self) -> bool:
+        """Record the request in the throttle's history, deferring the write to the end of the throttle checks."""
+        self.history.insert(0, self.now)
+        self.cache.set(self.key, self.history, self.duration, defer=True)
+        return True
+
+
+class AnonRateThrottle(BatchedThrottleMixin, throttling.AnonRateThrottle):
+    """DRF's `AnonRateThrottle` with batched Redis access."""
+
+
+class UserRateThrottle(BatchedThrottleMixin, throttling.UserRateThrottle):
+    """DRF's `UserRateThrottle` with batched Redis access."""
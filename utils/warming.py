@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import resolve
+from loguru import logger
+
+from utils.cache import metrics
+
+
+class RateLimiter:
+    """Spaces calls evenly so that no more than `rate` happen per second, across every thread sharing the limiter.
+
+    Attributes:
+        interval (float): Seconds between consecutive calls. Zero disables the limit.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller may proceed."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next_call - now)
+            self._next_call = max(now, self._next_call) + self.interval
+        if delay:
+            time.sleep(delay)
+
+
+def replay_request(request: Dict[str, str]) -> int:
+    """Replay a recorded request through its view, rebuilding its cache entry if it is missing.
+
+    The request is dispatched straight to the resolved view, as the user who last made it and with the same host and
+    media type, so it derives the same cache key as the original without passing through the middleware stack. The
+    replay is exempt from the view's throttles and is not counted towards request popularity.
+
+    Args:
+        request (Dict[str, str]): A request returned by `Metrics.get_popular_requests`.
+
+    Returns:
+        int: The status code of the replayed response.
+    """
+    path, _, query_string = request["path"].partition("?")
+    match = resolve(path)
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    http_request.path = http_request.path_info = path
+    http_request.GET = QueryDict(query_string)
+    http_request.META = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "HTTP_HOST": request["host"],
+        "HTTP_ACCEPT": request["accept"] or "*/*",
+    }
+    # Marks the replay so the view skips its throttles and popularity counts
+    http_request.cache_warming = True
+    if request["user"]:
+        # DRF authenticates a request carrying a forced user as that user, without credentials
+        http_request._force_auth_user = get_user_model()._default_manager.get(
+            pk=request["user"]
+        )
+    response = match.func(http_request, *match.args, **match.kwargs)
+    return response.status_code
+
+
+def warm_popular_requests(
+    limit: int, workers: int = 4, rate: float = 10, model: str = None
+) -> List[tuple]:
+    """Rebuild the cache entries of the most popular recorded requests.
+
+    Requests are replayed on a thread pool, throttled to `rate` requests per second so that warming after a deploy or
+    a mass invalidation never competes with live traffic for the database. Entries that are still cached are served
+    from the cache and cost nothing to replay.
+
+    Args:
+        limit (int): How many of the most popular requests to replay.
+        workers (int): Number of requests replayed concurrently.
+        rate (float): Maximum requests replayed per second; zero disables the limit.
+        model (str): Only replay requests for this model, if given.
+
+    Returns:
+        List[tuple]: A (request, status code or exception) pair for every replayed request.
+    """
+    limiter = RateLimiter(rate)
+
+    def warm(request):
+        limiter.wait()
+        try:
+            return request, replay_request(request)
+        except Exception as e:
+            logger.warning(f"Failed to warm {request['path']}: {e}")
+            return request, e
+        finally:
+            # Each pool thread opens its own database connection
+            connections.close_all()
+
+    popular = metrics.get_popular_requests(limit, model=model)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(warm, popular))
+    logger.debug(f"Warmed {len(results)} popular requests")
+    return results